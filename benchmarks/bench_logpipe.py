@@ -0,0 +1,67 @@
+"""Measure log throughput: per-line open/append/close vs the batched LogPipeline
+
+Usage: python benchmarks/bench_logpipe.py [lines] [producers]
+"""
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from expomate.logpipe import LogPipeline
+
+
+LINE = "> Task :app:mergeReleaseResources UP-TO-DATE\n"
+
+
+def bench_per_line(log_file, lines):
+    """The old log_message behaviour: one open/write/close per line"""
+    start = time.perf_counter()
+    for _ in range(lines):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(f"[{timestamp}] {LINE}")
+    return time.perf_counter() - start
+
+
+def bench_pipeline(log_file, lines, producers):
+    """Producer threads feed the pipeline while this thread drains it on a timer"""
+    inserts = []
+    pipeline = LogPipeline(log_file, sink=inserts.append)
+    per_producer = lines // producers
+
+    def produce():
+        for _ in range(per_producer):
+            pipeline.put(LINE)
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    while any(thread.is_alive() for thread in threads):
+        pipeline.drain()
+        time.sleep(0.05)  # same cadence as the Tk drain timer
+    pipeline.close()
+
+    elapsed = time.perf_counter() - start
+    return elapsed, per_producer * producers, len(inserts)
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    producers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_time = bench_per_line(Path(tmp) / "per_line.txt", lines)
+        new_time, written, batches = bench_pipeline(Path(tmp) / "pipeline.txt", lines, producers)
+
+    print(f"per-line open/close : {lines / old_time:>12,.0f} lines/s ({old_time:.2f}s, {lines:,} UI inserts)")
+    print(f"batched pipeline    : {written / new_time:>12,.0f} lines/s ({new_time:.2f}s, {batches:,} UI inserts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure ExpoMate startup: import time of the GUI module and time to the first drawn frame
+
+Usage: python benchmarks/bench_startup.py [runs]
+
+Exits with status 1 when a median is over its budget, so it can guard
+against import-time regressions. The first-frame check is skipped when
+no display is available.
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Budgets for the median of all runs, in milliseconds
+IMPORT_BUDGET_MS = 150
+FIRST_FRAME_BUDGET_MS = 1500
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile():
+    """(total microseconds, [(cumulative microseconds, module)]) for `import expomate.gui`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import expomate.gui"],
+        cwd=str(ROOT), capture_output=True, text=True
+    )
+    modules = []
+    total = 0
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, module = int(match.group(2)), match.group(4)
+        if module == "expomate.gui":
+            total = cumulative
+        elif len(match.group(3)) == 3:
+            # Direct imports of the GUI module only, their children are part of them
+            modules.append((cumulative, module))
+    modules.sort(reverse=True)
+    return total, modules
+
+
+def first_frame():
+    """Seconds from spawning run.py to its first drawn frame, or None without a display"""
+    env = dict(os.environ, EXPOMATE_STARTUP_PROBE="1")
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "run.py"], cwd=str(ROOT), env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    elapsed = None
+    for line in process.stdout:
+        if line.strip() == "first-frame":
+            elapsed = time.perf_counter() - start
+            break
+    process.stdout.close()
+    process.wait()
+    return elapsed
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    over_budget = False
+
+    profiles = [import_profile() for _ in range(runs)]
+    import_ms = statistics.median(total for total, _ in profiles) / 1000
+    print(f"import expomate.gui   : {import_ms:8.1f} ms median of {runs} (budget {IMPORT_BUDGET_MS} ms)")
+    for cumulative, module in profiles[-1][1][:5]:
+        print(f"  {module:<20}: {cumulative / 1000:8.1f} ms")
+    over_budget |= import_ms > IMPORT_BUDGET_MS
+
+    frames = [first_frame() for _ in range(runs)]
+    if None in frames:
+        print("first frame           :  skipped (no display)")
+    else:
+        frame_ms = statistics.median(frames) * 1000
+        print(f"first frame           : {frame_ms:8.1f} ms median of {runs} (budget {FIRST_FRAME_BUDGET_MS} ms)")
+        over_budget |= frame_ms > FIRST_FRAME_BUDGET_MS
+
+    if over_budget:
+        print("over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""ExpoMate build helpers shared by the GUI and headless modes"""
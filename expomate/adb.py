@@ -0,0 +1,50 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+from expomate.androidsdk import resolve_android_sdk
+
+
+def find_adb(android_folder):
+    """adb from the project's Android SDK (platform-tools) or PATH, or None"""
+    sdk = resolve_android_sdk(android_folder)
+    if sdk["sdk_dir"]:
+        for name in ("adb", "adb.exe"):
+            adb = Path(sdk["sdk_dir"]) / "platform-tools" / name
+            if adb.exists():
+                return str(adb)
+    return shutil.which("adb")
+
+
+def _adb(adb, *args):
+    result = subprocess.run([adb, *args], capture_output=True, text=True, timeout=10)
+    return result.stdout if result.returncode == 0 else ""
+
+
+def connected_devices(adb):
+    """Serials of devices and emulators adb can talk to (not offline or unauthorized)"""
+    devices = []
+    for line in _adb(adb, "devices").splitlines()[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[1] == "device":
+            devices.append(parts[0])
+    return devices
+
+
+def device_abis(android_folder):
+    """Primary ABI of every connected device, without duplicates, in adb's order
+
+    Returns an empty list when adb is missing, fails or sees no device.
+    """
+    adb = find_adb(android_folder)
+    if not adb:
+        return []
+    abis = []
+    try:
+        for serial in connected_devices(adb):
+            abi = _adb(adb, "-s", serial, "shell", "getprop", "ro.product.cpu.abi").strip()
+            if abi and abi not in abis:
+                abis.append(abi)
+    except (OSError, subprocess.SubprocessError):
+        return []
+    return abis
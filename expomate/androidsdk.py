@@ -0,0 +1,221 @@
+import hashlib
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json, save_json
+
+
+CACHE_FILE = "android_sdk.json"
+
+# Resolutions kept in the cache, one per environment and project requirements
+KEEP_ENTRIES = 20
+
+
+def _gradle_property(text, name):
+    """Value of name=value in gradle.properties text, or None"""
+    match = re.search(rf"^\s*{re.escape(name)}\s*=\s*(\S+)", text, re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def _build_texts(android_folder):
+    """(gradle.properties text, root build script text) of a prebuilt project"""
+    android_folder = Path(android_folder)
+    texts = {}
+    for name in ("gradle.properties", "build.gradle", "build.gradle.kts"):
+        try:
+            texts[name] = (android_folder / name).read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            texts[name] = ""
+    return texts["gradle.properties"], texts["build.gradle"] + texts["build.gradle.kts"]
+
+
+def _declared(properties, build_script, name, value_pattern):
+    """A version set as android.<name> in gradle.properties, else in the build script's ext block"""
+    value = _gradle_property(properties, f"android.{name}")
+    if value:
+        return value
+    match = re.search(rf"\b{name}\s*=[^\n]*?['\"]?({value_pattern})['\"]?", build_script)
+    return match.group(1) if match else None
+
+
+def sdk_requirements(android_folder):
+    """(build-tools version, compile SDK level) a prebuilt project asks for, each possibly None
+
+    React Native templates declare both in the root build.gradle ext block,
+    optionally overridden by android.* entries in gradle.properties.
+    """
+    properties, build_script = _build_texts(android_folder)
+    build_tools = _declared(properties, build_script, "buildToolsVersion", r"\d+(?:\.\d+)+")
+    compile_sdk = (_declared(properties, build_script, "compileSdkVersion", r"\d+")
+                   or _declared(properties, build_script, "compileSdk", r"\d+"))
+    return build_tools, compile_sdk
+
+
+def ndk_requirement(android_folder):
+    """NDK version the project pins (ndkVersion), or None"""
+    properties, build_script = _build_texts(android_folder)
+    return _declared(properties, build_script, "ndkVersion", r"\d+(?:\.\d+)+")
+
+
+def cmake_requirement(android_folder):
+    """CMake version set in android/app's externalNativeBuild block, or None"""
+    for name in ("build.gradle", "build.gradle.kts"):
+        try:
+            text = (Path(android_folder) / "app" / name).read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            continue
+        match = re.search(r"cmake\s*\{[^}]*?\bversion\s*=?\s*['\"](\d+(?:\.\d+)+)['\"]", text)
+        if match:
+            return match.group(1)
+    return None
+
+
+def read_local_properties(android_folder):
+    """sdk.dir from android/local.properties, unescaped, or None"""
+    try:
+        text = (Path(android_folder) / "local.properties").read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return None
+    value = _gradle_property(text, "sdk.dir")
+    if value is None:
+        return None
+    # Java properties escape ':' and '\' with a backslash
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def write_local_properties(android_folder, sdk_dir):
+    """Point android/local.properties at sdk_dir, keeping any other entries"""
+    path = Path(android_folder) / "local.properties"
+    escaped = str(sdk_dir).replace("\\", "\\\\").replace(":", "\\:")
+    try:
+        lines = path.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        lines = []
+    lines = [line for line in lines if not re.match(r"\s*sdk\.dir\s*=", line)]
+    lines.append(f"sdk.dir={escaped}")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _sdkmanager_root():
+    """SDK folder containing the sdkmanager found on PATH, or None"""
+    sdkmanager = shutil.which("sdkmanager")
+    if not sdkmanager:
+        return None
+    path = Path(os.path.realpath(sdkmanager))
+    # <sdk>/cmdline-tools/<version>/bin/sdkmanager or the older <sdk>/tools/bin/sdkmanager
+    for parent in path.parents:
+        if parent.name in ("cmdline-tools", "tools"):
+            return parent.parent
+    return None
+
+
+def _standard_dirs():
+    """Default SDK install folders of Android Studio and the system packages"""
+    home = Path.home()
+    if os.name == 'nt':
+        local = os.environ.get("LOCALAPPDATA") or str(home / "AppData" / "Local")
+        return [Path(local) / "Android" / "Sdk"]
+    if sys.platform == 'darwin':
+        return [home / "Library" / "Android" / "sdk"]
+    return [home / "Android" / "Sdk", home / "Android" / "sdk",
+            Path("/opt/android-sdk"), Path("/usr/lib/android-sdk")]
+
+
+def candidate_dirs(android_folder):
+    """(source, folder) for every place an SDK may be, most explicit first"""
+    for variable in ("ANDROID_HOME", "ANDROID_SDK_ROOT"):
+        if os.environ.get(variable):
+            yield variable, Path(os.environ[variable])
+    root = _sdkmanager_root()
+    if root:
+        yield "sdkmanager", root
+    local = read_local_properties(android_folder)
+    if local:
+        yield "local.properties", Path(local)
+    for folder in _standard_dirs():
+        yield "default location", folder
+
+
+def missing_components(sdk_dir, build_tools, compile_sdk):
+    """SDK packages required by the project that sdk_dir lacks, as sdkmanager names"""
+    sdk_dir = Path(sdk_dir)
+    missing = []
+    if build_tools:
+        if not (sdk_dir / "build-tools" / build_tools).is_dir():
+            missing.append(f"build-tools;{build_tools}")
+    elif not any((sdk_dir / "build-tools").glob("*")):
+        missing.append("build-tools")
+    if compile_sdk:
+        if not (sdk_dir / "platforms" / f"android-{compile_sdk}").is_dir():
+            missing.append(f"platforms;android-{compile_sdk}")
+    elif not any((sdk_dir / "platforms").glob("android-*")):
+        missing.append("platforms")
+    return missing
+
+
+def _is_sdk(folder):
+    return (folder / "platforms").is_dir() or (folder / "build-tools").is_dir()
+
+
+def _resolve_key(android_folder, build_tools, compile_sdk):
+    """Cache key: every input that can change which SDK wins"""
+    parts = [
+        os.environ.get("ANDROID_HOME", ""),
+        os.environ.get("ANDROID_SDK_ROOT", ""),
+        os.environ.get("PATH", ""),
+        read_local_properties(android_folder) or "",
+        build_tools or "",
+        compile_sdk or "",
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def resolve_android_sdk(android_folder, force=False):
+    """Find the Android SDK a project should build with, reusing the on-disk cache when valid
+
+    Returns a dict with "sdk_dir" (None if no SDK was found), "source",
+    "missing" (required packages it lacks), "build_tools", "compile_sdk"
+    and a "cached" flag. A folder that has everything the project needs
+    wins over an earlier one that does not.
+    """
+    build_tools, compile_sdk = sdk_requirements(android_folder)
+    key = _resolve_key(android_folder, build_tools, compile_sdk)
+    path = cache_path(CACHE_FILE)
+    entries = load_json(path, {})
+
+    cached = entries.get(key)
+    # A cached SDK is only reused while it still has the required packages
+    if not force and cached and not missing_components(cached["sdk_dir"], build_tools, compile_sdk):
+        return dict(cached, cached=True)
+
+    result = {"sdk_dir": None, "source": None, "missing": [],
+              "build_tools": build_tools, "compile_sdk": compile_sdk}
+    seen = set()
+    for source, folder in candidate_dirs(android_folder):
+        folder = folder.expanduser()
+        if str(folder) in seen or not _is_sdk(folder):
+            continue
+        seen.add(str(folder))
+        missing = missing_components(folder, build_tools, compile_sdk)
+        if result["sdk_dir"] is None or not missing:
+            result.update(sdk_dir=str(folder), source=source, missing=missing)
+        if not missing:
+            break
+
+    if result["sdk_dir"] and not result["missing"]:
+        entries.pop(key, None)
+        entries[key] = result
+        save_json(path, dict(list(entries.items())[-KEEP_ENTRIES:]))
+    return dict(result, cached=False)
+
+
+def invalidate_sdk_cache():
+    """Forget cached SDK resolutions so the next one searches again"""
+    try:
+        cache_path(CACHE_FILE).unlink()
+    except OSError:
+        pass
@@ -0,0 +1,179 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json
+from expomate.hashing import hash_file
+
+
+STORE_DIR = "artifacts"
+
+# Stored APK bytes above which the least recently used ones are pruned
+MAX_STORE_BYTES = 5 * 1024 ** 3
+
+
+def git_commit(project_dir):
+    """HEAD commit of the project's git repository (with "-dirty" for local changes), or None"""
+    try:
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=str(project_dir),
+            capture_output=True, text=True, timeout=10
+        )
+        if head.returncode != 0:
+            return None
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=str(project_dir),
+            capture_output=True, text=True, timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    commit = head.stdout.strip()
+    return f"{commit}-dirty" if status.stdout.strip() else commit
+
+
+def apk_version(apk_path):
+    """(versionCode, versionName) from the output-metadata.json Gradle writes next to an APK"""
+    metadata = load_json(Path(apk_path).parent / "output-metadata.json", {})
+    for element in metadata.get("elements", []):
+        if element.get("outputFile") == Path(apk_path).name:
+            return element.get("versionCode"), element.get("versionName")
+    return None, None
+
+
+class ArtifactStore:
+    """Content-addressed APK and AAB store with a SQLite index of every build
+
+    Each file is stored once under objects/<2 hex>/<digest>.apk (or .aab) no matter how
+    many builds produced it; the index records which project, variant and
+    commit each build came from.
+    """
+
+    def __init__(self, root=None):
+        self.root = (Path(root) if root else cache_path(STORE_DIR)).resolve()
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.root / "index.db"))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                "digest TEXT PRIMARY KEY, size INTEGER, last_used REAL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS builds ("
+                "id INTEGER PRIMARY KEY, project TEXT, variant TEXT, apk_name TEXT, digest TEXT, "
+                "git_commit TEXT, version_code INTEGER, version_name TEXT, size INTEGER, "
+                "duration REAL, created REAL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS builds_latest ON builds (project, variant, created)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS builds_newest ON builds (project, created)"
+            )
+
+    def object_path(self, digest, name="app.apk"):
+        """Stored path of a digest; name (the original file name) gives the extension"""
+        return self.root / "objects" / digest[:2] / f"{digest}{Path(name).suffix}"
+
+    def add(self, project, variant, apk_path, git_commit=None, duration=None):
+        """Store an APK and index the build, returns its digest"""
+        apk_path = Path(apk_path)
+        digest = hash_file(apk_path)
+        size = apk_path.stat().st_size
+        target = self.object_path(digest, apk_path.name)
+
+        if not target.exists():
+            target.parent.mkdir(exist_ok=True)
+            tmp_path = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+            shutil.copyfile(apk_path, tmp_path)
+            os.replace(tmp_path, target)
+
+        version_code, version_name = apk_version(apk_path)
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO blobs VALUES (?, ?, ?) ON CONFLICT(digest) DO UPDATE SET last_used = excluded.last_used",
+                (digest, size, now)
+            )
+            self.conn.execute(
+                "INSERT INTO builds (project, variant, apk_name, digest, git_commit, version_code, "
+                "version_name, size, duration, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(project), variant, apk_path.name, digest, git_commit, version_code,
+                 version_name, size, duration, now)
+            )
+        return digest
+
+    def _rows(self, query, args):
+        cursor = self.conn.execute(query, args)
+        columns = [column[0] for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor]
+        for row in rows:
+            row["path"] = str(self.object_path(row["digest"], row["apk_name"]))
+        return rows
+
+    def latest(self, project, variant=None, build_type=None):
+        """Most recent stored build of project as a dict (with "path"), or None
+
+        variant matches exactly ("free/release"); build_type matches any
+        variant of that type ("release" also finds "free/release/arm64-v8a").
+        """
+        query, args = "SELECT * FROM builds WHERE project = ?", [str(project)]
+        if variant is not None:
+            query += " AND variant = ?"
+            args.append(variant)
+        if build_type is not None:
+            query += " AND '/' || variant || '/' LIKE ?"
+            args.append(f"%/{build_type}/%")
+        rows = self._rows(query + " ORDER BY created DESC LIMIT 1", args)
+        if not rows:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE blobs SET last_used = ? WHERE digest = ?", (time.time(), rows[0]["digest"]))
+        return rows[0]
+
+    def history(self, project, limit=50):
+        """Stored builds of a project, newest first"""
+        return self._rows(
+            "SELECT * FROM builds WHERE project = ? ORDER BY created DESC LIMIT ?",
+            (str(project), limit)
+        )
+
+    def prune(self, max_bytes=MAX_STORE_BYTES):
+        """Delete least recently used APKs until the store fits max_bytes
+
+        The latest build of every project and variant is always kept.
+        """
+        keep = {row[0] for row in self.conn.execute(
+            "SELECT digest FROM builds b WHERE created = "
+            "(SELECT MAX(created) FROM builds WHERE project = b.project AND variant = b.variant)"
+        )}
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+        removed = []
+        blobs = self.conn.execute(
+            "SELECT digest, size, (SELECT apk_name FROM builds WHERE digest = blobs.digest LIMIT 1) "
+            "FROM blobs ORDER BY last_used"
+        ).fetchall()
+        for digest, size, name in blobs:
+            if total <= max_bytes:
+                break
+            if digest in keep:
+                continue
+            try:
+                self.object_path(digest, name or "app.apk").unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed.append(digest)
+
+        with self.conn:
+            self.conn.executemany("DELETE FROM blobs WHERE digest = ?", ((digest,) for digest in removed))
+            self.conn.executemany("DELETE FROM builds WHERE digest = ?", ((digest,) for digest in removed))
+        return removed
+
+    def close(self):
+        self.conn.close()
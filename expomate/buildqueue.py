@@ -0,0 +1,327 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json, save_json
+from expomate.gradlelog import profile_path_for
+from expomate.runner import process_alive
+from expomate.scheduler import project_lock
+
+
+QUEUE_FILE = "build_queue.json"
+STAGES = ["install", "prebuild", "clean", "compile"]
+
+
+def _project_key(job):
+    """The project_lock key of a job's project, the same one the main window uses"""
+    return str(Path(job["project"]).resolve())
+
+
+class JobLog:
+    """Timestamped log file for one queued job"""
+
+    def __init__(self, path, on_write=None):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=64 * 1024)
+        self._lock = threading.Lock()
+        self.on_write = on_write
+
+    def __call__(self, message):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        line = f"[{timestamp}] {message}"
+        with self._lock:
+            self._file.write(line)
+        if self.on_write:
+            self.on_write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class BuildQueue:
+    """Persistent multi-project queue: prebuild -> clean -> compile per job
+
+    Jobs run on a pool of worker threads, limited by the worker count and by a
+    CPU/RAM budget per job since every Gradle daemon takes gigabytes. The queue
+    is saved after every change; jobs that were running when ExpoMate closed
+    restart from the stage they were in, once the process they left behind
+    (recorded as "pid") has gone.
+    """
+
+    def __init__(self, log_dir, on_change=None, archive=None):
+        self.log_dir = Path(log_dir)
+        self.on_change = on_change
+        self.archive = archive
+        self.path = cache_path(QUEUE_FILE)
+
+        data = load_json(self.path, {})
+        self.jobs = data.get("jobs", [])
+        self.workers = data.get("workers", 2)
+        self.ram_per_job_gb = data.get("ram_per_job_gb", 3)
+        self.cpus_per_job = data.get("cpus_per_job", 2)
+        self.running = data.get("running", False)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._active = 0
+        self._dispatcher = None
+        self._engines = {}          # job id -> BuildEngine of the jobs this queue runs
+        self._cancelled = set()     # ids of running jobs cancelled by the user
+        self._stopping = False
+
+        # Jobs left running by an earlier ExpoMate are orphans until their process is gone
+        with self._lock:
+            self._requeue_orphans()
+
+    def _save(self):
+        """Persist the queue (caller holds the lock)"""
+        save_json(self.path, {
+            "jobs": self.jobs,
+            "workers": self.workers,
+            "ram_per_job_gb": self.ram_per_job_gb,
+            "cpus_per_job": self.cpus_per_job,
+            "running": self.running,
+        })
+        if self.on_change:
+            self.on_change()
+
+    def add(self, project, build_type, fast=False, output="apk", abi="all", cache_node=False):
+        """Queue a project build, returns the new job"""
+        job = {
+            "id": uuid.uuid4().hex[:8],
+            "project": str(project),
+            "build_type": build_type,
+            "fast": fast,
+            "output": output,
+            "abi": abi,
+            "cache_node": cache_node,
+            "state": "queued",
+            "stage": STAGES[0],
+            "returncode": None,
+            "log_file": None,
+            "pid": None,
+            "started": None,
+            "finished": None,
+        }
+        with self._wakeup:
+            self.jobs.append(job)
+            self._save()
+            self._wakeup.notify()
+        return job
+
+    def remove(self, job_id):
+        """Drop a job that is not running"""
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job["id"] != job_id or job["state"] == "running"]
+            self._save()
+
+    def retry(self, job_id):
+        """Queue a failed or cancelled job again from the stage it stopped in"""
+        with self._wakeup:
+            for job in self.jobs:
+                if job["id"] == job_id and job["state"] in ("failed", "cancelled"):
+                    job["state"] = "queued"
+                    job["returncode"] = None
+            self._save()
+            self._wakeup.notify()
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or kill the process tree of a running one"""
+        with self._lock:
+            job = next((job for job in self.jobs if job["id"] == job_id), None)
+            if job is None:
+                return
+            if job["state"] == "queued":
+                job["state"] = "cancelled"
+                self._save()
+                return
+            if job["state"] != "running" or job_id not in self._engines:
+                return
+            self._cancelled.add(job_id)
+            engine = self._engines[job_id]
+        if engine:
+            engine.cancel()
+
+    def configure(self, workers=None, ram_per_job_gb=None):
+        with self._wakeup:
+            if workers is not None:
+                self.workers = max(1, int(workers))
+            if ram_per_job_gb is not None:
+                self.ram_per_job_gb = max(0, float(ram_per_job_gb))
+            self._save()
+            self._wakeup.notify()
+
+    def snapshot(self):
+        """Copy of the job list for display"""
+        with self._lock:
+            return [dict(job) for job in self.jobs]
+
+    def start(self):
+        """Start (or resume) dispatching queued jobs"""
+        with self._wakeup:
+            self.running = True
+            self._save()
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+                self._dispatcher.start()
+            self._wakeup.notify()
+
+    def pause(self):
+        """Stop starting new jobs; running jobs finish"""
+        with self._wakeup:
+            self.running = False
+            self._save()
+            self._wakeup.notify()
+
+    def stop(self, timeout=10):
+        """Kill the running jobs' process trees as ExpoMate closes
+
+        Waits up to timeout seconds for them to wind down; they are queued
+        again and restart from their stage next time.
+        """
+        with self._wakeup:
+            self._stopping = True
+            engines = [engine for engine in self._engines.values() if engine]
+            self._wakeup.notify_all()
+        for engine in engines:
+            engine.cancel()
+        with self._wakeup:
+            self._wakeup.wait_for(lambda: self._active == 0, timeout=timeout)
+
+    def _requeue_orphans(self):
+        """Queue again running jobs this queue does not run, once their process is dead (caller holds the lock)"""
+        changed = False
+        for job in self.jobs:
+            if job["state"] != "running" or job["id"] in self._engines:
+                continue
+            if job.get("pid") and process_alive(job["pid"]):
+                continue
+            job["state"] = "queued"
+            job["pid"] = None
+            changed = True
+        if changed:
+            self._save()
+
+    def _within_budget(self):
+        """True if one more Gradle build fits the CPU and RAM budget (caller holds the lock)"""
+        if self._active == 0:
+            # Always let one job through, even on a small machine
+            return True
+        if self._active >= self.workers:
+            return False
+        cpus = os.cpu_count() or 1
+        if (self._active + 1) * self.cpus_per_job > cpus:
+            return False
+        from expomate.system import available_memory
+        available = available_memory()
+        if available is not None and available < self.ram_per_job_gb * 1024 ** 3:
+            return False
+        return True
+
+    def _dispatch(self):
+        """Start queued jobs while the pool and the budget allow"""
+        with self._wakeup:
+            while self.running and not self._stopping:
+                self._requeue_orphans()
+                job = None
+                if self._within_budget():
+                    # Two builds of the same project would fight over its android folder,
+                    # whether they come from this queue, an orphan or the main window
+                    busy = {job["project"] for job in self.jobs if job["state"] == "running"}
+                    for candidate in self.jobs:
+                        if (candidate["state"] == "queued" and candidate["project"] not in busy
+                                and project_lock(_project_key(candidate)).acquire(blocking=False)):
+                            job = candidate
+                            break
+                if job is None:
+                    # Memory and projects free up without anyone telling us, so look again now and then
+                    self._wakeup.wait(timeout=5)
+                    continue
+
+                job["state"] = "running"
+                job["started"] = job["started"] or time.time()
+                self._engines[job["id"]] = None    # the engine follows once the job thread has made it
+                self._active += 1
+                self._save()
+                threading.Thread(target=self._run_job, args=(job,), daemon=True).start()
+
+    def _run_job(self, job):
+        """Run the remaining stages of one job"""
+        if not job["log_file"] or not os.path.exists(job["log_file"]):
+            # New file for a first run, or when the last one was already archived
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            job["log_file"] = str(self.log_dir / f"job_{job['id']}_{timestamp}.txt")
+        on_write = session = None
+        if self.archive:
+            session = self.archive.open_session(job["log_file"], project=job["project"], job=job["id"])
+
+            def on_write(text):
+                self.archive.index(session, text, project=job["project"], job=job["id"])
+        log = JobLog(Path(job["log_file"]), on_write=on_write)
+        log(f"=== ExpoMate queued build {job['id']}: {job['project']} ({job['build_type']}) ===\n")
+
+        from expomate.engine import BuildEngine
+        engine = BuildEngine(job["project"], log=log)
+        engine.runner.on_start = lambda pid: self._record_pid(job, pid)
+        with self._lock:
+            self._engines[job["id"]] = engine
+            cancelled = self._stopping or job["id"] in self._cancelled
+        if cancelled:
+            engine.cancel()
+        returncode = 0
+        try:
+            for stage in STAGES[STAGES.index(job["stage"]):]:
+                with self._lock:
+                    job["stage"] = stage
+                    self._save()
+                log(f"\n--- {stage} ---\n")
+                if stage == "install":
+                    returncode = engine.install()
+                elif stage == "prebuild":
+                    returncode = engine.prebuild()
+                elif stage == "clean":
+                    returncode = engine.clean()
+                else:
+                    returncode = engine.compile(job["build_type"], fast=job["fast"],
+                                                profile_path=profile_path_for(log.path, job["id"]),
+                                                output=job.get("output", "apk"), abi=job.get("abi", "all"),
+                                                cache_node=job.get("cache_node", False))
+                if returncode != 0:
+                    break
+        except Exception as e:
+            log(f"[ERROR] Job failed: {str(e)}\n")
+            returncode = 1
+        finally:
+            log.close()
+            if session:
+                self.archive.close_session(session)
+                self.archive.maintain()
+
+        project_lock(_project_key(job)).release()
+        with self._wakeup:
+            del self._engines[job["id"]]
+            job["pid"] = None
+            if job["id"] in self._cancelled:
+                self._cancelled.discard(job["id"])
+                job["state"] = "cancelled"
+            elif self._stopping and returncode != 0:
+                # Killed because ExpoMate is closing (the tree is dead), carry on next time
+                job["state"] = "queued"
+            else:
+                job["returncode"] = returncode
+                job["state"] = "done" if returncode == 0 else "failed"
+                job["finished"] = time.time()
+            self._active -= 1
+            self._save()
+            self._wakeup.notify_all()
+
+    def _record_pid(self, job, pid):
+        """Remember the process a job runs, so a later ExpoMate knows when it has ended"""
+        with self._lock:
+            job["pid"] = pid
+            self._save()
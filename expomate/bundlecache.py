@@ -0,0 +1,137 @@
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json, save_json
+from expomate.fingerprint import HASH_INDEX
+from expomate.hashing import TreeHasher
+
+
+STORE_DIR = "js_bundles"
+
+# Bundles kept in the cache, least recently used ones go first
+KEEP_BUNDLES = 10
+
+# Folders that never end up in the JS bundle (node_modules is covered by the lockfile)
+SKIP_DIRS = {"node_modules", ".git", "android", "ios", ".expo", "dist", "web-build", ".gradle"}
+
+# Environment variables Babel, Metro and Expo inline into the bundle
+BUNDLE_ENV = ("NODE_ENV", "BABEL_ENV")
+BUNDLE_ENV_PREFIXES = ("EXPO_PUBLIC_",)
+
+
+def bundle_task(variant):
+    """React Native Gradle plugin task bundling JS for variant ("release" -> createBundleReleaseJsAndAssets)"""
+    return f"createBundle{variant[0].upper()}{variant[1:]}JsAndAssets"
+
+
+def bundle_outputs(android_folder, variant):
+    """Folders the bundle task writes, by name: the bundle, its drawables and source maps"""
+    build = Path(android_folder) / "app" / "build"
+    task = bundle_task(variant)
+    return {
+        "assets": build / "generated" / "assets" / task,
+        "res": build / "generated" / "res" / task,
+        "sourcemaps": build / "generated" / "sourcemaps" / "react" / variant,
+        "intermediate_sourcemaps": build / "intermediates" / "sourcemaps" / "react" / variant,
+    }
+
+
+def bundle_key(project_dir, variant):
+    """Cache key over everything that changes the bundle of variant
+
+    JS sources and assets (every project file outside generated folders,
+    which includes metro.config.js, the Babel config, .env files and the
+    lockfile), the inlined environment variables and the Android build
+    settings that decide Hermes and the bundle options.
+    """
+    project_dir = Path(project_dir).resolve()
+    hasher = TreeHasher(cache_path(HASH_INDEX))
+    try:
+        tree = hasher.hash_tree(project_dir, exclude_dirs=SKIP_DIRS)
+    finally:
+        hasher.close()
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{variant}\n{tree.digest}\n".encode("utf-8"))
+    for name in sorted(os.environ):
+        if name in BUNDLE_ENV or name.startswith(BUNDLE_ENV_PREFIXES):
+            digest.update(f"{name}={os.environ[name]}\n".encode("utf-8"))
+    for path in ("android/gradle.properties", "android/app/build.gradle", "android/app/build.gradle.kts"):
+        try:
+            digest.update((project_dir / path).read_bytes())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+def _copy_outputs(outputs, target):
+    """Copy the existing output folders into target/<name>/"""
+    for name, folder in outputs.items():
+        if folder.is_dir():
+            shutil.copytree(folder, target / name)
+
+
+class BundleCache:
+    """Metro bundles (with assets and source maps) in the ExpoMate cache, addressed by bundle_key
+
+    Files are copied, never linked: the next Metro run rewrites the bundle
+    in place and must not reach into the cache.
+    """
+
+    def __init__(self):
+        self.root = cache_path(STORE_DIR)
+        self.root.mkdir(exist_ok=True)
+
+    def _entry(self, key):
+        return self.root / key
+
+    def restore(self, key, android_folder, variant):
+        """Put the cached bundle for key into Gradle's generated folders, returns True on a hit"""
+        entry = self._entry(key)
+        if not (entry / "assets").is_dir():
+            return False
+        for name, folder in bundle_outputs(android_folder, variant).items():
+            shutil.rmtree(folder, ignore_errors=True)
+            if (entry / name).is_dir():
+                folder.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copytree(entry / name, folder)
+
+        meta = load_json(entry / "meta.json", {})
+        meta["last_used"] = time.time()
+        save_json(entry / "meta.json", meta)
+        return True
+
+    def save(self, key, android_folder, variant):
+        """Store the bundle Gradle just produced for variant under key, returns True if stored"""
+        outputs = bundle_outputs(android_folder, variant)
+        if not any(outputs["assets"].glob("*.bundle")):
+            return False
+        entry = self._entry(key)
+        if entry.is_dir():
+            return True
+        staging = self.root / f"{key}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        try:
+            _copy_outputs(outputs, staging)
+            save_json(staging / "meta.json", {"variant": variant, "created": time.time(), "last_used": time.time()})
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.prune()
+        return True
+
+    def prune(self, keep=KEEP_BUNDLES):
+        """Drop the least recently used bundles beyond keep"""
+        entries = []
+        for entry in self.root.iterdir():
+            if entry.is_dir() and "." not in entry.name:
+                meta = load_json(entry / "meta.json", {})
+                entries.append((meta.get("last_used", 0), entry))
+        entries.sort(reverse=True)
+        for _, entry in entries[keep:]:
+            shutil.rmtree(entry, ignore_errors=True)
@@ -0,0 +1,42 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+CACHE_DIR = Path("cache")
+
+
+def cache_path(name):
+    """Path of a file in the ExpoMate cache folder, creating the folder if needed"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    return CACHE_DIR / name
+
+
+def load_json(path, default=None):
+    """Read a JSON cache file, returning default if it is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    """Write a JSON cache file atomically
+
+    Each call writes its own temporary file next to path, so concurrent
+    writers never interleave; the last rename wins.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,275 @@
+import base64
+import hmac
+import ipaddress
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from expomate.cache import cache_path
+from expomate.hashing import scan_tree
+
+
+STORE_DIR = "gradle_cache"
+
+# Stored entry bytes above which the least recently used entries are evicted,
+# down to EVICT_TO of the cap so every store does not trigger a scan
+MAX_CACHE_BYTES = 10 * 1024 ** 3
+EVICT_TO = 0.9
+
+# Larger entries are refused with 413, which Gradle logs and builds on
+MAX_ENTRY_BYTES = 256 * 1024 ** 2
+
+# Tried first so the URL, a configuration cache input, stays the same across sessions
+DEFAULT_PORT = 5071
+
+# Gradle cache keys are hex digests; anything else never reaches the disk
+KEY = re.compile(r"^[0-9a-f]{16,128}$")
+
+CHUNK_SIZE = 1024 * 1024
+
+# Shared secret a non-local client must send (as the HTTP basic auth password) to store entries
+TOKEN_ENV = "EXPOMATE_BUILD_CACHE_TOKEN"
+
+
+class CacheStore:
+    """Gradle build cache entries on disk under <2 hex>/<key>, evicted least recently used first
+
+    A hit touches the entry's mtime, which is the LRU order. Entries are
+    written to a temporary file and renamed, so a reader never sees half an
+    entry.
+    """
+
+    def __init__(self, root=None, max_bytes=MAX_CACHE_BYTES):
+        self.root = (Path(root) if root else cache_path(STORE_DIR)).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.size = sum(size for _, size, _, _ in scan_tree(self.root))
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _path(self, key):
+        return self.root / key[:2] / key
+
+    def open(self, key):
+        """Open the entry for key for reading, or None on a miss"""
+        path = self._path(key)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return f
+
+    def put(self, key, stream, length):
+        """Store length bytes from stream as the entry for key"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{key}.tmp-{threading.get_ident()}")
+        try:
+            with open(tmp_path, 'wb') as f:
+                remaining = length
+                while remaining:
+                    chunk = stream.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise OSError("connection closed before the entry was complete")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            with self._lock:
+                try:
+                    self.size -= path.stat().st_size
+                except OSError:
+                    pass
+                os.replace(tmp_path, path)
+                self.size += length
+                self.stores += 1
+        finally:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete the least recently used entries until the store is under EVICT_TO of the cap"""
+        with self._lock:
+            entries = sorted((mtime, size, path) for path, size, mtime, _ in scan_tree(self.root)
+                             if ".tmp-" not in path)
+            self.size = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if self.size <= self.max_bytes * EVICT_TO:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                self.size -= size
+
+    def stats(self):
+        """(hits, misses, stores, stored bytes) since the store was opened"""
+        with self._lock:
+            return self.hits, self.misses, self.stores, self.size
+
+
+class _CacheHandler(BaseHTTPRequestHandler):
+    """Gradle's HTTP build cache protocol: GET and PUT on /cache/<key>"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _key(self):
+        prefix, _, key = self.path.partition("?")[0].rpartition("/")
+        if prefix != "/cache" or not KEY.match(key):
+            # A PUT body is left unread; it must not be parsed as the next request
+            self.close_connection = True
+            self._reply(404)
+            return None
+        return key
+
+    def _is_local(self):
+        address = ipaddress.ip_address(self.client_address[0])
+        if getattr(address, "ipv4_mapped", None):
+            address = address.ipv4_mapped
+        return address.is_loopback
+
+    def _may_store(self):
+        """Local clients may always store; others only with the node's token"""
+        if self._is_local():
+            return True
+        token = self.server.token
+        if not token:
+            self.close_connection = True
+            self._reply(403)
+            return False
+        scheme, _, credentials = self.headers.get("Authorization", "").partition(" ")
+        try:
+            password = base64.b64decode(credentials).decode("utf-8").partition(":")[2]
+        except ValueError:
+            password = ""
+        if scheme.lower() != "basic" or not hmac.compare_digest(password.encode("utf-8"), token.encode("utf-8")):
+            self.close_connection = True
+            self.send_response(401)
+            self.send_header("WWW-Authenticate", 'Basic realm="ExpoMate build cache"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return False
+        return True
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        key = self._key()
+        if key is None:
+            return
+        f = self.server.store.open(key)
+        if f is None:
+            self._reply(404)
+            return
+        with f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.gradle.build-cache-artifact.v2")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.end_headers()
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+
+    def do_PUT(self):
+        key = self._key()
+        if key is None or not self._may_store():
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            self._reply(411)
+            return
+        if length > MAX_ENTRY_BYTES:
+            self.close_connection = True
+            self._reply(413)
+            return
+        try:
+            self.server.store.put(key, self.rfile, length)
+        except OSError:
+            self.close_connection = True
+            self._reply(500)
+            return
+        self._reply(201)
+
+    def log_message(self, format, *args):
+        # Gradle makes a request per cacheable task; the build log is noisy enough
+        pass
+
+
+class CacheNode:
+    """A Gradle HTTP build cache served from a CacheStore on a background thread
+
+    Bound to localhost by default; pass host="0.0.0.0" to share it with
+    other machines, which Gradle then reaches at http://<this host>:<port>/cache/.
+    Anyone who can store entries can put task outputs into every build that
+    uses the node, so other machines may only read unless they send token.
+    """
+
+    def __init__(self, store=None, host="127.0.0.1", port=DEFAULT_PORT, any_port=True, token=None):
+        self.store = store or CacheStore()
+        try:
+            self.server = ThreadingHTTPServer((host, port), _CacheHandler)
+        except OSError:
+            if not any_port:
+                raise
+            # Port taken, e.g. by a second ExpoMate window: any free one will do
+            self.server = ThreadingHTTPServer((host, 0), _CacheHandler)
+        self.server.daemon_threads = True
+        self.server.store = self.store
+        self.server.token = token
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        if host in ("0.0.0.0", ""):
+            host = "127.0.0.1"
+        return f"http://{host}:{port}/cache/"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
+
+
+_node = None
+_node_lock = threading.Lock()
+
+
+def shared_node():
+    """The localhost cache node of this process, started on first use"""
+    global _node
+    with _node_lock:
+        if _node is None:
+            _node = CacheNode()
+        return _node
+
+
+def running_node():
+    """The shared node if it was started, else None"""
+    return _node
+
+
+def hit_rate(hits, misses):
+    return hits / (hits + misses) if hits + misses else None
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+from expomate.artifacts import ArtifactStore
+from expomate.engine import BuildEngine
+from expomate.runner import CANCELLED
+from expomate.telemetry import format_size
+
+
+def stdout_log(message):
+    """Stream a log message straight to stdout"""
+    sys.stdout.write(message)
+    sys.stdout.flush()
+
+
+def run_headless(args):
+    """Run prebuild, clean and compile without Tk, returns the process exit code"""
+    project = Path(args.project).resolve()
+    if not (project / "package.json").exists():
+        stdout_log(f"[ERROR] package.json not found in {project}. Not a valid Node.js project.\n")
+        return 2
+
+    if args.latest:
+        return print_latest(project, args.build)
+
+    engine = BuildEngine(project, log=stdout_log)
+    if args.preflight:
+        return 0 if engine.preflight("compile") else 1
+    try:
+        return _run_steps(engine, args)
+    except KeyboardInterrupt:
+        # Children run in their own process group, so Ctrl+C only reaches us
+        engine.cancel()
+        stdout_log("\n[INFO] Build cancelled.\n")
+        return CANCELLED
+
+
+def serve_build_cache(address):
+    """Run a Gradle HTTP build cache node on HOST:PORT until interrupted, returns the exit code
+
+    Other machines may store entries only with the token from TOKEN_ENV.
+    """
+    from expomate.cachenode import TOKEN_ENV, CacheNode, hit_rate
+
+    host, _, port = address.rpartition(":")
+    token = os.environ.get(TOKEN_ENV)
+    try:
+        node = CacheNode(host=host or "127.0.0.1", port=int(port), any_port=False, token=token)
+    except (OSError, ValueError) as e:
+        stdout_log(f"[ERROR] Cannot serve the build cache on {address}: {str(e)}\n")
+        return 2
+    host, port = node.server.server_address[:2]
+    stdout_log(f"Gradle build cache node listening on http://{host}:{port}/cache/ ({node.store.root})\n")
+    if token:
+        stdout_log(f"[INFO] Other machines can store entries with the password from {TOKEN_ENV}.\n")
+    else:
+        stdout_log(f"[INFO] Other machines can only read; set {TOKEN_ENV} to let them store entries.\n")
+    try:
+        while True:
+            time.sleep(60)
+            hits, misses, stores, size = node.store.stats()
+            rate = hit_rate(hits, misses)
+            stdout_log(f"[INFO] {hits} hit, {misses} miss"
+                       f"{f' ({rate:.0%} hit rate)' if rate is not None else ''}, {stores} stored, "
+                       f"{format_size(size)} cached\n")
+    except KeyboardInterrupt:
+        node.stop()
+        return 0
+
+
+def print_latest(project, build_type):
+    """Print the newest stored APK of project for build_type, returns the exit code"""
+    store = ArtifactStore()
+    try:
+        build = store.latest(project, build_type=None if build_type == "all" else build_type)
+    finally:
+        store.close()
+    if build is None:
+        stdout_log(f"[ERROR] No stored {build_type} APK for {project}.\n")
+        return 1
+    stdout_log(f"{build['path']}\n")
+    stdout_log(f"  variant {build['variant']}, versionCode {build['version_code']}, "
+               f"commit {build['git_commit'] or 'unknown'}, {build['size']} bytes\n")
+    return 0
+
+
+def _run_steps(engine, args):
+    """The headless build steps, returns the process exit code"""
+    stdout_log(f"=== ExpoMate headless build: {engine.project_dir} ({args.build}) ===\n")
+
+    if not args.skip_install:
+        stdout_log("Installing dependencies...\n")
+        returncode = engine.install(force=args.force_install)
+        if returncode != 0:
+            stdout_log("\n[ERROR] Install failed.\n")
+            return returncode
+
+    if not args.skip_prebuild:
+        stdout_log("Starting Expo prebuild...\n")
+        returncode = engine.prebuild(force=args.force_prebuild)
+        if returncode != 0:
+            stdout_log("\n[ERROR] Prebuild failed.\n")
+            return returncode or 1
+
+    if args.clean or args.clean_incremental:
+        stdout_log("\nRunning Gradle clean...\n")
+        returncode = engine.clean(incremental=args.clean_incremental)
+        if returncode != 0:
+            stdout_log("\n[ERROR] Clean failed.\n")
+            return returncode
+
+    stdout_log(f"\nStarting Android compilation ({args.build} build)...\n")
+    returncode = engine.compile(args.build, fast=args.fast, profile_path=args.profile, output=args.output,
+                                abi=args.abi, bundle_cache=not args.no_bundle_cache,
+                                cache_node=args.build_cache_node)
+    if returncode == 0:
+        stdout_log("\n[SUCCESS] Compilation completed successfully!\n")
+        stdout_log(f"Output location: {engine.output_dir(args.build, args.output)}\n")
+        for artifact in engine.outputs:
+            stdout_log(f"  {artifact}  ({format_size(artifact.stat().st_size)})\n")
+    else:
+        stdout_log(f"\n[ERROR] Compilation failed (exit code {returncode}).\n")
+    return returncode
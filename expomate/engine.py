@@ -0,0 +1,733 @@
+import itertools
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from expomate.adb import device_abis
+from expomate.androidsdk import read_local_properties, resolve_android_sdk, write_local_properties
+from expomate.artifacts import ArtifactStore, git_commit
+from expomate.bundlecache import BundleCache, bundle_key, bundle_task
+from expomate.cache import cache_path
+from expomate.cachenode import hit_rate, shared_node
+from expomate.fingerprint import compute_fingerprint, is_prebuild_current, record_prebuild
+from expomate.gradle import (
+    ABI_ALL, ABI_DEVICE, ABIS, OUTPUT_AAB, OUTPUT_APK, OUTPUT_SPLITS, BuildTimings, abi_args,
+    build_cache_args, fast_build_args, gradle_user_home, output_args, remove_fast_profile, task_times_args,
+    timed
+)
+from expomate.gradlelog import TASK_TIMES_PREFIX, GradleOutputParser, format_profile, save_profile
+from expomate.incremental import evict, plan_clean, record_modules
+from expomate.install import (
+    NodeModulesCache, detect_package_manager, install_key, installed_key, write_marker
+)
+from expomate.preflight import format_report, passed, run_preflight
+from expomate.runner import CANCELLED, ProcessRunner, TerminalMirror
+from expomate.telemetry import MetricsStore, format_duration, format_size, format_usage
+from expomate.toolchain import probe_toolchain
+
+
+def _block_body(text, name):
+    """Contents of the first `name { ... }` block in Gradle build script text"""
+    match = re.search(rf"\b{name}\s*\{{", text)
+    if not match:
+        return None
+    depth = 1
+    start = match.end()
+    for position in range(start, len(text)):
+        if text[position] == "{":
+            depth += 1
+        elif text[position] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:position]
+    return None
+
+
+def _top_level_blocks(body):
+    """(name, body) of each `name { ... }` or `create("name") { ... }` directly in body"""
+    header = re.compile(r'(?:(?:create|register|maybeCreate)\(\s*"(\w+)"\s*\)|\b(\w+))\s*\{')
+    position = 0
+    while True:
+        match = header.search(body, position)
+        if not match:
+            return
+        depth = 1
+        end = match.end()
+        while end < len(body) and depth:
+            if body[end] == "{":
+                depth += 1
+            elif body[end] == "}":
+                depth -= 1
+            end += 1
+        name = match.group(1) or match.group(2)
+        if name not in ("create", "register", "maybeCreate", "all", "configureEach"):
+            yield name, body[match.end():end - 1]
+        position = end
+
+
+def parse_product_flavors(text):
+    """(name, dimension or None) of each flavor in a productFlavors block (Groovy or Kotlin DSL)"""
+    body = _block_body(re.sub(r"//[^\n]*", "", text), "productFlavors")
+    if body is None:
+        return []
+    flavors = {}
+    for name, settings in _top_level_blocks(body):
+        dimension = re.search(r'\bdimension\s*(?:=\s*)?\(?\s*["\'](\w+)["\']', settings)
+        flavors.setdefault(name, dimension.group(1) if dimension else None)
+    return list(flavors.items())
+
+
+def parse_flavor_dimensions(text):
+    """Flavor dimension names in declaration order (flavorDimensions "a", "b" or += listOf(...))"""
+    match = re.search(r"\bflavorDimensions\b([^\n]*)", re.sub(r"//[^\n]*", "", text))
+    if not match:
+        return []
+    return re.findall(r'["\'](\w+)["\']', match.group(1))
+
+
+def flavor_variants(text):
+    """Flavor part of every variant name, one flavor per dimension ("freeProd" for free + prod)
+
+    Raises ValueError when a flavor's dimension cannot be told, since the
+    task names would then not exist.
+    """
+    flavors = parse_product_flavors(text)
+    dimensions = parse_flavor_dimensions(text)
+    if len(dimensions) <= 1:
+        return [name for name, _ in flavors]
+
+    groups = {dimension: [] for dimension in dimensions}
+    for name, dimension in flavors:
+        if dimension not in groups:
+            raise ValueError(f"product flavor '{name}' has no dimension out of {', '.join(dimensions)}")
+        groups[dimension].append(name)
+    empty = [dimension for dimension, names in groups.items() if not names]
+    if empty:
+        raise ValueError(f"no product flavor found for dimension {', '.join(empty)}")
+    # Gradle orders the flavors of a variant by the flavorDimensions order
+    return [
+        combination[0] + "".join(name[0].upper() + name[1:] for name in combination[1:])
+        for combination in itertools.product(*groups.values())
+    ]
+
+
+class BuildEngine:
+    """GUI-free prebuild, clean and compile pipeline for one Expo project
+
+    Every step reports through the `log` callable and returns an exit code, so
+    the same engine drives the Tk window and the headless command line. All
+    output is piped back through `log`; with mirror set, a terminal window
+    also follows it.
+    """
+
+    def __init__(self, project_dir, log=print, mirror=False):
+        self.project_dir = Path(project_dir).resolve()
+        self.log = log
+        self.mirror = mirror
+        self.runner = ProcessRunner()
+        self._usage = []
+        self.outputs = []
+
+    @property
+    def android_folder(self):
+        return self.project_dir / "android"
+
+    @property
+    def gradlew(self):
+        return self.android_folder / ("gradlew.bat" if os.name == 'nt' else "gradlew")
+
+    def apk_dir(self, build_type):
+        """Folder Gradle writes the APKs for build_type into ("all": every variant)"""
+        apk_root = self.android_folder / "app" / "build" / "outputs" / "apk"
+        return apk_root if build_type == "all" else apk_root / build_type
+
+    def find_apks(self, build_type):
+        """APKs produced for build_type, including flavor subfolders (apk/<flavor>/<type>/)"""
+        apk_root = self.apk_dir("all")
+        if not apk_root.exists():
+            return []
+        apks = sorted(apk_root.rglob("*.apk"))
+        if build_type != "all":
+            apks = [apk for apk in apks if build_type in apk.relative_to(apk_root).parts[:-1]]
+        return apks
+
+    def bundle_dir(self):
+        """Folder Gradle writes App Bundles into (bundle/<flavor><Type>/)"""
+        return self.android_folder / "app" / "build" / "outputs" / "bundle"
+
+    def find_bundles(self, build_type):
+        """AABs produced for build_type"""
+        bundle_root = self.bundle_dir()
+        if not bundle_root.exists():
+            return []
+        bundles = sorted(bundle_root.rglob("*.aab"))
+        if build_type != "all":
+            bundles = [bundle for bundle in bundles if bundle.parent.name.lower().endswith(build_type)]
+        return bundles
+
+    def output_dir(self, build_type, output=OUTPUT_APK):
+        """Folder holding the artifacts of build_type in an output format"""
+        return self.bundle_dir() if output == OUTPUT_AAB else self.apk_dir(build_type)
+
+    def find_outputs(self, build_type, output=OUTPUT_APK):
+        """Artifacts of build_type in an output format: AABs, per-ABI APKs or universal APKs"""
+        if output == OUTPUT_AAB:
+            return self.find_bundles(build_type)
+        # Split and universal APKs share a folder; split ones carry their ABI in the name
+        return [
+            apk for apk in self.find_apks(build_type)
+            if any(f"-{abi}-" in apk.name for abi in ABIS) == (output == OUTPUT_SPLITS)
+        ]
+
+    def artifact_variant(self, path):
+        """Variant of an APK or AAB as "flavor/type[/abi]" (bundle/freeRelease -> free/release)"""
+        path = Path(path)
+        if path.suffix == ".aab":
+            match = re.match(r"(.*?)(Debug|Release)$", path.parent.name)
+            if match and match.group(1):
+                return f"{match.group(1)}/{match.group(2).lower()}"
+            return path.parent.name
+        # apk/<flavor>/<type>/app.apk -> "flavor/type", split APKs add "/<abi>"
+        variant = "/".join(path.relative_to(self.apk_dir("all")).parts[:-1])
+        for abi in ABIS:
+            if f"-{abi}-" in path.name:
+                return f"{variant}/{abi}"
+        return variant
+
+    def product_flavors(self):
+        """Flavor combinations declared in android/app/build.gradle(.kts) (see flavor_variants)"""
+        for name in ("build.gradle", "build.gradle.kts"):
+            build_file = self.android_folder / "app" / name
+            if build_file.exists():
+                return flavor_variants(build_file.read_text(encoding='utf-8', errors='replace'))
+        return []
+
+    def gradle_tasks(self, build_type, output=OUTPUT_APK):
+        """Gradle tasks for build_type; "all" assembles every flavor and build type in one call
+
+        The AAB output format runs the bundle tasks instead of assemble.
+        Raises ValueError when the flavors of "all" cannot be worked out.
+        """
+        verb = "bundle" if output == OUTPUT_AAB else "assemble"
+        if build_type == "release":
+            return [f"{verb}Release"]
+        if build_type == "debug":
+            return [f"{verb}Debug"]
+
+        flavors = self.product_flavors()
+        if not flavors:
+            return [f"{verb}Debug", f"{verb}Release"]
+        return [
+            f"{verb}{flavor[0].upper()}{flavor[1:]}{variant}"
+            for flavor in flavors
+            for variant in ("Debug", "Release")
+        ]
+
+    def _run_piped(self, command, cwd, shell=False, on_line=None, title=None, gradle=False):
+        """Run command, streaming its output to the log (and on_line), returns its exit code
+
+        gradle marks a gradlew command, whose usage then includes the Gradle daemons.
+        """
+        def handle(line):
+            # Task-time lines are for the profile parser, not the reader
+            if not (gradle and line.startswith(TASK_TIMES_PREFIX)):
+                self.log(line)
+            if on_line:
+                on_line(line)
+
+        mirror = None
+        if self.mirror and title:
+            mirror = TerminalMirror(cache_path(f"terminal_{title.lower().replace(' ', '_')}.log"), title)
+            if mirror.window is None:
+                self.log("[WARNING] Could not open a terminal window to mirror the output.\n")
+
+        returncode = self.runner.run(command, cwd, handle, shell=shell, mirror=mirror,
+                                     gradle_home=str(gradle_user_home()) if gradle else None)
+        self._usage.append(self.runner.last_usage)
+        if returncode == CANCELLED:
+            self.log("\n[INFO] Cancelled.\n")
+        return returncode
+
+    def _measure(self, stage, variant, profile, func, *args):
+        """Run a step, recording its duration, peak memory and CPU time in the metrics store"""
+        self._usage = []
+        started = time.time()
+        returncode, elapsed = timed(func, *args)
+
+        peaks = [peak for peak, _ in self._usage if peak is not None]
+        cpus = [cpu for _, cpu in self._usage if cpu is not None]
+        peak_rss = max(peaks) if peaks else None
+        cpu_seconds = sum(cpus) if cpus else None
+        if self._usage:
+            self.log(format_usage(stage, elapsed, peak_rss, cpu_seconds))
+        try:
+            store = MetricsStore()
+            try:
+                store.record(
+                    self.project_dir, stage, elapsed, returncode, variant=variant, profile=profile,
+                    skipped=not self._usage, peak_rss=peak_rss, cpu_seconds=cpu_seconds, started=started
+                )
+            finally:
+                store.close()
+        except sqlite3.Error as e:
+            self.log(f"[WARNING] Failed to record build metrics: {str(e)}\n")
+        return returncode
+
+    def cancel(self):
+        """Kill the running step's process tree; later steps return CANCELLED at once"""
+        self.runner.cancel()
+
+    def install(self, force=False):
+        """Install node_modules from the lockfile, returns the exit code
+
+        An install that matches the lockfile and Node version is kept as is;
+        otherwise a cached tree for that key is linked into place, and only
+        without one does the package manager run (its result is cached).
+        """
+        return self._measure("install", "", "", self._install, force)
+
+    def _install(self, force):
+        """The install step itself"""
+        manager = detect_package_manager(self.project_dir)
+        if manager.lockfile is None:
+            self.log("[WARNING] No lockfile found, installing without a frozen lockfile (keyed on package.json).\n")
+        else:
+            self.log(f"[INFO] Package manager: {manager.name} ({manager.lockfile.name})\n")
+
+        node_version = probe_toolchain().get("node")
+        try:
+            key = install_key(manager, node_version)
+        except OSError as e:
+            self.log(f"[WARNING] Could not hash the lockfile: {str(e)}\n")
+            key = None
+
+        if key and not force:
+            if installed_key(self.project_dir) == key:
+                self.log("[INFO] node_modules matches the lockfile, skipping install.\n")
+                return 0
+            try:
+                mode = NodeModulesCache().restore(key, self.project_dir)
+            except OSError as e:
+                self.log(f"[WARNING] Failed to restore node_modules from the cache: {str(e)}\n")
+                mode = None
+            if mode:
+                write_marker(self.project_dir, key)
+                self.log(f"[SUCCESS] Restored node_modules from the cache ({mode}).\n")
+                return 0
+
+        command = " ".join(manager.command)
+        self.log(f"Command: {command}\n")
+        try:
+            # Use shell=True on Windows to properly resolve npm/yarn/pnpm shims from PATH
+            returncode = self._run_piped(manager.command, self.project_dir, shell=(os.name == 'nt'), title="Install")
+        except Exception as e:
+            self.log(f"[ERROR] Install failed: {str(e)}\n")
+            return 1
+
+        if returncode == 0 and manager.lockfile is None:
+            # npm install writes package-lock.json; key on it, so the next run matches
+            manager = detect_package_manager(self.project_dir)
+            try:
+                key = install_key(manager, node_version)
+            except OSError:
+                pass
+        if returncode == 0 and key:
+            try:
+                NodeModulesCache().save(key, self.project_dir, manager, node_version)
+                write_marker(self.project_dir, key)
+                self.log("[INFO] Cached node_modules for the next install.\n")
+            except OSError as e:
+                self.log(f"[WARNING] Failed to cache node_modules: {str(e)}\n")
+        return returncode
+
+    def prebuild(self, force=False):
+        """Run npx expo prebuild and write local.properties, returns the exit code
+
+        Skipped when the prebuild inputs are unchanged since the last successful
+        prebuild, unless force is set.
+        """
+        return self._measure("prebuild", "", "", self._prebuild, force)
+
+    def _prebuild(self, force):
+        """The prebuild step itself"""
+        try:
+            fingerprint = compute_fingerprint(self.project_dir)
+        except Exception as e:
+            self.log(f"[WARNING] Could not fingerprint prebuild inputs: {str(e)}\n")
+            fingerprint = None
+
+        if fingerprint and not force and is_prebuild_current(self.project_dir, fingerprint):
+            self.log("[INFO] Prebuild inputs unchanged since the last prebuild, skipping it.\n")
+            return 0 if self.create_local_properties() else 1
+
+        if not self.preflight("prebuild"):
+            return 1
+
+        try:
+            # Use shell=True on Windows to properly resolve npx from PATH
+            returncode = self._run_piped(
+                ["npx", "expo", "prebuild"], self.project_dir, shell=(os.name == 'nt'), title="Prebuild"
+            )
+        except Exception as e:
+            self.log(f"[ERROR] Prebuild failed: {str(e)}\n")
+            return 1
+
+        if returncode == 0:
+            if fingerprint:
+                record_prebuild(self.project_dir, fingerprint)
+            # Create local.properties after successful prebuild
+            if not self.create_local_properties():
+                return 1
+        return returncode
+
+    def preflight(self, stage):
+        """Check the JDK, SDK, NDK, Gradle, disk and memory before stage, returns True if nothing failed"""
+        checks = run_preflight(self.project_dir, stage)
+        self.log("Pre-flight checks:\n" + format_report(checks))
+        if not passed(checks):
+            self.log(f"[ERROR] Pre-flight checks failed, {stage} not started.\n")
+            return False
+        return True
+
+    def create_local_properties(self):
+        """Point local.properties at the resolved Android SDK, returns True if it is usable
+
+        Logs what is wrong (no SDK, missing build-tools or platform) so a
+        misconfigured machine fails before Gradle starts, not minutes into it.
+        """
+        android_folder = self.android_folder
+
+        if not android_folder.exists():
+            self.log("[WARNING] Android folder not found, skipping local.properties creation.\n")
+            return False
+
+        sdk = resolve_android_sdk(android_folder)
+        if sdk["sdk_dir"] is None:
+            self.log(
+                "[ERROR] Android SDK not found. Install it with Android Studio or set ANDROID_HOME "
+                "to the SDK folder.\n"
+            )
+            return False
+        if sdk["missing"]:
+            packages = " ".join(f'"{package}"' for package in sdk["missing"])
+            self.log(
+                f"[ERROR] The Android SDK at {sdk['sdk_dir']} is missing {', '.join(sdk['missing'])}. "
+                f"Install with: sdkmanager {packages}\n"
+            )
+            return False
+
+        if read_local_properties(android_folder) == sdk["sdk_dir"]:
+            return True
+        try:
+            write_local_properties(android_folder, sdk["sdk_dir"])
+        except OSError as e:
+            self.log(f"[WARNING] Failed to create local.properties: {str(e)}\n")
+            return False
+        self.log(f"[SUCCESS] Created local.properties with SDK path: {sdk['sdk_dir']} (from {sdk['source']})\n")
+        return True
+
+    def clean(self, incremental=False):
+        """Run gradlew clean, returns its exit code
+
+        With incremental, only the build outputs of modules whose inputs
+        changed since the last successful compile are deleted, so the next
+        compile reuses the rest. Falls back to gradlew clean when nothing
+        was recorded yet.
+        """
+        return self._measure("clean", "incremental" if incremental else "", "", self._clean, incremental)
+
+    def _clean(self, incremental):
+        """The clean step itself"""
+        android_folder = self.android_folder
+
+        if not android_folder.exists():
+            error_msg = "[ERROR] Android folder not found. Did prebuild complete successfully?\n"
+            self.log(error_msg)
+            return 1
+
+        try:
+            # Check if gradlew exists
+            gradlew = self.gradlew
+
+            if not gradlew.exists():
+                error_msg = "[ERROR] Gradle wrapper not found in android folder.\n"
+                self.log(error_msg)
+                return 1
+
+            if not self.create_local_properties():
+                return 1
+
+            if incremental:
+                returncode = self._incremental_clean()
+                if returncode is not None:
+                    return returncode
+
+            self.log(f"Command: {str(gradlew)} clean\n")
+            returncode = self._run_piped([str(gradlew), "clean"], android_folder, title="Clean", gradle=True)
+            if returncode == 0:
+                self.log("[SUCCESS] Clean completed!\n")
+            elif returncode != CANCELLED:
+                self.log(f"[ERROR] Clean failed (exit code {returncode}).\n")
+            return returncode
+
+        except Exception as e:
+            error_msg = f"[ERROR] Clean failed: {str(e)}\n"
+            self.log(error_msg)
+            return 1
+
+    def _incremental_clean(self):
+        """Delete the outputs of stale modules, returns 0, or None to fall back to a full clean"""
+        plan = plan_clean(self.project_dir)
+        if plan is None:
+            self.log("[INFO] No successful compile recorded for this android folder, running a full clean.\n")
+            return None
+
+        if plan["stale"]:
+            self.log(f"[INFO] Inputs changed for {', '.join(plan['stale'])}.\n")
+        freed = evict(plan["dirs"])
+        for folder in plan["dirs"]:
+            self.log(f"  removed {folder}\n")
+        self.log(f"[SUCCESS] Incremental clean completed: {len(plan['stale'])} stale module(s) cleaned, "
+                 f"{format_size(freed)} freed.\n")
+        if plan["kept"]:
+            self.log(f"[INFO] Kept the outputs of {len(plan['kept'])} unchanged module(s); a full clean "
+                     f"would rebuild them too, about {format_duration(plan['saved_seconds'])} of build time.\n")
+        return 0
+
+    def target_abis(self, abi):
+        """ABIs to build native code for: [] for all, the connected devices' ABIs, or [abi]"""
+        if abi == ABI_ALL:
+            return []
+        if abi != ABI_DEVICE:
+            return [abi]
+        abis = device_abis(self.android_folder)
+        if abis:
+            self.log(f"[INFO] Connected device ABI: {', '.join(abis)}\n")
+        else:
+            self.log("[WARNING] No connected device found with adb, building every ABI.\n")
+        return abis
+
+    def compile(self, build_type, fast=False, profile_path=None, output=OUTPUT_APK, abi=ABI_ALL,
+                bundle_cache=True, cache_node=False):
+        """Run the Gradle assemble (or bundle) task for build_type, returns its exit code
+
+        output picks a universal APK, per-ABI split APKs or an App Bundle;
+        the artifacts built are left in self.outputs. abi restricts native
+        code to one ABI, or to the connected devices' ABIs ("device"), which
+        cuts React Native's C++ compile time for debug builds. With
+        bundle_cache, release JS bundles are reused while the JS inputs are
+        unchanged instead of running Metro again. With cache_node, Gradle
+        uses this process's local HTTP build cache node as its remote build
+        cache, so task outputs are shared across projects and clean builds.
+        fast turns on the fast build profile (daemon, build cache, parallel
+        workers, configuration cache and tuned JVM args) and reports the time
+        saved against the recorded baseline. A per-task profile of Gradle's
+        output is logged and saved to profile_path.
+        """
+        profile = "fast" if fast else "baseline"
+        abis = self.target_abis(abi)
+        variant = "-".join([build_type] + ([output] if output != OUTPUT_APK else []) + abis)
+        return self._measure("compile", variant, profile, self._compile, build_type, fast, profile_path,
+                             output, abis, variant, bundle_cache, cache_node)
+
+    def _compile(self, build_type, fast, profile_path, output, abis, variant, bundle_cache, cache_node):
+        """The compile step itself"""
+        android_folder = self.android_folder
+        self.outputs = []
+
+        # Determine gradle tasks (several for "all" variants, still one Gradle invocation)
+        try:
+            tasks = self.gradle_tasks(build_type, output)
+        except ValueError as e:
+            self.log(f"[ERROR] Cannot build all variants: {str(e)}. Build release or debug instead.\n")
+            return 1
+        gradle_args = tasks + (fast_build_args() if fast else [])
+
+        if not android_folder.exists():
+            error_msg = "[ERROR] Android folder not found. Did prebuild complete successfully?\n"
+            self.log(error_msg)
+            return 1
+
+        try:
+            # Check if gradlew exists
+            gradlew = self.gradlew
+
+            if not gradlew.exists():
+                error_msg = "[ERROR] Gradle wrapper not found in android folder.\n"
+                self.log(error_msg)
+                return 1
+
+            if not self.preflight("compile") or not self.create_local_properties():
+                return 1
+
+            try:
+                remove_fast_profile(android_folder)
+            except OSError as e:
+                self.log(f"[WARNING] Failed to update gradle.properties: {str(e)}\n")
+
+            # Real task times and dependencies for the profile's critical path
+            gradle_args += task_times_args()
+            if fast:
+                self.log("[INFO] Fast build profile enabled.\n")
+            if output == OUTPUT_SPLITS:
+                gradle_args += output_args(output)
+                self.log("[INFO] Building one APK per ABI.\n")
+            if abis:
+                gradle_args += abi_args(abis)
+                self.log(f"[INFO] Building native code for {', '.join(abis)} only.\n")
+            bundle_misses = []
+            if bundle_cache:
+                skip_args, bundle_misses = self._restore_js_bundles(tasks)
+                gradle_args += skip_args
+            node = None
+            if cache_node:
+                try:
+                    node = shared_node()
+                    gradle_args += build_cache_args(node.url)
+                    node_stats = node.store.stats()
+                    self.log(f"[INFO] Using the build cache node at {node.url}\n")
+                except OSError as e:
+                    node = None
+                    self.log(f"[WARNING] Build cache node unavailable: {str(e)}\n")
+
+            parser = GradleOutputParser()
+            returncode, elapsed = timed(self._run_compile, gradle_args, build_type, parser)
+
+        except Exception as e:
+            error_msg = f"[ERROR] Compilation failed: {str(e)}\n"
+            self.log(error_msg)
+            return 1
+
+        # Bookkeeping only from here on: Gradle's result stands whatever happens below
+        self._report_profile(parser, returncode, profile_path)
+        if node is not None:
+            self._report_cache_node(node, node_stats)
+        if returncode == 0:
+            self._after_build(build_type, fast, output, variant, elapsed, parser, bundle_misses)
+        return returncode
+
+    def _after_build(self, build_type, fast, output, variant, elapsed, parser, bundle_misses):
+        """Record a successful build in the caches, timings and artifact store, warning on failures"""
+        self._save_js_bundles(bundle_misses)
+        try:
+            record_modules(self.project_dir, parser.tasks)
+        except (OSError, sqlite3.Error) as e:
+            self.log(f"[WARNING] Failed to record module inputs for incremental clean: {str(e)}\n")
+        try:
+            timings = BuildTimings()
+            if fast:
+                self.log(timings.report(self.project_dir, variant, elapsed))
+            timings.record(self.project_dir, variant, "fast" if fast else "baseline", elapsed)
+        except OSError as e:
+            self.log(f"[WARNING] Failed to record the build time: {str(e)}\n")
+        try:
+            self.outputs = self.find_outputs(build_type, output)
+        except OSError as e:
+            self.log(f"[WARNING] Failed to list build outputs: {str(e)}\n")
+        self.store_artifacts(build_type, elapsed, since=time.time() - elapsed, output=output)
+
+    def _report_cache_node(self, node, before):
+        """Log the cache node traffic since before (includes builds running at the same time)"""
+        hits, misses, stores, size = node.store.stats()
+        hits, misses, stores = hits - before[0], misses - before[1], stores - before[2]
+        rate = hit_rate(hits, misses)
+        self.log(f"[INFO] Build cache node: {hits} hit, {misses} miss"
+                 f"{f' ({rate:.0%} hit rate)' if rate is not None else ''}, {stores} stored, "
+                 f"{format_size(size)} cached.\n")
+
+    def _restore_js_bundles(self, tasks):
+        """Restore cached JS bundles for the release variants in tasks
+
+        Returns the Gradle arguments skipping the bundle task of every hit,
+        and (variant, key) for every miss, to be saved after the build.
+        """
+        variants = []
+        for task in tasks:
+            name = re.sub(r"^(assemble|bundle)", "", task)
+            if name.endswith("Release"):
+                variants.append(name[0].lower() + name[1:])
+        if not variants:
+            return [], []
+
+        skip_args, misses = [], []
+        cache = BundleCache()
+        for variant in variants:
+            try:
+                key = bundle_key(self.project_dir, variant)
+                hit = cache.restore(key, self.android_folder, variant)
+            except OSError as e:
+                self.log(f"[WARNING] JS bundle cache unavailable for {variant}: {str(e)}\n")
+                continue
+            if hit:
+                skip_args += ["-x", bundle_task(variant)]
+                self.log(f"[INFO] JS bundle cache hit for {variant} ({key[:12]}), skipping Metro.\n")
+            else:
+                misses.append((variant, key))
+                self.log(f"[INFO] JS bundle cache miss for {variant} ({key[:12]}), Metro will bundle.\n")
+        self.log(f"[INFO] JS bundle cache: {len(variants) - len(misses)} hit, {len(misses)} miss.\n")
+        return skip_args, misses
+
+    def _save_js_bundles(self, misses):
+        """Cache the bundles Metro produced for the variants that missed"""
+        if not misses:
+            return
+        cache = BundleCache()
+        for variant, key in misses:
+            try:
+                if cache.save(key, self.android_folder, variant):
+                    self.log(f"[INFO] Cached the {variant} JS bundle for the next build.\n")
+            except OSError as e:
+                self.log(f"[WARNING] Failed to cache the {variant} JS bundle: {str(e)}\n")
+
+    def store_artifacts(self, build_type, duration=None, since=None, output=OUTPUT_APK):
+        """Copy the APKs or AABs of a finished build (written after since) into the artifact store"""
+        try:
+            store = ArtifactStore()
+        except Exception as e:
+            self.log(f"[WARNING] Artifact store unavailable: {str(e)}\n")
+            return
+        try:
+            commit = git_commit(self.project_dir)
+            for apk in self.find_outputs(build_type, output):
+                if since is not None and apk.stat().st_mtime < since - 1:
+                    # Left over from an earlier build of another variant
+                    continue
+                variant = self.artifact_variant(apk)
+                digest = store.add(self.project_dir, variant, apk, git_commit=commit, duration=duration)
+                self.log(f"[INFO] Stored {apk.name} ({variant}) in the artifact store as {digest[:12]}\n")
+            store.prune()
+        except Exception as e:
+            self.log(f"[WARNING] Failed to store build outputs: {str(e)}\n")
+        finally:
+            store.close()
+
+    def _report_profile(self, parser, returncode, profile_path):
+        """Log the build profile and save it as JSON, if any tasks were seen"""
+        if not parser.tasks:
+            return
+        profile = parser.finish(returncode)
+        self.log(format_profile(profile))
+        if profile_path:
+            try:
+                save_profile(profile_path, profile)
+                self.log(f"[INFO] Build profile saved to {profile_path}\n")
+            except OSError as e:
+                self.log(f"[WARNING] Failed to save build profile: {str(e)}\n")
+
+    def _run_compile(self, gradle_args, build_type, parser):
+        """Run the compile Gradle invocation with its output piped back"""
+        # Plain console output keeps one "> Task" header per line for the parser
+        command = [str(self.gradlew)] + gradle_args + ["--console=plain"]
+        self.log(f"Command: {' '.join(command)}\n")
+
+        returncode = self._run_piped(
+            command, self.android_folder, on_line=parser.feed,
+            title=f"Build {build_type.upper()}", gradle=True
+        )
+        if returncode == 0:
+            self.log("\n[SUCCESS] Build completed successfully!\n")
+        elif returncode != CANCELLED:
+            self.log(f"\n[ERROR] Build failed (exit code {returncode}).\n")
+        return returncode
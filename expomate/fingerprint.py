@@ -0,0 +1,125 @@
+import hashlib
+import json
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json, save_json
+from expomate.hashing import TreeHasher
+
+
+FINGERPRINT_FILE = ".expomate-prebuild.json"
+HASH_INDEX = "hash_index.db"
+
+CONFIG_FILES = [
+    "app.json",
+    "app.config.js",
+    "app.config.ts",
+    "app.config.json",
+    "app.config.cjs",
+    "app.config.mjs",
+    "package.json",
+]
+
+LOCKFILES = ["package-lock.json", "yarn.lock", "pnpm-lock.yaml", "bun.lockb", "bun.lock"]
+
+# Folders commonly holding local config plugins referenced from app.config.*
+PLUGIN_DIRS = ["plugins"]
+
+SKIP_DIRS = {"node_modules", ".git", "android", "ios"}
+
+
+def _local_references(value, project_dir, found):
+    """Collect files and folders an app.json value points at ("./assets/icon.png", local plugins)"""
+    if isinstance(value, dict):
+        for item in value.values():
+            _local_references(item, project_dir, found)
+    elif isinstance(value, list):
+        for item in value:
+            _local_references(item, project_dir, found)
+    elif isinstance(value, str) and value.startswith(("./", "../")):
+        path = (project_dir / value).resolve()
+        if path == project_dir or path in project_dir.parents:
+            return
+        if path.exists():
+            found.add(path)
+        else:
+            # Plugins may be referenced without their extension
+            for suffix in (".js", ".ts", ".cjs", ".mjs"):
+                candidate = path.with_name(path.name + suffix)
+                if candidate.exists():
+                    found.add(candidate)
+                    break
+
+
+def _expand(path):
+    """A file, or every file below a folder (skipping generated folders)"""
+    if path.is_file():
+        return [path]
+    files = []
+    for child in sorted(path.iterdir()):
+        if child.is_dir() and child.name in SKIP_DIRS:
+            continue
+        files.extend(_expand(child))
+    return files
+
+
+def prebuild_inputs(project_dir):
+    """Files whose contents decide what `expo prebuild` generates"""
+    project_dir = Path(project_dir).resolve()
+    found = set()
+
+    for name in CONFIG_FILES + LOCKFILES:
+        path = project_dir / name
+        if path.exists():
+            found.add(path)
+
+    for name in PLUGIN_DIRS:
+        path = project_dir / name
+        if path.is_dir():
+            found.add(path)
+
+    try:
+        with open(project_dir / "app.json", 'r', encoding='utf-8') as f:
+            _local_references(json.load(f), project_dir, found)
+    except (OSError, ValueError):
+        pass
+
+    files = set()
+    for path in found:
+        files.update(_expand(path))
+    return sorted(files)
+
+
+def compute_fingerprint(project_dir):
+    """Digest over the relative path and contents of every prebuild input"""
+    project_dir = Path(project_dir).resolve()
+    hasher = TreeHasher(cache_path(HASH_INDEX))
+    try:
+        digests = hasher.hash_files(prebuild_inputs(project_dir))
+    finally:
+        hasher.close()
+
+    digest = hashlib.sha256()
+    for path in sorted(digests):
+        try:
+            relative = Path(path).relative_to(project_dir).as_posix()
+        except ValueError:
+            relative = Path(path).as_posix()
+        digest.update(f"{relative}\0{digests[path]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def fingerprint_path(project_dir):
+    return Path(project_dir) / "android" / FINGERPRINT_FILE
+
+
+def is_prebuild_current(project_dir, fingerprint=None):
+    """True if android/ was generated from exactly the current inputs"""
+    stored = load_json(fingerprint_path(project_dir), {})
+    if not stored.get("fingerprint"):
+        return False
+    return stored["fingerprint"] == (fingerprint or compute_fingerprint(project_dir))
+
+
+def record_prebuild(project_dir, fingerprint):
+    """Remember the inputs the android/ folder was generated from"""
+    save_json(fingerprint_path(project_dir), {"fingerprint": fingerprint})
@@ -0,0 +1,252 @@
+import os
+import statistics
+import threading
+import time
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json, save_json
+from expomate.system import total_memory
+
+
+# Block older versions wrote into android/gradle.properties for fast builds
+PROFILE_BEGIN = "# >>> ExpoMate fast build profile (managed, removed for baseline builds)"
+PROFILE_END = "# <<< ExpoMate fast build profile"
+
+TIMINGS_FILE = "build_times.json"
+KEEP_TIMINGS = 10
+
+# Compile output formats: one universal APK, one APK per ABI, or an App Bundle for Play
+OUTPUT_APK = "apk"
+OUTPUT_SPLITS = "splits"
+OUTPUT_AAB = "aab"
+OUTPUT_FORMATS = (OUTPUT_APK, OUTPUT_SPLITS, OUTPUT_AAB)
+
+# ABIs React Native builds native code for by default
+ABIS = ("armeabi-v7a", "arm64-v8a", "x86", "x86_64")
+
+# Target ABI choices besides a single ABI: every ABI, or those of the connected devices
+ABI_ALL = "all"
+ABI_DEVICE = "device"
+
+SPLITS_INIT_SCRIPT = "abi_splits.init.gradle"
+
+# Turns on per-ABI APK splits for the app without touching the project's
+# build.gradle; the ABIs follow reactNativeArchitectures when it is set
+ABI_SPLITS_INIT = """\
+allprojects { project ->
+    project.plugins.withId("com.android.application") {
+        def abis = (project.findProperty("reactNativeArchitectures") ?: "%s").toString().split(",")*.trim()
+        project.android.splits.abi {
+            enable true
+            reset()
+            include(*abis)
+            universalApk false
+        }
+    }
+}
+"""
+
+BUILD_CACHE_INIT_SCRIPT = "build_cache.init.gradle"
+
+# Adds the ExpoMate cache node as the remote build cache; the URL is a project
+# property so the script itself never changes between sessions
+BUILD_CACHE_INIT = """\
+gradle.settingsEvaluated { settings ->
+    def cacheUrl = settings.startParameter.projectProperties["expomateBuildCacheUrl"]
+    if (cacheUrl) {
+        settings.buildCache {
+            remote(HttpBuildCache) {
+                setUrl(cacheUrl)
+                push = true
+                allowInsecureProtocol = true
+            }
+        }
+    }
+}
+"""
+
+TASK_TIMES_INIT_SCRIPT = "task_times.init.gradle"
+
+# Prints each task's real start and end time (epoch ms) and the tasks it
+# depended on, for the critical path in the build profile. Listening through a
+# build service keeps the configuration cache usable.
+TASK_TIMES_INIT = """\
+import javax.inject.Inject
+import org.gradle.api.services.BuildService
+import org.gradle.api.services.BuildServiceParameters
+import org.gradle.build.event.BuildEventsListenerRegistry
+import org.gradle.tooling.events.FinishEvent
+import org.gradle.tooling.events.OperationCompletionListener
+import org.gradle.tooling.events.task.TaskFinishEvent
+import org.gradle.tooling.events.task.TaskOperationDescriptor
+
+abstract class ExpoMateTaskTimes implements BuildService<BuildServiceParameters.None>, OperationCompletionListener {
+    @Override
+    void onFinish(FinishEvent event) {
+        if (!(event instanceof TaskFinishEvent)) {
+            return
+        }
+        def descriptor = event.descriptor
+        def dependencies = descriptor.dependencies.findAll { it instanceof TaskOperationDescriptor }*.taskPath
+        println "##expomate-task ${descriptor.taskPath} ${event.result.startTime} ${event.result.endTime} ${dependencies.join(',') ?: '-'}"
+    }
+}
+
+abstract class ExpoMateTaskTimesPlugin implements Plugin<Gradle> {
+    @Inject
+    abstract BuildEventsListenerRegistry getRegistry()
+
+    void apply(Gradle gradle) {
+        registry.onTaskCompletion(gradle.sharedServices.registerIfAbsent("expomateTaskTimes", ExpoMateTaskTimes) {})
+    }
+}
+
+apply plugin: ExpoMateTaskTimesPlugin
+"""
+
+
+def gradle_user_home():
+    """Folder Gradle keeps its wrapper distributions, caches and daemons in"""
+    return Path(os.environ.get("GRADLE_USER_HOME") or Path.home() / ".gradle")
+
+
+def fast_build_args(max_workers=None):
+    """Command-line flags for the fast build profile
+
+    Everything is passed for this run only, so the project's gradle.properties
+    is never changed and a baseline build running at the same time is not
+    affected.
+    """
+    workers = max_workers or os.cpu_count() or 2
+    return [
+        "--daemon",
+        "--build-cache",
+        "--parallel",
+        f"--max-workers={workers}",
+        "--configuration-cache",
+        # Plugins that are not configuration-cache safe warn instead of failing the build
+        "-Dorg.gradle.configuration-cache.problems=warn",
+    ] + [f"-D{key}={value}" for key, value in fast_build_properties().items()]
+
+
+def output_args(output):
+    """Extra Gradle flags for an output format (the init script for ABI splits)"""
+    if output != OUTPUT_SPLITS:
+        return []
+    path = cache_path(SPLITS_INIT_SCRIPT)
+    text = ABI_SPLITS_INIT % ",".join(ABIS)
+    # Rewriting an unchanged script would invalidate Gradle's configuration cache
+    if not path.exists() or path.read_text(encoding='utf-8') != text:
+        path.write_text(text, encoding='utf-8')
+    return ["--init-script", str(path.resolve())]
+
+
+def build_cache_args(url):
+    """Gradle flags that turn on the build cache with the cache node at url as its remote"""
+    if not url:
+        return []
+    path = cache_path(BUILD_CACHE_INIT_SCRIPT)
+    if not path.exists() or path.read_text(encoding='utf-8') != BUILD_CACHE_INIT:
+        path.write_text(BUILD_CACHE_INIT, encoding='utf-8')
+    return ["--build-cache", "--init-script", str(path.resolve()), f"-PexpomateBuildCacheUrl={url}"]
+
+
+def task_times_args():
+    """Gradle flags that make Gradle report task times and dependencies (see TASK_TIMES_INIT)"""
+    path = cache_path(TASK_TIMES_INIT_SCRIPT)
+    if not path.exists() or path.read_text(encoding='utf-8') != TASK_TIMES_INIT:
+        path.write_text(TASK_TIMES_INIT, encoding='utf-8')
+    return ["--init-script", str(path.resolve())]
+
+
+def abi_args(abis):
+    """Restrict native builds to abis for this run only (gradle.properties stays as it is)"""
+    if not abis:
+        return []
+    return [f"-PreactNativeArchitectures={','.join(abis)}"]
+
+
+def fast_build_properties():
+    """Gradle properties of the fast build profile that have no flag of their own"""
+    memory = total_memory() or 8 * 1024 ** 3
+    # A quarter of RAM for the daemon, between 2 and 8 GB
+    heap_gb = min(8, max(2, memory // (4 * 1024 ** 3)))
+    return {
+        "org.gradle.jvmargs": f"-Xmx{heap_gb}g -XX:MaxMetaspaceSize=1g -XX:+UseParallelGC -Dfile.encoding=UTF-8",
+        # Keep a warm daemon around for three hours between builds
+        "org.gradle.daemon.idletimeout": str(3 * 60 * 60 * 1000),
+    }
+
+
+def remove_fast_profile(android_folder):
+    """Remove the managed fast-profile block older versions left in android/gradle.properties
+
+    The file is only rewritten when the block is there.
+    """
+    properties_file = android_folder / "gradle.properties"
+    try:
+        with open(properties_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+
+    kept = []
+    inside = found = False
+    for line in lines:
+        if line.strip() == PROFILE_BEGIN:
+            inside = found = True
+        elif line.strip() == PROFILE_END:
+            inside = False
+        elif not inside:
+            kept.append(line)
+    if not found:
+        return
+
+    while kept and not kept[-1].strip():
+        kept.pop()
+    with open(properties_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(kept) + "\n")
+
+
+_timings_lock = threading.Lock()
+
+
+class BuildTimings:
+    """Wall-clock times of successful compiles per project, variant and profile"""
+
+    def __init__(self):
+        self.path = cache_path(TIMINGS_FILE)
+        self.data = load_json(self.path, {})
+
+    def record(self, project, variant, profile, seconds):
+        # Builds finishing at the same time each add their run to what is on disk now
+        with _timings_lock:
+            self.data = load_json(self.path, {})
+            self._append(project, variant, profile, seconds)
+            save_json(self.path, self.data)
+
+    def _append(self, project, variant, profile, seconds):
+        runs = self.data.setdefault(str(project), {}).setdefault(variant, {}).setdefault(profile, [])
+        runs.append(round(seconds, 1))
+        del runs[:-KEEP_TIMINGS]
+
+    def median(self, project, variant, profile):
+        runs = self.data.get(str(project), {}).get(variant, {}).get(profile)
+        return statistics.median(runs) if runs else None
+
+    def report(self, project, variant, seconds):
+        """One line comparing a fast-profile run with the baseline median"""
+        baseline = self.median(project, variant, "baseline")
+        if baseline is None:
+            return (f"[INFO] Fast build took {seconds:.0f}s. Run once without the fast profile "
+                    f"to record a baseline to compare against.\n")
+        saved = baseline - seconds
+        return (f"[INFO] Fast build took {seconds:.0f}s vs {baseline:.0f}s baseline median: "
+                f"{'saved' if saved >= 0 else 'lost'} {abs(saved):.0f}s ({abs(saved) / baseline:.0%}).\n")
+
+
+def timed(func, *args, **kwargs):
+    """Call func, returning (result, elapsed seconds on the monotonic clock)"""
+    start = time.monotonic()
+    result = func(*args, **kwargs)
+    return result, time.monotonic() - start
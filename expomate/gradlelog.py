@@ -0,0 +1,258 @@
+import re
+import time
+from datetime import datetime
+
+from expomate.cache import save_json
+
+
+TASK_LINE = re.compile(r"^> Task (:\S+)(?:\s+([A-Z][A-Z-]+))?\s*$")
+CONFIGURE_LINE = re.compile(r"^> Configure project (:\S*)")
+RESULT_LINE = re.compile(r"^BUILD (SUCCESSFUL|FAILED) in (.+)$")
+ACTIONABLE_LINE = re.compile(r"^(\d+) actionable tasks?: (.+)$")
+
+# Printed by the task-times init script (gradle.TASK_TIMES_INIT): path, start and end in epoch ms, dependencies
+TASK_TIMES_PREFIX = "##expomate-task "
+TASK_TIMES_LINE = re.compile(r"^##expomate-task (:\S+) (\d+) (\d+) (\S+)$")
+
+WARNING_LINE = re.compile(r"^(w: |warning: |WARNING: |Warning: )|: warning: ")
+ERROR_LINE = re.compile(r"^(e: |error: |ERROR: |FAILURE: )|: error: ")
+
+# Task name patterns grouped into the stages we care about, first match wins
+CATEGORIES = [
+    ("JS bundling", re.compile(r"^createBundle\w*JsAndAssets$")),
+    ("R8 / minify", re.compile(r"R8|^minify|^shrink")),
+    ("Dexing", re.compile(r"[Dd]ex")),
+    ("Resources", re.compile(r"^(merge|process|link|compile|generate|parse)\w*(Resources|Res|Manifest)\w*$")),
+    ("Kotlin / Java", re.compile(r"^compile\w*(Kotlin|JavaWithJavac|Java)$")),
+    ("Native (CMake)", re.compile(r"CMake|[Nn]ative|^externalNativeBuild")),
+    ("Packaging", re.compile(r"^(package|assemble|bundle|sign|zipalign|createApkListing)")),
+]
+
+# Warnings and errors kept in the profile (the full text is in the log)
+KEEP_MESSAGES = 50
+
+# Slowest tasks listed in a profile: the longest ones until this share of execution time
+SLOWEST_SHARE = 0.8
+
+
+def critical_path(task_times):
+    """Tasks on the critical path, first to last, from {path: (start, end, dependencies)}
+
+    Walks back from the task that finished last, each time to the dependency
+    that finished last: the one the task was waiting for.
+    """
+    if not task_times:
+        return []
+    path = [max(task_times, key=lambda task: task_times[task][1])]
+    seen = set(path)
+    while True:
+        candidates = [task for task in task_times[path[-1]][2] if task in task_times and task not in seen]
+        if not candidates:
+            return path[::-1]
+        path.append(max(candidates, key=lambda task: task_times[task][1]))
+        seen.add(path[-1])
+
+
+def task_category(task_path):
+    """Category of a task path such as :app:minifyReleaseWithR8"""
+    name = task_path.rsplit(":", 1)[-1]
+    for category, pattern in CATEGORIES:
+        if pattern.search(name):
+            return category
+    return "Other"
+
+
+class GradleOutputParser:
+    """Streaming parser for Gradle console output (--console=plain)
+
+    feed() takes each line as it arrives and stamps it on the monotonic clock.
+    Gradle prints a task's header when the task starts, so a task is charged
+    the time until the next header: exact for a serial build, and for a
+    parallel build the wall time the build spent with that task in front.
+    Real task times and dependencies, for the critical path, come from the
+    lines the task-times init script prints.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self.first_configure = None
+        self.first_task = None
+        self.finished = None
+
+        self.tasks = []           # [path, outcome, started, seconds]
+        self.task_times = {}      # path -> (start, end, dependencies) in seconds, from TASK_TIMES_LINE
+        self.projects = []
+        self.warnings = []
+        self.errors = []
+        self.warning_count = 0
+        self.error_count = 0
+        self.result = None
+        self.reported_time = None
+        self.actionable = None
+
+    def _close_task(self, now):
+        if self.tasks and self.tasks[-1][3] is None:
+            self.tasks[-1][3] = now - self.tasks[-1][2]
+
+    def feed(self, line):
+        """Parse one line of output"""
+        now = self.clock()
+        line = line.rstrip()
+
+        match = TASK_TIMES_LINE.match(line)
+        if match:
+            path, start, end, dependencies = match.groups()
+            self.task_times[path] = (int(start) / 1000, int(end) / 1000,
+                                     [] if dependencies == "-" else dependencies.split(","))
+            return
+
+        match = TASK_LINE.match(line)
+        if match:
+            self._close_task(now)
+            if self.first_task is None:
+                self.first_task = now
+            self.tasks.append([match.group(1), match.group(2) or "EXECUTED", now, None])
+            return
+
+        match = CONFIGURE_LINE.match(line)
+        if match:
+            if self.first_configure is None:
+                self.first_configure = now
+            self.projects.append(match.group(1))
+            return
+
+        match = RESULT_LINE.match(line)
+        if match:
+            self._close_task(now)
+            self.finished = now
+            self.result = match.group(1)
+            self.reported_time = match.group(2)
+            return
+
+        match = ACTIONABLE_LINE.match(line)
+        if match:
+            self.actionable = line
+            return
+
+        if ERROR_LINE.search(line):
+            self.error_count += 1
+            if len(self.errors) < KEEP_MESSAGES:
+                self.errors.append(line)
+        elif WARNING_LINE.search(line):
+            self.warning_count += 1
+            if len(self.warnings) < KEEP_MESSAGES:
+                self.warnings.append(line)
+
+    def finish(self, returncode=None):
+        """Build profile as a JSON-ready dict"""
+        end = self.finished if self.finished is not None else self.clock()
+        self._close_task(end)
+
+        execution_start = self.first_task if self.first_task is not None else end
+        configuration_start = self.first_configure if self.first_configure is not None else execution_start
+        phases = {
+            "initialization": round(configuration_start - self.started, 3),
+            "configuration": round(execution_start - configuration_start, 3),
+            "execution": round(end - execution_start, 3),
+        }
+
+        tasks = [
+            {"path": path, "outcome": outcome, "category": task_category(path), "seconds": round(seconds, 3)}
+            for path, outcome, _, seconds in self.tasks
+        ]
+
+        categories = {}
+        for task in tasks:
+            categories[task["category"]] = categories.get(task["category"], 0) + task["seconds"]
+
+        execution = phases["execution"]
+        # Charged time from the console output alone; with --parallel these tasks
+        # may well have overlapped (critical_path has the real picture)
+        slowest_tasks = []
+        covered = 0
+        for task in sorted(tasks, key=lambda task: task["seconds"], reverse=True):
+            if execution <= 0 or covered >= SLOWEST_SHARE * execution:
+                break
+            slowest_tasks.append({
+                "path": task["path"],
+                "seconds": task["seconds"],
+                "share": round(task["seconds"] / execution, 3),
+            })
+            covered += task["seconds"]
+
+        critical = [
+            {"path": task, "category": task_category(task),
+             "seconds": round(self.task_times[task][1] - self.task_times[task][0], 3)}
+            for task in critical_path(self.task_times)
+        ]
+
+        return {
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "result": self.result or ("SUCCESSFUL" if returncode == 0 else "FAILED"),
+            "returncode": returncode,
+            "wall_seconds": round(end - self.started, 3),
+            "gradle_reported_time": self.reported_time,
+            "actionable_tasks": self.actionable,
+            "phases": phases,
+            "configured_projects": len(self.projects),
+            "categories": {name: round(seconds, 3) for name, seconds in
+                           sorted(categories.items(), key=lambda item: item[1], reverse=True)},
+            "slowest_tasks": slowest_tasks,
+            "critical_path": critical,
+            "critical_path_seconds": round(sum(step["seconds"] for step in critical), 3),
+            "tasks": tasks,
+            "warning_count": self.warning_count,
+            "error_count": self.error_count,
+            "warnings": self.warnings,
+            "errors": self.errors,
+        }
+
+
+def format_profile(profile, top=10):
+    """Human-readable summary of a build profile for the log"""
+    phases = profile["phases"]
+    lines = [
+        "\n=== Gradle build profile ===\n",
+        f"Wall time {profile['wall_seconds']:.1f}s: initialization {phases['initialization']:.1f}s, "
+        f"configuration {phases['configuration']:.1f}s, execution {phases['execution']:.1f}s\n",
+    ]
+    if profile["actionable_tasks"]:
+        lines.append(f"{profile['actionable_tasks']}\n")
+
+    if profile["categories"]:
+        lines.append("Time by stage:\n")
+        for name, seconds in profile["categories"].items():
+            lines.append(f"  {name:<16} {seconds:8.1f}s\n")
+
+    slowest = sorted(profile["tasks"], key=lambda task: task["seconds"], reverse=True)[:top]
+    if slowest:
+        lines.append("Slowest tasks:\n")
+        for task in slowest:
+            lines.append(f"  {task['seconds']:8.1f}s  {task['path']} ({task['outcome']})\n")
+
+    if profile["critical_path"]:
+        lines.append(f"Critical path: {profile['critical_path_seconds']:.1f}s over "
+                     f"{len(profile['critical_path'])} tasks, the longest:\n")
+        for step in sorted(profile["critical_path"], key=lambda step: step["seconds"], reverse=True)[:top]:
+            lines.append(f"  {step['seconds']:8.1f}s  {step['path']}\n")
+    elif profile["slowest_tasks"]:
+        share = sum(step["share"] for step in profile["slowest_tasks"])
+        lines.append(f"{len(profile['slowest_tasks'])} tasks were charged {share:.0%} of execution time "
+                     f"(they may have run in parallel)\n")
+
+    lines.append(f"Warnings: {profile['warning_count']}, errors: {profile['error_count']}\n")
+    return "".join(lines)
+
+
+def save_profile(path, profile):
+    """Write a build profile as JSON"""
+    save_json(path, profile)
+
+
+def profile_path_for(log_file, build_id):
+    """Where the Gradle profile of build build_id, logged to log_file, is saved
+
+    One log can hold several builds (a GUI session), so each gets its own file.
+    """
+    return log_file.with_name(f"{log_file.stem}_{build_id}_gradle_profile.json")
@@ -0,0 +1,1731 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, scrolledtext
+import threading
+import time
+import os
+from datetime import datetime
+from pathlib import Path
+import sys
+
+# Only tkinter is imported here; ExpoMate's own modules (the build engine,
+# the scheduler, the log archive and queue, ...) load where they are first
+# used (see benchmarks/bench_startup.py for the startup budget)
+
+
+def _open_url(url):
+    import webbrowser
+    webbrowser.open(url)
+
+
+class ExpoMateBuilder:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("ExpoMate - Android APK Builder")
+        self.root.geometry("900x700")
+        self.root.resizable(True, True)
+
+        # Colors - Dark and Orange theme (Elegant)
+        self.bg_color = "#0f0f0f"
+        self.fg_color = "#ffffff"
+        self.orange_color = "#ff8c00"
+        self.orange_hover = "#ffaa33"
+        self.dark_gray = "#1a1a1a"
+        self.light_gray = "#2d2d2d"
+        self.accent_color = "#ff6b35"
+
+        self.root.configure(bg=self.bg_color)
+
+        # Variables
+        self.expo_folder = tk.StringVar()
+        self.build_type = tk.StringVar(value="release")  # debug, release or all
+        self.force_prebuild = tk.BooleanVar(value=False)
+        self.fast_build = tk.BooleanVar(value=False)
+        self.incremental_clean = tk.BooleanVar(value=True)
+        self.use_cache_node = tk.BooleanVar(value=False)
+        self.output_format = tk.StringVar(value="apk")  # apk, splits or aab
+        self.target_abi = tk.StringVar(value="all")  # all, device or one ABI
+        self.terminal_mirror = tk.BooleanVar(value=False)
+        self._scheduler = None
+        self._cache_node = None
+        self.about_window = None
+        self.is_prebuild_done = False
+        self.log_dir = Path("log")
+        self.log_dir.mkdir(exist_ok=True)
+        self.current_log_file = None
+        self.log_pipeline = None
+        self.poll_interval = 50  # ms between UI polls (log lines and job states)
+        self.queue_window = None
+        self._queue_dirty = True
+        self._log_archive = None
+        self.log_session = None
+        self.search_window = None
+        self.stats_window = None
+        self._build_queue = None
+
+        # Setup UI
+        self.setup_ui()
+
+        # Initialize log file
+        self.init_log_file()
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(self.poll_interval, self._poll)
+        self.root.after_idle(self._resume_queue)
+
+    @property
+    def log_archive(self):
+        """The log archive, started with the first log batch (after the window is up)"""
+        if self._log_archive is None:
+            from expomate.logarchive import LogArchive
+            self._log_archive = LogArchive(self.log_dir, log=self.log_message)
+            self.log_session = self._log_archive.open_session(self.current_log_file)
+            self._log_archive.maintain()
+        return self._log_archive
+
+    @property
+    def build_queue(self):
+        """The persistent build queue, loaded once the window is up"""
+        if self._build_queue is None:
+            from expomate.buildqueue import BuildQueue
+            self._build_queue = BuildQueue(self.log_dir / "jobs", on_change=self._queue_changed,
+                                           archive=self.log_archive)
+        return self._build_queue
+
+    def _resume_queue(self):
+        """Pick the build queue up where the last session left it"""
+        pending = [job for job in self.build_queue.snapshot() if job["state"] == "queued"]
+        if pending and self.build_queue.running:
+            self.log_message(f"[INFO] Resuming build queue ({len(pending)} job(s) pending)\n")
+            self.build_queue.start()
+        elif pending:
+            self.log_message(f"[INFO] Build queue has {len(pending)} pending job(s). Open Queue to start it.\n")
+
+    def _new_log_path(self):
+        """A fresh timestamped log file path"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = self.log_dir / f"log_data_{timestamp}.txt"
+        if path.exists():
+            # Rotated within the same second
+            path = self.log_dir / f"log_data_{timestamp}_{time.monotonic_ns()}.txt"
+        return path
+
+    def init_log_file(self):
+        """Initialize log file with timestamp"""
+        from expomate.logpipe import LogPipeline
+        self.current_log_file = self._new_log_path()
+        # The log archive (and its session) starts with the first batch
+        self.log_pipeline = LogPipeline(self.current_log_file, sink=self.log_view.append, on_batch=self._index_log_batch)
+        self.log_view.set_log_file(self.current_log_file, before_read=self.log_pipeline.flush)
+        self.log_message(f"=== ExpoMate - Log Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
+
+    def _index_log_batch(self, text):
+        """Feed each written log batch to the search index, tagged with the selected project"""
+        self.log_archive.index(self.log_session, text, project=self.expo_folder.get() or None)
+
+    def _rotate_log(self):
+        """Continue in a new log file once the current one reaches the size limit"""
+        previous = self.log_session
+        self.current_log_file = self._new_log_path()
+        # The same pipeline switches files, so lines worker threads log meanwhile stay queued
+        self.log_pipeline.reopen(self.current_log_file)
+        self.log_archive.close_session(previous)
+        self.log_archive.maintain()
+        self.log_session = self.log_archive.open_session(self.current_log_file)
+        self.log_view.set_log_file(self.current_log_file, before_read=self.log_pipeline.flush)
+        self.log_message("[INFO] Log rotated, the previous part is archived and searchable.\n")
+
+    def setup_ui(self):
+        """Setup the elegant user interface"""
+        # Header Frame with gradient effect simulation
+        header_frame = tk.Frame(self.root, bg=self.dark_gray, height=100)
+        header_frame.pack(fill=tk.X, padx=0, pady=0)
+        header_frame.pack_propagate(False)
+
+        # Title with elegant styling
+        title_label = tk.Label(
+            header_frame,
+            text="⚡ ExpoMate",
+            font=("Segoe UI", 32, "bold"),
+            bg=self.dark_gray,
+            fg=self.orange_color
+        )
+        title_label.pack(pady=(20, 0))
+
+        subtitle_label = tk.Label(
+            header_frame,
+            text="Android APK Builder • Powered by Expo",
+            font=("Segoe UI", 11),
+            bg=self.dark_gray,
+            fg="#888888"
+        )
+        subtitle_label.pack(pady=(0, 10))
+
+        # Menu bar (About button in top right)
+        menu_frame = tk.Frame(header_frame, bg=self.dark_gray)
+        menu_frame.place(relx=1.0, rely=0, anchor="ne", x=-10, y=10)
+
+        about_btn = tk.Button(
+            menu_frame,
+            text="ℹ About",
+            command=self.show_about,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 9),
+            relief=tk.FLAT,
+            padx=15,
+            pady=5,
+            cursor="hand2",
+            borderwidth=0
+        )
+        about_btn.pack(side=tk.RIGHT)
+        self._bind_hover_effect(about_btn, self.light_gray, self.orange_color)
+
+        queue_btn = tk.Button(
+            menu_frame,
+            text="📋 Queue",
+            command=self.show_queue,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 9),
+            relief=tk.FLAT,
+            padx=15,
+            pady=5,
+            cursor="hand2",
+            borderwidth=0
+        )
+        queue_btn.pack(side=tk.RIGHT, padx=(0, 8))
+        self._bind_hover_effect(queue_btn, self.light_gray, self.orange_color)
+
+        stats_btn = tk.Button(
+            menu_frame,
+            text="📈 Stats",
+            command=self.show_stats,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 9),
+            relief=tk.FLAT,
+            padx=15,
+            pady=5,
+            cursor="hand2",
+            borderwidth=0
+        )
+        stats_btn.pack(side=tk.RIGHT, padx=(0, 8))
+        self._bind_hover_effect(stats_btn, self.light_gray, self.orange_color)
+
+        # Main container with padding
+        main_frame = tk.Frame(self.root, bg=self.bg_color)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
+
+        # Folder selection card
+        folder_card = tk.Frame(main_frame, bg=self.dark_gray, bd=0)
+        folder_card.pack(fill=tk.X, pady=(0, 20))
+
+        folder_inner = tk.Frame(folder_card, bg=self.dark_gray)
+        folder_inner.pack(fill=tk.X, padx=20, pady=15)
+
+        folder_label = tk.Label(
+            folder_inner,
+            text="📁 Expo Project Folder",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.dark_gray,
+            fg=self.orange_color
+        )
+        folder_label.pack(anchor=tk.W, pady=(0, 8))
+
+        folder_select_frame = tk.Frame(folder_inner, bg=self.dark_gray)
+        folder_select_frame.pack(fill=tk.X)
+
+        self.folder_entry = tk.Entry(
+            folder_select_frame,
+            textvariable=self.expo_folder,
+            font=("Segoe UI", 10),
+            bg=self.light_gray,
+            fg=self.fg_color,
+            insertbackground=self.orange_color,
+            relief=tk.FLAT,
+            state="readonly",
+            readonlybackground=self.light_gray
+        )
+        self.folder_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=8, padx=(0, 10))
+
+        browse_btn = tk.Button(
+            folder_select_frame,
+            text="Browse",
+            command=self.browse_folder,
+            bg=self.orange_color,
+            fg="#000000",
+            font=("Segoe UI", 10, "bold"),
+            relief=tk.FLAT,
+            padx=25,
+            pady=8,
+            cursor="hand2",
+            borderwidth=0
+        )
+        browse_btn.pack(side=tk.LEFT)
+        self._bind_hover_effect(browse_btn, self.orange_color, self.orange_hover)
+
+        recheck_btn = tk.Button(
+            folder_select_frame,
+            text="Re-check",
+            command=self.recheck_toolchain,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 10),
+            relief=tk.FLAT,
+            padx=15,
+            pady=8,
+            cursor="hand2",
+            borderwidth=0
+        )
+        recheck_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self._bind_hover_effect(recheck_btn, self.light_gray, self.accent_color)
+
+        # Build Type Selection Card
+        build_card = tk.Frame(main_frame, bg=self.dark_gray, bd=0)
+        build_card.pack(fill=tk.X, pady=(0, 20))
+
+        build_inner = tk.Frame(build_card, bg=self.dark_gray)
+        build_inner.pack(fill=tk.X, padx=20, pady=15)
+
+        build_label = tk.Label(
+            build_inner,
+            text="⚙️ Build Configuration",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.dark_gray,
+            fg=self.orange_color
+        )
+        build_label.pack(anchor=tk.W, pady=(0, 10))
+
+        build_type_frame = tk.Frame(build_inner, bg=self.dark_gray)
+        build_type_frame.pack(fill=tk.X)
+
+        # Custom styled radio buttons
+        self.release_radio = tk.Radiobutton(
+            build_type_frame,
+            text="Release Build (Production)",
+            variable=self.build_type,
+            value="release",
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.release_radio.pack(side=tk.LEFT, padx=(0, 30))
+
+        self.debug_radio = tk.Radiobutton(
+            build_type_frame,
+            text="Debug Build (Development)",
+            variable=self.build_type,
+            value="debug",
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.debug_radio.pack(side=tk.LEFT, padx=(0, 30))
+
+        self.all_radio = tk.Radiobutton(
+            build_type_frame,
+            text="All Variants (Debug + Release)",
+            variable=self.build_type,
+            value="all",
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.all_radio.pack(side=tk.LEFT)
+
+        output_frame = tk.Frame(build_inner, bg=self.dark_gray)
+        output_frame.pack(fill=tk.X, pady=(10, 0))
+
+        tk.Label(
+            output_frame,
+            text="Output:",
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg="#888888"
+        ).pack(side=tk.LEFT, padx=(0, 15))
+
+        for text, value in [
+            ("Universal APK", "apk"),
+            ("Split APKs (one per ABI)", "splits"),
+            ("App Bundle (AAB, Play Store)", "aab"),
+        ]:
+            tk.Radiobutton(
+                output_frame,
+                text=text,
+                variable=self.output_format,
+                value=value,
+                font=("Segoe UI", 10),
+                bg=self.dark_gray,
+                fg=self.fg_color,
+                selectcolor=self.light_gray,
+                activebackground=self.dark_gray,
+                activeforeground=self.orange_color,
+                cursor="hand2",
+                bd=0,
+                highlightthickness=0
+            ).pack(side=tk.LEFT, padx=(0, 30))
+
+        abi_frame = tk.Frame(build_inner, bg=self.dark_gray)
+        abi_frame.pack(fill=tk.X, pady=(10, 0))
+
+        tk.Label(
+            abi_frame,
+            text="Target ABI:",
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg="#888888"
+        ).pack(side=tk.LEFT, padx=(0, 15))
+
+        abi_menu = tk.OptionMenu(abi_frame, self.target_abi, "all", "device", "arm64-v8a", "armeabi-v7a", "x86_64", "x86")
+        abi_menu.config(
+            font=("Segoe UI", 9),
+            bg=self.light_gray,
+            fg=self.fg_color,
+            activebackground=self.accent_color,
+            activeforeground=self.fg_color,
+            relief=tk.FLAT,
+            highlightthickness=0,
+            cursor="hand2"
+        )
+        abi_menu["menu"].config(bg=self.light_gray, fg=self.fg_color, activebackground=self.accent_color)
+        abi_menu.pack(side=tk.LEFT)
+
+        tk.Label(
+            abi_frame,
+            text="\"device\" builds for the phone or emulator connected with adb; one ABI makes debug builds much faster",
+            font=("Segoe UI", 8),
+            bg=self.dark_gray,
+            fg="#888888"
+        ).pack(side=tk.LEFT, padx=(15, 0))
+
+        build_options_frame = tk.Frame(build_inner, bg=self.dark_gray)
+        build_options_frame.pack(fill=tk.X, pady=(10, 0))
+
+        self.force_prebuild_check = tk.Checkbutton(
+            build_options_frame,
+            text="Force prebuild (ignore unchanged inputs)",
+            variable=self.force_prebuild,
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.force_prebuild_check.pack(side=tk.LEFT, padx=(0, 30))
+
+        self.fast_build_check = tk.Checkbutton(
+            build_options_frame,
+            text="Fast build profile (daemon, build cache, parallel)",
+            variable=self.fast_build,
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.fast_build_check.pack(side=tk.LEFT, padx=(0, 30))
+
+        self.incremental_clean_check = tk.Checkbutton(
+            build_options_frame,
+            text="Incremental clean (changed modules only)",
+            variable=self.incremental_clean,
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.incremental_clean_check.pack(side=tk.LEFT, padx=(0, 30))
+
+        self.cache_node_check = tk.Checkbutton(
+            build_options_frame,
+            text="Local build cache node",
+            variable=self.use_cache_node,
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.cache_node_check.pack(side=tk.LEFT, padx=(0, 30))
+
+        self.terminal_mirror_check = tk.Checkbutton(
+            build_options_frame,
+            text="Mirror output in a terminal",
+            variable=self.terminal_mirror,
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            selectcolor=self.light_gray,
+            activebackground=self.dark_gray,
+            activeforeground=self.orange_color,
+            cursor="hand2",
+            bd=0,
+            highlightthickness=0
+        )
+        self.terminal_mirror_check.pack(side=tk.LEFT)
+
+        # Action Buttons Card
+        actions_card = tk.Frame(main_frame, bg=self.dark_gray, bd=0)
+        actions_card.pack(fill=tk.X, pady=(0, 20))
+
+        actions_inner = tk.Frame(actions_card, bg=self.dark_gray)
+        actions_inner.pack(fill=tk.X, padx=20, pady=15)
+
+        buttons_frame = tk.Frame(actions_inner, bg=self.dark_gray)
+        buttons_frame.pack()
+
+        self.prebuild_btn = tk.Button(
+            buttons_frame,
+            text="🔧 Run Prebuild",
+            command=self.run_prebuild,
+            bg=self.orange_color,
+            fg="#000000",
+            font=("Segoe UI", 12, "bold"),
+            relief=tk.FLAT,
+            padx=35,
+            pady=12,
+            cursor="hand2",
+            state=tk.DISABLED,
+            borderwidth=0
+        )
+        self.prebuild_btn.pack(side=tk.LEFT, padx=(0, 15))
+        self._bind_hover_effect(self.prebuild_btn, self.orange_color, self.orange_hover)
+
+        self.clean_btn = tk.Button(
+            buttons_frame,
+            text="🧹 Clean",
+            command=self.run_clean,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 12, "bold"),
+            relief=tk.FLAT,
+            padx=35,
+            pady=12,
+            cursor="hand2",
+            state=tk.DISABLED,
+            borderwidth=0
+        )
+        self.clean_btn.pack(side=tk.LEFT, padx=(0, 15))
+        self._bind_hover_effect(self.clean_btn, self.light_gray, self.accent_color)
+
+        self.compile_btn = tk.Button(
+            buttons_frame,
+            text="🚀 Compile APK",
+            command=self.run_compile,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 12, "bold"),
+            relief=tk.FLAT,
+            padx=35,
+            pady=12,
+            cursor="hand2",
+            state=tk.DISABLED,
+            borderwidth=0
+        )
+        self.compile_btn.pack(side=tk.LEFT, padx=(0, 15))
+        self._bind_hover_effect(self.compile_btn, self.light_gray, self.accent_color)
+
+        self.cancel_btn = tk.Button(
+            buttons_frame,
+            text="⛔ Cancel",
+            command=self.cancel_jobs,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 12, "bold"),
+            relief=tk.FLAT,
+            padx=35,
+            pady=12,
+            cursor="hand2",
+            state=tk.DISABLED,
+            borderwidth=0
+        )
+        self.cancel_btn.pack(side=tk.LEFT)
+        self._bind_hover_effect(self.cancel_btn, self.light_gray, self.accent_color)
+
+        # Progress bar with elegant styling
+        progress_frame = tk.Frame(main_frame, bg=self.bg_color)
+        progress_frame.pack(fill=tk.X, pady=(0, 20))
+
+        self.progress = ttk.Progressbar(
+            progress_frame,
+            mode='indeterminate',
+            length=400
+        )
+        self.progress.pack(fill=tk.X)
+
+        self.job_status_label = tk.Label(
+            progress_frame,
+            text="",
+            font=("Segoe UI", 9),
+            bg=self.bg_color,
+            fg=self.fg_color,
+            anchor="w"
+        )
+        self.job_status_label.pack(fill=tk.X, pady=(5, 0))
+
+        self.cache_node_label = tk.Label(
+            progress_frame,
+            text="",
+            font=("Segoe UI", 9),
+            bg=self.bg_color,
+            fg="#888888",
+            anchor="w"
+        )
+        self.cache_node_label.pack(fill=tk.X)
+
+        # Style progress bar
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure(
+            "TProgressbar",
+            troughcolor=self.dark_gray,
+            background=self.orange_color,
+            bordercolor=self.bg_color,
+            darkcolor=self.orange_color,
+            lightcolor=self.orange_color,
+            thickness=8
+        )
+
+        # Log box card with elegant design
+        log_card = tk.Frame(main_frame, bg=self.dark_gray, bd=0)
+        log_card.pack(fill=tk.BOTH, expand=True)
+
+        log_inner = tk.Frame(log_card, bg=self.dark_gray)
+        log_inner.pack(fill=tk.BOTH, expand=True, padx=20, pady=15)
+
+        log_header = tk.Frame(log_inner, bg=self.dark_gray)
+        log_header.pack(fill=tk.X, pady=(0, 10))
+
+        log_label = tk.Label(
+            log_header,
+            text="📝 Build Log",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.dark_gray,
+            fg=self.orange_color
+        )
+        log_label.pack(side=tk.LEFT)
+
+        clear_log_btn = tk.Button(
+            log_header,
+            text="Clear",
+            command=self.clear_log,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 8),
+            relief=tk.FLAT,
+            padx=12,
+            pady=3,
+            cursor="hand2",
+            borderwidth=0
+        )
+        clear_log_btn.pack(side=tk.RIGHT)
+        self._bind_hover_effect(clear_log_btn, self.light_gray, self.accent_color)
+
+        search_log_btn = tk.Button(
+            log_header,
+            text="🔍 Search",
+            command=self.show_log_search,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 8),
+            relief=tk.FLAT,
+            padx=12,
+            pady=3,
+            cursor="hand2",
+            borderwidth=0
+        )
+        search_log_btn.pack(side=tk.RIGHT, padx=(0, 8))
+        self._bind_hover_effect(search_log_btn, self.light_gray, self.accent_color)
+
+        self.log_box = scrolledtext.ScrolledText(
+            log_inner,
+            font=("Consolas", 9),
+            bg=self.light_gray,
+            fg="#e0e0e0",
+            insertbackground=self.orange_color,
+            relief=tk.FLAT,
+            wrap=tk.WORD,
+            state=tk.DISABLED,
+            padx=10,
+            pady=10
+        )
+        self.log_box.pack(fill=tk.BOTH, expand=True)
+
+        # Only the last few thousand lines live in the widget, older ones page in from the log file
+        from expomate.logview import LogView
+        self.log_view = LogView(self.log_box, max_lines=5000, page_size=500)
+
+        # Configure scrollbar
+        self.log_box.vbar.config(
+            bg=self.dark_gray,
+            troughcolor=self.dark_gray,
+            activebackground=self.orange_color
+        )
+
+        # Footer
+        footer_label = tk.Label(
+            self.root,
+            text="Made with ❤️ by Panda-Pelican Development LLC",
+            font=("Segoe UI", 8),
+            bg=self.bg_color,
+            fg="#555555"
+        )
+        footer_label.pack(side=tk.BOTTOM, pady=(0, 10))
+
+    def _bind_hover_effect(self, button, normal_color, hover_color):
+        """Add hover effect to buttons"""
+        def on_enter(e):
+            if button['state'] != tk.DISABLED:
+                button.config(bg=hover_color)
+
+        def on_leave(e):
+            if button['state'] != tk.DISABLED:
+                button.config(bg=normal_color)
+
+        button.bind("<Enter>", on_enter)
+        button.bind("<Leave>", on_leave)
+
+    def clear_log(self):
+        """Clear the log box"""
+        self.log_view.clear()
+
+    def show_about(self):
+        """Show elegant About dialog, built on first use and reused after that"""
+        if self.about_window is not None and self.about_window.winfo_exists():
+            self.about_window.deiconify()
+        else:
+            self._build_about()
+        self.about_window.lift()
+        self.about_window.grab_set()
+
+    def _hide_about(self):
+        self.about_window.grab_release()
+        self.about_window.withdraw()
+
+    def _build_about(self):
+        about_window = tk.Toplevel(self.root)
+        self.about_window = about_window
+        about_window.title("About ExpoMate")
+        about_window.geometry("500x450")
+        about_window.resizable(False, False)
+        about_window.configure(bg=self.bg_color)
+        about_window.transient(self.root)
+        about_window.protocol("WM_DELETE_WINDOW", self._hide_about)
+
+        # Center the window
+        about_window.update_idletasks()
+        x = (about_window.winfo_screenwidth() // 2) - (500 // 2)
+        y = (about_window.winfo_screenheight() // 2) - (450 // 2)
+        about_window.geometry(f"500x450+{x}+{y}")
+
+        # Header
+        header = tk.Frame(about_window, bg=self.dark_gray, height=100)
+        header.pack(fill=tk.X)
+        header.pack_propagate(False)
+
+        title = tk.Label(
+            header,
+            text="⚡ ExpoMate",
+            font=("Segoe UI", 28, "bold"),
+            bg=self.dark_gray,
+            fg=self.orange_color
+        )
+        title.pack(pady=(20, 5))
+
+        version = tk.Label(
+            header,
+            text="Version 1.1.0",
+            font=("Segoe UI", 10),
+            bg=self.dark_gray,
+            fg="#888888"
+        )
+        version.pack()
+
+        # Content
+        content = tk.Frame(about_window, bg=self.bg_color)
+        content.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
+
+        # Developer info with elegant spacing
+        dev_label = tk.Label(
+            content,
+            text="Developed by",
+            font=("Segoe UI", 10),
+            bg=self.bg_color,
+            fg="#888888"
+        )
+        dev_label.pack(pady=(10, 5))
+
+        name_label = tk.Label(
+            content,
+            text="SkieHackerYT",
+            font=("Segoe UI", 14, "bold"),
+            bg=self.bg_color,
+            fg=self.fg_color
+        )
+        name_label.pack(pady=(0, 5))
+
+        company_label = tk.Label(
+            content,
+            text="Panda-Pelican Development LLC",
+            font=("Segoe UI", 12),
+            bg=self.bg_color,
+            fg=self.orange_color
+        )
+        company_label.pack(pady=(0, 20))
+
+        # Separator
+        separator = tk.Frame(content, bg=self.dark_gray, height=2)
+        separator.pack(fill=tk.X, pady=15)
+
+        # Links with fancy buttons
+        links_label = tk.Label(
+            content,
+            text="Connect & Support",
+            font=("Segoe UI", 11, "bold"),
+            bg=self.bg_color,
+            fg=self.fg_color
+        )
+        links_label.pack(pady=(10, 15))
+
+        # Donate button
+        donate_btn = tk.Button(
+            content,
+            text="💝 Donate via PayPal",
+            command=lambda: _open_url("https://www.paypal.com/paypalme/skiehackeryt"),
+            bg=self.orange_color,
+            fg="#000000",
+            font=("Segoe UI", 11, "bold"),
+            relief=tk.FLAT,
+            padx=30,
+            pady=10,
+            cursor="hand2",
+            borderwidth=0
+        )
+        donate_btn.pack(pady=5)
+        self._bind_hover_effect(donate_btn, self.orange_color, self.orange_hover)
+
+        # GitHub button
+        github_btn = tk.Button(
+            content,
+            text="🌟 View GitHub",
+            command=lambda: _open_url("https://github.com/SkieAdmin"),
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 11, "bold"),
+            relief=tk.FLAT,
+            padx=30,
+            pady=10,
+            cursor="hand2",
+            borderwidth=0
+        )
+        github_btn.pack(pady=5)
+        self._bind_hover_effect(github_btn, self.light_gray, self.accent_color)
+
+        # Close button
+        close_btn = tk.Button(
+            content,
+            text="Close",
+            command=self._hide_about,
+            bg=self.dark_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 9),
+            relief=tk.FLAT,
+            padx=20,
+            pady=8,
+            cursor="hand2",
+            borderwidth=0
+        )
+        close_btn.pack(pady=(20, 0))
+        self._bind_hover_effect(close_btn, self.dark_gray, self.light_gray)
+
+    def show_queue(self):
+        """Show the multi-project build queue window"""
+        if self.queue_window is not None and self.queue_window.winfo_exists():
+            self.queue_window.deiconify()
+            self.queue_window.lift()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("ExpoMate - Build Queue")
+        window.geometry("820x460")
+        window.configure(bg=self.bg_color)
+        window.transient(self.root)
+        self.queue_window = window
+
+        content = tk.Frame(window, bg=self.bg_color)
+        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        title = tk.Label(
+            content,
+            text="📋 Build Queue",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.bg_color,
+            fg=self.orange_color
+        )
+        title.pack(anchor=tk.W, pady=(0, 10))
+
+        style = ttk.Style()
+        style.configure(
+            "Queue.Treeview",
+            background=self.light_gray,
+            fieldbackground=self.light_gray,
+            foreground="#e0e0e0",
+            borderwidth=0,
+            rowheight=24
+        )
+        style.configure("Queue.Treeview.Heading", background=self.dark_gray, foreground=self.orange_color)
+        style.map("Queue.Treeview", background=[("selected", self.accent_color)])
+
+        columns = ("project", "build", "stage", "status", "time")
+        self.queue_tree = ttk.Treeview(content, columns=columns, show="headings", style="Queue.Treeview", height=10)
+        for column, heading, width in [
+            ("project", "Project", 330),
+            ("build", "Build", 90),
+            ("stage", "Stage", 90),
+            ("status", "Status", 90),
+            ("time", "Time", 80),
+        ]:
+            self.queue_tree.heading(column, text=heading)
+            self.queue_tree.column(column, width=width, anchor=tk.W)
+        self.queue_tree.pack(fill=tk.BOTH, expand=True)
+
+        controls = tk.Frame(content, bg=self.bg_color)
+        controls.pack(fill=tk.X, pady=(15, 0))
+
+        for text, command in [
+            ("Add Project...", self._queue_add),
+            ("Remove", self._queue_remove),
+            ("Retry", self._queue_retry),
+            ("Cancel", self._queue_cancel),
+            ("Open Log", self._queue_open_log),
+        ]:
+            button = tk.Button(
+                controls,
+                text=text,
+                command=command,
+                bg=self.light_gray,
+                fg=self.fg_color,
+                font=("Segoe UI", 9),
+                relief=tk.FLAT,
+                padx=12,
+                pady=5,
+                cursor="hand2",
+                borderwidth=0
+            )
+            button.pack(side=tk.LEFT, padx=(0, 8))
+            self._bind_hover_effect(button, self.light_gray, self.accent_color)
+
+        self.queue_start_btn = tk.Button(
+            controls,
+            text="Pause" if self.build_queue.running else "▶ Start",
+            command=self._queue_toggle,
+            bg=self.orange_color,
+            fg="#000000",
+            font=("Segoe UI", 9, "bold"),
+            relief=tk.FLAT,
+            padx=15,
+            pady=5,
+            cursor="hand2",
+            borderwidth=0
+        )
+        self.queue_start_btn.pack(side=tk.RIGHT)
+        self._bind_hover_effect(self.queue_start_btn, self.orange_color, self.orange_hover)
+
+        self.queue_workers = tk.StringVar(value=str(self.build_queue.workers))
+        self.queue_ram = tk.StringVar(value=str(self.build_queue.ram_per_job_gb))
+        for label, variable, low, high, increment in [
+            ("RAM/job (GB)", self.queue_ram, 0, 64, 0.5),
+            ("Workers", self.queue_workers, 1, 16, 1),
+        ]:
+            spinbox = tk.Spinbox(
+                controls,
+                from_=low,
+                to=high,
+                increment=increment,
+                textvariable=variable,
+                width=5,
+                command=self._queue_configure,
+                bg=self.light_gray,
+                fg=self.fg_color,
+                buttonbackground=self.dark_gray,
+                relief=tk.FLAT
+            )
+            spinbox.pack(side=tk.RIGHT, padx=(4, 15))
+            spinbox.bind("<FocusOut>", lambda e: self._queue_configure())
+            tk.Label(controls, text=label, font=("Segoe UI", 9), bg=self.bg_color, fg="#888888").pack(side=tk.RIGHT)
+
+        self._queue_dirty = True
+        self._refresh_queue_window()
+
+    def _queue_changed(self):
+        """Called by the build queue from any thread; the window polls this flag"""
+        self._queue_dirty = True
+
+    def _refresh_queue_window(self):
+        """Redraw the queue table when something changed, while the window is open"""
+        if self.queue_window is None or not self.queue_window.winfo_exists():
+            return
+
+        if self._queue_dirty:
+            self._queue_dirty = False
+            selected = self.queue_tree.selection()
+            self.queue_tree.delete(*self.queue_tree.get_children())
+            for job in self.build_queue.snapshot():
+                elapsed = ""
+                if job["started"]:
+                    seconds = int((job["finished"] or time.time()) - job["started"])
+                    elapsed = f"{seconds // 60}m {seconds % 60:02d}s"
+                build = job["build_type"] + (" ⚡" if job["fast"] else "")
+                if job.get("output", "apk") != "apk":
+                    build += f" ({job['output']})"
+                self.queue_tree.insert(
+                    "", tk.END, iid=job["id"],
+                    values=(job["project"], build, job["stage"], job["state"], elapsed)
+                )
+            self.queue_tree.selection_set([iid for iid in selected if self.queue_tree.exists(iid)])
+            self.queue_start_btn.config(text="Pause" if self.build_queue.running else "▶ Start")
+
+        # Running jobs need their clock ticking even without state changes
+        if any(job["state"] == "running" for job in self.build_queue.snapshot()):
+            self._queue_dirty = True
+        self.queue_window.after(1000, self._refresh_queue_window)
+
+    def _queue_selected(self):
+        return list(self.queue_tree.selection())
+
+    def _queue_add(self):
+        """Queue an Expo project with the current build settings"""
+        folder = filedialog.askdirectory(title="Select Expo Project Folder", parent=self.queue_window)
+        if not folder:
+            return
+        if not (Path(folder) / "package.json").exists():
+            messagebox.showerror("Error", "package.json not found in the selected folder.", parent=self.queue_window)
+            return
+        self.build_queue.add(folder, self.build_type.get(), fast=self.fast_build.get(),
+                             output=self.output_format.get(), abi=self.target_abi.get(),
+                             cache_node=self.use_cache_node.get())
+        self.log_message(f"[INFO] Queued {self.build_type.get()} build for {folder}\n")
+
+    def _queue_remove(self):
+        for job_id in self._queue_selected():
+            self.build_queue.remove(job_id)
+
+    def _queue_retry(self):
+        for job_id in self._queue_selected():
+            self.build_queue.retry(job_id)
+
+    def _queue_cancel(self):
+        for job_id in self._queue_selected():
+            self.build_queue.cancel(job_id)
+
+    def _queue_open_log(self):
+        """Open the log file of the selected job"""
+        jobs = {job["id"]: job for job in self.build_queue.snapshot()}
+        for job_id in self._queue_selected():
+            log_file = jobs.get(job_id, {}).get("log_file")
+            if not log_file:
+                continue
+            # Finished job logs are compressed by the log archive
+            for candidate in (log_file, log_file + ".zst", log_file + ".gz"):
+                if os.path.exists(candidate):
+                    self._open_path(candidate)
+                    break
+
+    def _queue_toggle(self):
+        if self.build_queue.running:
+            self.build_queue.pause()
+            self.log_message("[INFO] Build queue paused; running jobs will finish.\n")
+        else:
+            self._queue_configure()
+            self.build_queue.start()
+            self.log_message("[INFO] Build queue started.\n")
+
+    def _queue_configure(self):
+        """Apply the worker count and RAM budget from the spinboxes"""
+        try:
+            self.build_queue.configure(workers=int(self.queue_workers.get()), ram_per_job_gb=float(self.queue_ram.get()))
+        except ValueError:
+            pass
+
+    def show_log_search(self):
+        """Show the full-text search over all archived and live logs"""
+        if self.search_window is not None and self.search_window.winfo_exists():
+            self.search_window.deiconify()
+            self.search_window.lift()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("ExpoMate - Search Logs")
+        window.geometry("900x500")
+        window.configure(bg=self.bg_color)
+        window.transient(self.root)
+        self.search_window = window
+
+        content = tk.Frame(window, bg=self.bg_color)
+        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        search_bar = tk.Frame(content, bg=self.bg_color)
+        search_bar.pack(fill=tk.X, pady=(0, 10))
+
+        tk.Label(
+            search_bar,
+            text="🔍 Search Logs",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.bg_color,
+            fg=self.orange_color
+        ).pack(side=tk.LEFT, padx=(0, 15))
+
+        self.search_query = tk.StringVar()
+        entry = tk.Entry(
+            search_bar,
+            textvariable=self.search_query,
+            font=("Consolas", 10),
+            bg=self.light_gray,
+            fg=self.fg_color,
+            insertbackground=self.orange_color,
+            relief=tk.FLAT
+        )
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=4)
+        entry.bind("<Return>", lambda e: self._run_log_search())
+        entry.focus_set()
+
+        self.search_status = tk.Label(search_bar, text="", font=("Segoe UI", 9), bg=self.bg_color, fg="#888888")
+        self.search_status.pack(side=tk.LEFT, padx=(15, 0))
+
+        style = ttk.Style()
+        style.configure(
+            "Search.Treeview",
+            background=self.light_gray,
+            fieldbackground=self.light_gray,
+            foreground="#e0e0e0",
+            borderwidth=0,
+            rowheight=22
+        )
+        style.configure("Search.Treeview.Heading", background=self.dark_gray, foreground=self.orange_color)
+        style.map("Search.Treeview", background=[("selected", self.accent_color)])
+
+        columns = ("session", "project", "line", "text")
+        self.search_tree = ttk.Treeview(content, columns=columns, show="headings", style="Search.Treeview")
+        for column, heading, width in [
+            ("session", "Log", 190),
+            ("project", "Project / Job", 150),
+            ("line", "Line", 60),
+            ("text", "Text", 480),
+        ]:
+            self.search_tree.heading(column, text=heading)
+            self.search_tree.column(column, width=width, anchor=tk.W)
+        self.search_tree.pack(fill=tk.BOTH, expand=True)
+        self.search_tree.bind("<Double-1>", lambda e: self._open_search_result())
+        self.search_paths = {}
+
+    def show_stats(self):
+        """Show build duration trends, percentiles and regressions per project and variant"""
+        if self.stats_window is not None and self.stats_window.winfo_exists():
+            self.stats_window.deiconify()
+            self.stats_window.lift()
+            self._refresh_stats()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("ExpoMate - Build Stats")
+        window.geometry("980x420")
+        window.configure(bg=self.bg_color)
+        window.transient(self.root)
+        self.stats_window = window
+
+        content = tk.Frame(window, bg=self.bg_color)
+        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        header = tk.Frame(content, bg=self.bg_color)
+        header.pack(fill=tk.X, pady=(0, 10))
+
+        tk.Label(
+            header,
+            text="📈 Build Stats",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.bg_color,
+            fg=self.orange_color
+        ).pack(side=tk.LEFT)
+
+        refresh_btn = tk.Button(
+            header,
+            text="Refresh",
+            command=self._refresh_stats,
+            bg=self.light_gray,
+            fg=self.fg_color,
+            font=("Segoe UI", 9),
+            relief=tk.FLAT,
+            padx=12,
+            pady=3,
+            cursor="hand2",
+            borderwidth=0
+        )
+        refresh_btn.pack(side=tk.RIGHT)
+        self._bind_hover_effect(refresh_btn, self.light_gray, self.accent_color)
+
+        self.stats_status = tk.Label(header, text="", font=("Segoe UI", 9), bg=self.bg_color, fg="#888888")
+        self.stats_status.pack(side=tk.RIGHT, padx=(0, 15))
+
+        style = ttk.Style()
+        style.configure(
+            "Stats.Treeview",
+            background=self.light_gray,
+            fieldbackground=self.light_gray,
+            foreground="#e0e0e0",
+            borderwidth=0,
+            rowheight=22
+        )
+        style.configure("Stats.Treeview.Heading", background=self.dark_gray, foreground=self.orange_color)
+        style.map("Stats.Treeview", background=[("selected", self.accent_color)])
+
+        columns = ("project", "variant", "stage", "profile", "runs", "p50", "p90", "last", "memory", "cpu", "change")
+        self.stats_tree = ttk.Treeview(content, columns=columns, show="headings", style="Stats.Treeview")
+        for column, heading, width in [
+            ("project", "Project", 180),
+            ("variant", "Variant", 90),
+            ("stage", "Stage", 80),
+            ("profile", "Profile", 70),
+            ("runs", "Runs", 50),
+            ("p50", "p50", 80),
+            ("p90", "p90", 80),
+            ("last", "Last", 80),
+            ("memory", "Peak Memory", 100),
+            ("cpu", "CPU", 80),
+            ("change", "Trend", 110),
+        ]:
+            self.stats_tree.heading(column, text=heading)
+            self.stats_tree.column(column, width=width, anchor=tk.W)
+        self.stats_tree.tag_configure("regression", foreground="#ff6b6b")
+        self.stats_tree.pack(fill=tk.BOTH, expand=True)
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        """Fill the stats table from the metrics store"""
+        from expomate.telemetry import MetricsStore, format_duration, format_size
+        try:
+            store = MetricsStore()
+            try:
+                rows = store.summary()
+            finally:
+                store.close()
+        except Exception as e:
+            self.stats_status.config(text=f"Could not read build metrics: {str(e)}")
+            return
+
+        self.stats_tree.delete(*self.stats_tree.get_children())
+        for row in rows:
+            trend = ""
+            if row["change"] is not None:
+                trend = f"{row['change']:+.0%}" + (" ⚠ slower" if row["regression"] else "")
+            self.stats_tree.insert(
+                "", tk.END,
+                values=(
+                    Path(row["project"]).name,
+                    row["variant"] or "-",
+                    row["stage"],
+                    row["profile"] or "-",
+                    row["runs"],
+                    format_duration(row["p50"]),
+                    format_duration(row["p90"]),
+                    format_duration(row["last"]),
+                    format_size(row["peak_rss"]) if row["peak_rss"] else "",
+                    format_duration(row["cpu_seconds"]) if row["cpu_seconds"] is not None else "",
+                    trend,
+                ),
+                tags=("regression",) if row["regression"] else ()
+            )
+        regressions = sum(row["regression"] for row in rows)
+        self.stats_status.config(
+            text=f"{regressions} regression{'s' if regressions != 1 else ''}" if regressions else ""
+        )
+
+    def _run_log_search(self):
+        """Query the log index and fill the results table"""
+        start = time.perf_counter()
+        try:
+            results = self.log_archive.search(self.search_query.get())
+        except Exception as e:
+            self.search_status.config(text=f"Search failed: {str(e)}")
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.search_tree.delete(*self.search_tree.get_children())
+        self.search_paths = {}
+        for number, result in enumerate(results):
+            project = Path(result["project"]).name if result["project"] else ""
+            if result["job"]:
+                project = f"{project} (job {result['job']})".strip()
+            iid = str(number)
+            self.search_paths[iid] = result["path"]
+            self.search_tree.insert(
+                "", tk.END, iid=iid,
+                values=(result["session"], project, result["line"], result["text"])
+            )
+        self.search_status.config(text=f"{len(results)} results in {elapsed_ms:.0f} ms")
+
+    def _open_search_result(self):
+        """Open the log file holding the selected result"""
+        for iid in self.search_tree.selection():
+            path = self.search_paths.get(iid)
+            if path and os.path.exists(path):
+                self._open_path(path)
+
+    def _open_path(self, path):
+        """Open a file or folder with the system default application"""
+        import platform
+        import subprocess
+        if os.name == 'nt':  # Windows
+            os.startfile(path)
+        elif platform.system() == 'Darwin':  # macOS
+            subprocess.Popen(['open', path])
+        else:  # Linux
+            subprocess.Popen(['xdg-open', path])
+
+    def browse_folder(self):
+        """Browse and select Expo project folder"""
+        folder = filedialog.askdirectory(title="Select Expo Project Folder")
+        if folder:
+            self.expo_folder.set(folder)
+            self.log_message(f"Selected folder: {folder}\n")
+            self.check_dependencies()
+
+    def check_dependencies(self, force_probe=False):
+        """Check for required dependencies in the selected folder"""
+        import json
+        folder = self.expo_folder.get()
+        if not folder:
+            return
+
+        self.log_message("Checking dependencies...\n")
+
+        # Check for package.json
+        package_json = Path(folder) / "package.json"
+        if not package_json.exists():
+            self.log_message("[ERROR] package.json not found. Not a valid Node.js project.\n")
+            messagebox.showerror("Error", "package.json not found in the selected folder.")
+            return
+
+        # Check package.json for expo
+        try:
+            with open(package_json, 'r', encoding='utf-8') as f:
+                package_data = json.load(f)
+                dependencies = package_data.get('dependencies', {})
+                dev_dependencies = package_data.get('devDependencies', {})
+
+                has_expo = 'expo' in dependencies or 'expo' in dev_dependencies
+
+                if has_expo:
+                    self.log_message("[OK] Expo found in package.json\n")
+                else:
+                    self.log_message("[WARNING] Expo not found in package.json dependencies\n")
+
+        except Exception as e:
+            self.log_message(f"[ERROR] Failed to read package.json: {str(e)}\n")
+            return
+
+        # Check for node_modules
+        node_modules = Path(folder) / "node_modules"
+        if not node_modules.exists():
+            self.log_message("[INFO] node_modules not found. It will be installed before prebuild.\n")
+        else:
+            self.log_message("[OK] node_modules directory found\n")
+
+        # Check if Node.js/npm/npx is available (probed off the UI thread)
+        thread = threading.Thread(
+            target=self._probe_toolchain_async, args=(force_probe, self.expo_folder.get()), daemon=True
+        )
+        thread.start()
+
+    def _probe_toolchain_async(self, force, project=None):
+        """Run the (cached) Node.js/npm/npx probe and the prebuild check for project in the background
+
+        Fingerprinting hashes the app config, assets and package files, which
+        must stay off the UI thread just like the probe.
+        """
+        from expomate.toolchain import probe_toolchain
+        probe = probe_toolchain(force=force)
+        prebuild_current = None
+        if project:
+            try:
+                from expomate.fingerprint import is_prebuild_current
+                prebuild_current = is_prebuild_current(project)
+            except Exception as e:
+                prebuild_current = e
+        self.root.after(0, self._toolchain_checked, probe, prebuild_current)
+
+    def _toolchain_checked(self, probe, prebuild_current=None):
+        """Finish the dependency check once the toolchain probe is back"""
+        if not self.check_nodejs(probe):
+            return
+
+        self.log_message("[SUCCESS] All basic checks passed!\n")
+        self.prebuild_btn.config(state=tk.NORMAL, bg=self.orange_color)
+        self.clean_btn.config(state=tk.NORMAL, bg=self.light_gray)
+
+        # An android folder generated from the current inputs needs no new prebuild
+        self.is_prebuild_done = False
+        self.compile_btn.config(state=tk.DISABLED, bg=self.light_gray)
+        if isinstance(prebuild_current, Exception):
+            self.log_message(f"[WARNING] Could not fingerprint prebuild inputs: {str(prebuild_current)}\n")
+        elif prebuild_current:
+            self.is_prebuild_done = True
+            self.compile_btn.config(state=tk.NORMAL, bg=self.orange_color)
+            self.log_message("[OK] Android project is up to date with app config, ready to compile\n")
+
+    def recheck_toolchain(self):
+        """Drop the cached toolchain probe and check everything again"""
+        from expomate.toolchain import invalidate_toolchain_cache
+        invalidate_toolchain_cache()
+        self.log_message("Re-checking Node.js/npm/npx...\n")
+        if self.expo_folder.get():
+            self.check_dependencies(force_probe=True)
+        else:
+            thread = threading.Thread(target=self._probe_toolchain_async, args=(True,), daemon=True)
+            thread.start()
+
+    def check_nodejs(self, probe):
+        """Check if Node.js and npx are installed, offer to help install if missing"""
+        if probe["cached"]:
+            self.log_message("[INFO] Using cached Node.js/npm/npx probe (Re-check to refresh)\n")
+
+        nodejs_found = probe["node"] is not None
+        npm_found = probe["npm"] is not None
+        npx_found = probe["npx"] is not None
+
+        if nodejs_found:
+            self.log_message(f"[OK] Node.js is available (version: {probe['node']})\n")
+        if npm_found:
+            self.log_message(f"[OK] npm is available (version: {probe['npm']})\n")
+        if npx_found:
+            self.log_message(f"[OK] npx is available (version: {probe['npx']})\n")
+
+        # If all found, return success
+        if nodejs_found and npm_found and npx_found:
+            return True
+
+        # If not found, offer help
+        missing = []
+        if not nodejs_found:
+            missing.append("Node.js")
+        if not npm_found:
+            missing.append("npm")
+        if not npx_found:
+            missing.append("npx")
+
+        self.log_message(f"[ERROR] Missing required tools: {', '.join(missing)}\n")
+
+        # Show dialog with installation options
+        response = messagebox.askyesno(
+            "Node.js Not Found",
+            f"Node.js/npm/npx is required but not found.\n\n"
+            f"Missing: {', '.join(missing)}\n\n"
+            f"Would you like to open the Node.js download page?\n\n"
+            f"After installation, please restart this application.",
+            icon='warning'
+        )
+
+        if response:
+            self.log_message("[INFO] Opening Node.js download page...\n")
+            nodejs_url = "https://nodejs.org/en/download/"
+            try:
+                _open_url(nodejs_url)
+                self.log_message(f"[INFO] Opened: {nodejs_url}\n")
+                self.log_message("[INFO] Please download and install Node.js, then restart this application.\n")
+            except Exception as e:
+                self.log_message(f"[ERROR] Failed to open browser: {str(e)}\n")
+                self.log_message(f"[INFO] Please manually visit: {nodejs_url}\n")
+        else:
+            self.log_message("[INFO] User declined to download Node.js.\n")
+            self.log_message("[INFO] You can manually install Node.js from: https://nodejs.org/\n")
+
+        return False
+
+    def log_message(self, message):
+        """Queue message for the log box and log file (safe from any thread)"""
+        self.log_pipeline.put(message)
+
+    def _poll(self):
+        """The one UI timer: move queued log lines into the UI and apply job state changes"""
+        # Rearm first, so logs keep flowing while a job's message box is open
+        self.root.after(self.poll_interval, self._poll)
+        self.log_pipeline.drain()
+        if self._log_archive and self.log_pipeline.bytes_written >= self._log_archive.max_log_bytes:
+            self._rotate_log()
+
+        changed = self._scheduler.poll() if self._scheduler else []
+        if changed:
+            from expomate.scheduler import FINISHED
+            for job, state in changed:
+                if state in FINISHED and job.on_done:
+                    job.on_done(job)
+            self._update_job_status()
+        if self._cache_node is None and self.use_cache_node.get():
+            # Started by the first build that uses it, on a worker thread: the
+            # store is sized by walking it, which must not freeze the window
+            from expomate.cachenode import running_node
+            self._cache_node = running_node()
+        if self._cache_node:
+            self._update_cache_node_status()
+
+    @property
+    def scheduler(self):
+        """The job scheduler, started with the first job"""
+        if self._scheduler is None:
+            from expomate.scheduler import JobScheduler
+            self._scheduler = JobScheduler(max_concurrent=2)
+        return self._scheduler
+
+    def _update_job_status(self):
+        """Show what the scheduler is doing next to the progress bar (from the last poll's snapshot)"""
+        from expomate.scheduler import RUNNING
+        jobs = self.scheduler.snapshot
+        running = [name for name, state in jobs if state == RUNNING]
+        queued = len(jobs) - len(running)
+
+        if running:
+            self.progress.start(10)
+            status = "Running: " + ", ".join(running)
+            if queued:
+                status += f"  ({queued} queued)"
+        else:
+            self.progress.stop()
+            status = ""
+        self.job_status_label.config(text=status)
+        self.cancel_btn.config(state=tk.NORMAL if jobs else tk.DISABLED)
+
+    def _update_cache_node_status(self):
+        """Show the build cache node's hit rate under the progress bar"""
+        from expomate.cachenode import hit_rate
+        from expomate.telemetry import format_size
+        hits, misses, stores, size = self._cache_node.store.stats()
+        rate = hit_rate(hits, misses)
+        status = (f"Build cache node {self._cache_node.url}: {hits} hit, {misses} miss"
+                  f"{f' ({rate:.0%} hit rate)' if rate is not None else ''}, {stores} stored, "
+                  f"{format_size(size)} cached")
+        if self.cache_node_label.cget("text") != status:
+            self.cache_node_label.config(text=status)
+
+    def _submit(self, name, func, engine, on_done):
+        """Schedule a build step for the selected project"""
+        from expomate.scheduler import PRIORITY_HIGH
+        self.scheduler.submit(
+            name, func, priority=PRIORITY_HIGH, key=str(engine.project_dir),
+            cancel=engine.cancel, on_done=on_done
+        )
+
+    def cancel_jobs(self):
+        """Cancel the running build step and anything queued behind it"""
+        self.log_message("\n[INFO] Cancelling...\n")
+        if self._scheduler:
+            self._scheduler.cancel_all()
+
+    def _job_cancelled(self, job):
+        """Re-enable the buttons after a cancelled step"""
+        self.log_message(f"[INFO] {job.name} cancelled.\n")
+        self.prebuild_btn.config(state=tk.NORMAL)
+        self.clean_btn.config(state=tk.NORMAL if self.is_prebuild_done else tk.DISABLED)
+        self.compile_btn.config(state=tk.NORMAL if self.is_prebuild_done else tk.DISABLED)
+
+    def on_close(self):
+        """Stop running builds and flush pending logs before closing the window"""
+        if self._scheduler:
+            self._scheduler.shutdown()
+        if self._build_queue:
+            # Their Gradle processes run in sessions of their own and would outlive us
+            self._build_queue.stop()
+        if self._cache_node:
+            self._cache_node.stop()
+        self.log_pipeline.close()
+        if self._log_archive:
+            self._log_archive.close_session(self.log_session)
+            self._log_archive.close()
+        self.root.destroy()
+
+    def run_prebuild(self):
+        """Schedule npx expo prebuild"""
+        self.prebuild_btn.config(state=tk.DISABLED)
+        self.compile_btn.config(state=tk.DISABLED)
+
+        self.log_message("Starting Expo prebuild...\n")
+
+        engine = self._engine()
+        force = self.force_prebuild.get()
+
+        def install_and_prebuild():
+            # Prebuild loads config plugins from node_modules, so install first
+            returncode = engine.install()
+            if returncode != 0:
+                return returncode
+            return engine.prebuild(force=force)
+
+        self._submit("Prebuild", install_and_prebuild, engine, self._prebuild_done)
+
+    def _engine(self):
+        """Build engine for the selected project, logging into this window"""
+        from expomate.engine import BuildEngine
+        return BuildEngine(self.expo_folder.get(), log=self.log_message, mirror=self.terminal_mirror.get())
+
+    def _prebuild_done(self, job):
+        """Dispatch a finished prebuild job"""
+        from expomate.scheduler import CANCELLED, SUCCEEDED
+        if job.state == SUCCEEDED:
+            self._prebuild_success()
+        elif job.state == CANCELLED:
+            self._job_cancelled(job)
+        else:
+            self._prebuild_failed()
+
+    def _prebuild_success(self):
+        """Handle successful prebuild"""
+        self.is_prebuild_done = True
+        self.log_message("\n[SUCCESS] Prebuild completed successfully!\n")
+        self.log_message("You can now compile the project.\n")
+
+        # Show success popup
+        messagebox.showinfo("Success", "Successfully Prebuild, You can now compile it")
+
+        # Enable compile button
+        self.compile_btn.config(state=tk.NORMAL, bg=self.orange_color)
+        self.prebuild_btn.config(state=tk.NORMAL)
+
+    def _prebuild_failed(self):
+        """Handle failed prebuild"""
+        self.log_message("\n[ERROR] Prebuild failed. Check the log for details.\n")
+        messagebox.showerror("Error", "Prebuild failed. Check the log for details.")
+        self.prebuild_btn.config(state=tk.NORMAL)
+
+    def run_clean(self):
+        """Run Gradle clean task"""
+        if not self.is_prebuild_done:
+            messagebox.showwarning("Warning", "Please run prebuild first!")
+            return
+
+        self.clean_btn.config(state=tk.DISABLED)
+        self.compile_btn.config(state=tk.DISABLED)
+        self.prebuild_btn.config(state=tk.DISABLED)
+
+        self.log_message("\nRunning Gradle clean...\n")
+
+        engine = self._engine()
+        incremental = self.incremental_clean.get()
+        self._submit("Clean", lambda: engine.clean(incremental=incremental), engine, self._clean_complete)
+
+    def _clean_complete(self, job):
+        """Re-enable buttons after clean"""
+        from expomate.scheduler import CANCELLED
+        if job.state == CANCELLED:
+            self._job_cancelled(job)
+            return
+        self.clean_btn.config(state=tk.NORMAL)
+        self.compile_btn.config(state=tk.NORMAL)
+        self.prebuild_btn.config(state=tk.NORMAL)
+
+    def run_compile(self):
+        """Run Android compilation"""
+        if not self.is_prebuild_done:
+            messagebox.showwarning("Warning", "Please run prebuild first!")
+            return
+
+        self.compile_btn.config(state=tk.DISABLED)
+        self.prebuild_btn.config(state=tk.DISABLED)
+        self.clean_btn.config(state=tk.DISABLED)
+
+        build_type = self.build_type.get()
+        self.log_message(f"\nStarting Android compilation ({build_type} build)...\n")
+
+        engine = self._engine()
+        fast = self.fast_build.get()
+        output = self.output_format.get()
+        abi = self.target_abi.get()
+        cache_node = self.use_cache_node.get()
+        from expomate.gradlelog import profile_path_for
+        profile_path = profile_path_for(self.current_log_file, datetime.now().strftime("%H%M%S"))
+
+        def compile_done(job):
+            from expomate.scheduler import CANCELLED, SUCCEEDED
+            if job.state == SUCCEEDED:
+                self._compile_success(str(engine.output_dir(build_type, output)), engine.outputs)
+            elif job.state == CANCELLED:
+                self._job_cancelled(job)
+            else:
+                self._compile_failed()
+
+        self._submit(
+            f"Compile ({build_type})",
+            lambda: engine.compile(build_type, fast=fast, profile_path=profile_path, output=output,
+                                   abi=abi, cache_node=cache_node),
+            engine, compile_done
+        )
+
+    def _compile_success(self, output_path, artifacts):
+        """Handle successful compilation"""
+        from expomate.telemetry import format_size
+        self.log_message(f"\n[SUCCESS] Compilation completed successfully!\n")
+        self.log_message(f"Output location: {output_path}\n")
+        for artifact in artifacts:
+            try:
+                size = format_size(artifact.stat().st_size)
+            except OSError:
+                size = "missing"
+            self.log_message(f"  {os.path.relpath(artifact, output_path)}  ({size})\n")
+
+        # Show success message
+        messagebox.showinfo("Success", f"Compilation completed successfully!\n\nOpening output folder...")
+
+        # Open output folder
+        if os.path.exists(output_path):
+            try:
+                self._open_path(output_path)
+                self.log_message("Opened output folder.\n")
+            except Exception as e:
+                self.log_message(f"[ERROR] Failed to open output folder: {str(e)}\n")
+        else:
+            self.log_message(f"[WARNING] Output folder not found: {output_path}\n")
+
+        # Re-enable buttons
+        self.compile_btn.config(state=tk.NORMAL)
+        self.prebuild_btn.config(state=tk.NORMAL)
+        self.clean_btn.config(state=tk.NORMAL)
+
+    def _compile_failed(self):
+        """Handle failed compilation"""
+        self.log_message("\n[ERROR] Compilation failed. Check the log for details.\n")
+        messagebox.showerror("Error", "Compilation failed. Check the log for details.")
+        self.compile_btn.config(state=tk.NORMAL)
+        self.prebuild_btn.config(state=tk.NORMAL)
+        self.clean_btn.config(state=tk.NORMAL)
@@ -0,0 +1,222 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import stat
+import time
+
+
+# Files at least this big are hashed through mmap instead of read() calls
+MMAP_THRESHOLD = 1024 * 1024
+
+# Below this many files to (re)hash, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 2000
+
+
+def hash_file(path):
+    """blake2b digest of a file's contents (or of a symlink's target)"""
+    st = os.lstat(path)
+    if stat.S_ISLNK(st.st_mode):
+        return hashlib.blake2b(b"link:" + os.fsencode(os.readlink(path)), digest_size=20).hexdigest()
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        if st.st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        elif st.st_size:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _hash_batch(paths):
+    """Worker entry point: digests for a batch of paths (None if unreadable)"""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, hash_file(path)))
+        except (OSError, ValueError):
+            results.append((path, None))
+    return results
+
+
+def scan_tree(root, exclude_dirs=()):
+    """Yield (path, size, mtime_ns, inode) for every file below root
+
+    Uses os.scandir so the stat data comes from the directory listing where
+    the OS provides it; symlinked folders are not followed.
+    """
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in exclude_dirs:
+                                stack.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    yield entry.path, st.st_size, st.st_mtime_ns, st.st_ino
+        except OSError:
+            continue
+
+
+class HashIndex:
+    """Persistent (path, size, mtime_ns, inode) -> digest index in SQLite"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, digest TEXT)"
+        )
+
+    def under(self, root):
+        """All indexed entries below root, as {path: (size, mtime_ns, inode, digest)}"""
+        prefix = os.path.join(str(root), "")
+        # Range scan on the primary key: every path starting with prefix
+        rows = self.conn.execute(
+            "SELECT path, size, mtime_ns, inode, digest FROM files WHERE path >= ? AND path < ?",
+            (prefix, prefix + "\uffff")
+        )
+        return {row[0]: row[1:] for row in rows}
+
+    def get_many(self, paths):
+        """Indexed entries for the given paths"""
+        found = {}
+        paths = list(paths)
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT path, size, mtime_ns, inode, digest FROM files WHERE path IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            found.update((row[0], row[1:]) for row in rows)
+        return found
+
+    def update(self, entries, removed=()):
+        """Store (path, size, mtime_ns, inode, digest) rows and drop removed paths"""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", entries)
+            self.conn.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in removed))
+
+    def close(self):
+        self.conn.close()
+
+
+class TreeHash:
+    """Result of hashing a tree: per-file digests plus what changed"""
+
+    def __init__(self, root, files, changed, removed):
+        self.root = root
+        self.files = files        # relative posix path -> digest
+        self.changed = changed    # relative paths rehashed this time
+        self.removed = removed    # relative paths gone since the last run
+
+    @property
+    def digest(self):
+        """One digest for the whole tree"""
+        digest = hashlib.blake2b(digest_size=20)
+        for path in sorted(self.files):
+            digest.update(f"{path}\0{self.files[path]}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+
+class TreeHasher:
+    """Incremental, parallel content hashing backed by a HashIndex
+
+    Only files whose size, mtime or inode changed since they were last
+    indexed are read again; large rehash sets are spread over a process pool.
+    """
+
+    def __init__(self, index_path, workers=None, batch_size=256):
+        self.index = HashIndex(index_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def hash_tree(self, root, exclude_dirs=()):
+        """Hash every file below root"""
+        root = os.path.abspath(str(root))
+        known = self.index.under(root)
+        stats = {}
+        for path, size, mtime_ns, inode in scan_tree(root, exclude_dirs):
+            stats[path] = (size, mtime_ns, inode)
+
+        digests, changed = self._resolve(stats, known)
+        removed = [path for path in known if path not in stats]
+        self.index.update(changed, removed)
+
+        prefix_len = len(os.path.join(root, ""))
+
+        def rel(path):
+            return path[prefix_len:].replace(os.sep, "/")
+
+        return TreeHash(
+            root,
+            {rel(path): digest for path, digest in digests.items()},
+            [rel(entry[0]) for entry in changed],
+            [rel(path) for path in removed]
+        )
+
+    def hash_files(self, paths):
+        """Digests for an explicit list of files, as {path: digest}"""
+        stats = {}
+        for path in paths:
+            path = os.path.abspath(str(path))
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+
+        digests, changed = self._resolve(stats, self.index.get_many(stats))
+        self.index.update(changed)
+        return digests
+
+    def _resolve(self, stats, known):
+        """Reuse indexed digests for unchanged files and hash the rest"""
+        digests = {}
+        stale = []
+        for path, key in stats.items():
+            entry = known.get(path)
+            if entry is not None and tuple(entry[:3]) == key and entry[3]:
+                digests[path] = entry[3]
+            else:
+                stale.append(path)
+
+        # A file written in the same instant we hash it could change again without
+        # its mtime moving; index those with an impossible mtime so they are rehashed
+        racy_after = time.time_ns() - 2 * 10**9
+
+        changed = []
+        for path, digest in self._hash_all(stale):
+            if digest is None:
+                continue
+            digests[path] = digest
+            size, mtime_ns, inode = stats[path]
+            changed.append((path, size, mtime_ns if mtime_ns < racy_after else -1, inode, digest))
+        return digests, changed
+
+    def _hash_all(self, paths):
+        """Hash paths, in a process pool when there are enough of them"""
+        if len(paths) < PARALLEL_THRESHOLD or self.workers < 2:
+            return _hash_batch(paths)
+
+        batches = [paths[i:i + self.batch_size] for i in range(0, len(paths), self.batch_size)]
+        results = []
+        # multiprocessing is slow to import and most calls never need it
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for batch in pool.map(_hash_batch, batches):
+                results.extend(batch)
+        return results
+
+    def close(self):
+        self.index.close()
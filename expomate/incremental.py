@@ -0,0 +1,156 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json, save_json
+from expomate.fingerprint import HASH_INDEX, LOCKFILES
+from expomate.hashing import TreeHasher, scan_tree
+
+
+MODULES_FILE = ".expomate-modules.json"
+
+# Per-module build outputs: Gradle's build/ and the CMake / ndk-build cache
+OUTPUT_DIRS = ("build", ".cxx")
+
+# Left out of a module's input hash (outputs and IDE state)
+SKIP_DIRS = {"build", ".cxx", ".gradle", ".idea"}
+
+# Files of android/ every module is configured from; a change there makes all modules stale
+SHARED_INPUTS = (
+    "build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts",
+    "gradle.properties", "gradle/wrapper/gradle-wrapper.properties",
+)
+
+
+def _gradle_name(package):
+    """Gradle project name of an autolinked package (@scope/name -> scope_name)"""
+    if package.startswith("@"):
+        package = package[1:]
+    return package.replace("/", "_")
+
+
+def _packages(node_modules):
+    """Top-level and scoped package folders in node_modules"""
+    try:
+        entries = sorted(node_modules.iterdir())
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith("@") and entry.is_dir():
+            for scoped in sorted(entry.iterdir()):
+                yield f"{entry.name}/{scoped.name}", scoped
+        elif not entry.name.startswith("."):
+            yield entry.name, entry
+
+
+def native_modules(project_dir):
+    """Gradle project path -> module folder for :app and every package with Android code"""
+    project_dir = Path(project_dir).resolve()
+    modules = {":app": project_dir / "android" / "app"}
+    for package, folder in _packages(project_dir / "node_modules"):
+        android = folder / "android"
+        if (android / "build.gradle").is_file() or (android / "build.gradle.kts").is_file():
+            modules[f":{_gradle_name(package)}"] = android
+    return modules
+
+
+def _read(path):
+    try:
+        return path.read_bytes()
+    except OSError:
+        return b""
+
+
+def module_keys(project_dir):
+    """Gradle project path -> digest of everything the module is built from
+
+    Every key covers the shared android/ build settings. A package's key adds
+    its Android sources (so a version bump or a patch shows up); :app adds
+    its own sources and the lockfile, since React Native builds the C++ of
+    autolinked libraries in app's .cxx.
+    """
+    project_dir = Path(project_dir).resolve()
+    shared = hashlib.blake2b(digest_size=20)
+    for name in SHARED_INPUTS:
+        shared.update(name.encode("utf-8") + b"\0" + _read(project_dir / "android" / name) + b"\n")
+    lockfiles = b"".join(_read(project_dir / name) for name in LOCKFILES)
+
+    keys = {}
+    hasher = TreeHasher(cache_path(HASH_INDEX))
+    try:
+        for module, folder in native_modules(project_dir).items():
+            digest = shared.copy()
+            digest.update(hasher.hash_tree(folder, exclude_dirs=SKIP_DIRS).digest.encode("utf-8"))
+            if module == ":app":
+                digest.update(lockfiles)
+            keys[module] = digest.hexdigest()
+    finally:
+        hasher.close()
+    return keys
+
+
+def module_seconds(tasks):
+    """Gradle project path -> seconds of task time, from GradleOutputParser.tasks"""
+    seconds = {}
+    for path, _, _, elapsed in tasks:
+        module = path.rsplit(":", 1)[0]
+        if module and elapsed:
+            seconds[module] = seconds.get(module, 0) + elapsed
+    return seconds
+
+
+def modules_path(project_dir):
+    return Path(project_dir) / "android" / MODULES_FILE
+
+
+def record_modules(project_dir, tasks):
+    """Remember each module's inputs after a successful build, with its build time
+
+    The time kept is the longest seen for the current inputs: the build
+    right after the inputs changed, or after a clean, is the cold one.
+    """
+    stored = load_json(modules_path(project_dir), {}).get("modules", {})
+    seconds = module_seconds(tasks)
+    modules = {}
+    for module, key in module_keys(project_dir).items():
+        previous = stored.get(module, {})
+        measured = seconds.get(module, 0)
+        if previous.get("key") == key:
+            measured = max(measured, previous.get("seconds", 0))
+        modules[module] = {"key": key, "seconds": round(measured, 3)}
+    save_json(modules_path(project_dir), {"modules": modules})
+
+
+def plan_clean(project_dir):
+    """Modules whose inputs changed since the last successful build, or None if never recorded
+
+    Returns a dict with "stale" and "kept" module paths, the output "dirs"
+    to delete and "saved_seconds": the recorded build time of the kept
+    modules, which a full clean would rebuild as well.
+    """
+    stored = load_json(modules_path(project_dir), {}).get("modules")
+    if not stored:
+        return None
+    folders = native_modules(project_dir)
+    stale, kept, saved = [], [], 0
+    for module, key in module_keys(project_dir).items():
+        if stored.get(module, {}).get("key") == key:
+            kept.append(module)
+            saved += stored[module].get("seconds", 0)
+        else:
+            stale.append(module)
+    dirs = [folders[module] / name for module in stale for name in OUTPUT_DIRS
+            if (folders[module] / name).is_dir()]
+    return {"stale": stale, "kept": kept, "dirs": dirs, "saved_seconds": saved}
+
+
+def evict(dirs):
+    """Delete output folders, returns the bytes freed"""
+    freed = 0
+    for folder in dirs:
+        freed += sum(size for _, size, _, _ in scan_tree(folder))
+        shutil.rmtree(folder, ignore_errors=True)
+        if os.path.exists(folder):
+            raise OSError(f"could not delete {folder}")
+    return freed
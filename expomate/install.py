@@ -0,0 +1,230 @@
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import platform
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from expomate.cache import cache_path, load_json, save_json
+from expomate.hashing import hash_file
+
+
+STORE_DIR = "node_modules"
+MARKER_FILE = ".expomate-install.json"
+
+# node_modules trees kept in the cache, least recently used ones go first
+KEEP_TREES = 5
+
+# Tool caches inside node_modules that are not part of the install
+SKIP_DIRS = {".cache"}
+
+# Linux FICLONE ioctl: share the source's extents copy-on-write (btrfs, xfs)
+FICLONE = 0x40049409
+
+
+class PackageManager:
+    """The package manager a project uses, found from its lockfile"""
+
+    def __init__(self, name, lockfile, command, key_file=None):
+        self.name = name
+        self.lockfile = lockfile    # Path, or None without a lockfile
+        self.command = command      # frozen install command line
+        self.key_file = key_file or lockfile    # what the install is keyed on
+
+
+def detect_package_manager(project_dir):
+    """npm, yarn, pnpm or bun, with their frozen-lockfile install command"""
+    project_dir = Path(project_dir)
+    if (project_dir / "pnpm-lock.yaml").exists():
+        return PackageManager("pnpm", project_dir / "pnpm-lock.yaml", ["pnpm", "install", "--frozen-lockfile"])
+    if (project_dir / "yarn.lock").exists():
+        if (project_dir / ".yarnrc.yml").exists():
+            # Yarn 2+ renamed --frozen-lockfile
+            return PackageManager("yarn", project_dir / "yarn.lock", ["yarn", "install", "--immutable"])
+        return PackageManager("yarn", project_dir / "yarn.lock", ["yarn", "install", "--frozen-lockfile"])
+    for name in ("bun.lock", "bun.lockb"):
+        if (project_dir / name).exists():
+            return PackageManager("bun", project_dir / name, ["bun", "install", "--frozen-lockfile"])
+    for name in ("package-lock.json", "npm-shrinkwrap.json"):
+        if (project_dir / name).exists():
+            return PackageManager("npm", project_dir / name, ["npm", "ci"])
+    # Without a lockfile the install follows package.json alone
+    return PackageManager("npm", None, ["npm", "install"], key_file=project_dir / "package.json")
+
+
+def install_key(manager, node_version):
+    """Cache key for a node_modules tree, or None if it cannot be cached
+
+    Native modules are built for one Node version, OS and CPU, so those are
+    part of the key along with the lockfile (or package.json) contents.
+    """
+    if not manager.key_file.exists() or not node_version:
+        return None
+    digest = hashlib.blake2b(digest_size=20)
+    for part in (manager.name, hash_file(manager.key_file), node_version, sys.platform, platform.machine()):
+        digest.update(f"{part}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def installed_key(project_dir):
+    """Key of the install currently in project_dir/node_modules, if ExpoMate made it"""
+    return load_json(Path(project_dir) / "node_modules" / MARKER_FILE, {}).get("key")
+
+
+def write_marker(project_dir, key):
+    path = Path(project_dir) / "node_modules" / MARKER_FILE
+    # Trees restored by older versions hardlinked the marker into the cache; never write through it
+    try:
+        path.unlink()
+    except OSError:
+        pass
+    save_json(path, {"key": key, "installed": time.time()})
+
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    shutil.copystat(src, dst)
+
+
+def _clonefile(src, dst):
+    """macOS clonefile(2): a copy-on-write clone of a whole tree in one call"""
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+        raise OSError(ctypes.get_errno(), "clonefile failed")
+
+
+class TreeLinker:
+    """Recreate a folder tree cheaply: copy-on-write clones, else copies
+
+    Hardlinks are never used: a postinstall script, patch-package or an edit
+    in place would write through them into the cached tree of every project.
+    The first failed reflink (another filesystem, no support) drops to copies
+    for the rest of the tree.
+    """
+
+    def __init__(self):
+        self.mode = "reflink" if sys.platform.startswith("linux") else "copy"
+        self.files = 0
+
+    def _link_file(self, src, dst):
+        if self.mode == "reflink":
+            try:
+                _reflink(src, dst)
+                return
+            except OSError:
+                self.mode = "copy"
+                try:
+                    os.unlink(dst)
+                except OSError:
+                    pass
+        shutil.copy2(src, dst)
+
+    def link_tree(self, src, dst, skip=()):
+        """Recreate src at dst (which must not exist); symlinks are kept as symlinks"""
+        if platform.system() == 'Darwin' and not skip:
+            try:
+                _clonefile(src, dst)
+                self.mode = "clonefile"
+                return
+            except (OSError, AttributeError):
+                pass
+
+        stack = [(str(src), str(dst))]
+        while stack:
+            source_dir, target_dir = stack.pop()
+            os.mkdir(target_dir)
+            with os.scandir(source_dir) as entries:
+                for entry in entries:
+                    if entry.name in skip and source_dir == str(src):
+                        continue
+                    target = os.path.join(target_dir, entry.name)
+                    if entry.is_symlink():
+                        os.symlink(os.readlink(entry.path), target,
+                                   target_is_directory=entry.is_dir())
+                    elif entry.is_dir():
+                        stack.append((entry.path, target))
+                    else:
+                        self._link_file(entry.path, target)
+                        self.files += 1
+
+
+def _remove_tree(path):
+    """Delete a folder, moving it aside first so a crash never leaves half of it in place"""
+    if not os.path.lexists(path):
+        return
+    trash = f"{path}.expomate-old-{os.getpid()}"
+    os.rename(path, trash)
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+class NodeModulesCache:
+    """node_modules trees in the ExpoMate cache, addressed by install_key"""
+
+    def __init__(self):
+        self.root = cache_path(STORE_DIR)
+        self.root.mkdir(exist_ok=True)
+
+    def _entry(self, key):
+        return self.root / key
+
+    def restore(self, key, project_dir):
+        """Put the cached tree for key into project_dir/node_modules, returns the link mode or None"""
+        entry = self._entry(key)
+        if not (entry / "node_modules").is_dir():
+            return None
+
+        node_modules = Path(project_dir) / "node_modules"
+        staging = Path(project_dir) / "node_modules.expomate-restore"
+        _remove_tree(staging)
+        linker = TreeLinker()
+        try:
+            linker.link_tree(entry / "node_modules", staging)
+            _remove_tree(node_modules)
+            os.rename(staging, node_modules)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        meta = load_json(entry / "meta.json", {})
+        meta["last_used"] = time.time()
+        save_json(entry / "meta.json", meta)
+        return linker.mode
+
+    def save(self, key, project_dir, manager, node_version):
+        """Store project_dir/node_modules under key, then prune old trees"""
+        entry = self._entry(key)
+        if (entry / "node_modules").is_dir():
+            return
+        staging = self.root / f"{key}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        try:
+            TreeLinker().link_tree(Path(project_dir) / "node_modules", staging / "node_modules", skip=SKIP_DIRS)
+            save_json(staging / "meta.json", {
+                "manager": manager.name,
+                "lockfile": manager.key_file.name,
+                "node": node_version,
+                "created": time.time(),
+                "last_used": time.time(),
+            })
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.prune()
+
+    def prune(self, keep=KEEP_TREES):
+        """Drop the least recently used trees beyond keep"""
+        entries = []
+        for entry in self.root.iterdir():
+            if entry.is_dir() and "." not in entry.name:
+                meta = load_json(entry / "meta.json", {})
+                entries.append((meta.get("last_used", 0), entry))
+        entries.sort(reverse=True)
+        for _, entry in entries[keep:]:
+            shutil.rmtree(entry, ignore_errors=True)
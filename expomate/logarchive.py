@@ -0,0 +1,296 @@
+import gzip
+import os
+import queue
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+INDEX_FILE = "index.db"
+
+# A live session log is rotated into a new file past this size
+MAX_LOG_BYTES = 50 * 1024 ** 2
+
+# Closed logs older than this, or beyond the total size cap, are deleted with their index rows
+MAX_AGE_DAYS = 30
+MAX_ARCHIVE_BYTES = 1024 ** 3
+
+# Writer batches are committed together, up to this many queued items at a time
+WRITE_BATCH = 1000
+
+
+def compress_log(path):
+    """Compress a closed log with zstd (if installed) or gzip, returns the new path"""
+    path = Path(path)
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    if zstandard is not None:
+        target = path.with_name(path.name + ".zst")
+        with open(path, 'rb') as source, open(target, 'wb') as out:
+            zstandard.ZstdCompressor(level=10).copy_stream(source, out)
+    else:
+        target = path.with_name(path.name + ".gz")
+        with open(path, 'rb') as source, gzip.open(target, 'wb', compresslevel=6) as out:
+            shutil.copyfileobj(source, out)
+    os.unlink(path)
+    return target
+
+
+def match_query(text):
+    """FTS5 query matching every word of text literally (no FTS syntax from the user)"""
+    words = text.split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, path TEXT, project TEXT, job TEXT, "
+            "started REAL, closed REAL, line_count INTEGER DEFAULT 0)"
+        )
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS lines USING fts5("
+            "text, session UNINDEXED, project UNINDEXED, job UNINDEXED, line UNINDEXED)"
+        )
+        # Rowids of each session's lines, one range per inserted batch, so a
+        # session is deleted by rowid instead of scanning the FTS table
+        upgrade = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'line_ranges'"
+        ).fetchone()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS line_ranges (session TEXT, first INTEGER, last INTEGER)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS line_ranges_session ON line_ranges (session)")
+        if upgrade:
+            # Sessions indexed before ranges were kept get an open range: deleted by a scan
+            conn.execute("INSERT INTO line_ranges (session) SELECT id FROM sessions WHERE line_count > 0")
+    return conn
+
+
+class LogArchive:
+    """Rotated, compressed log files with an FTS5 index of every line
+
+    Log lines reach index() from the log writers and are inserted by one
+    background thread in batched transactions, so logging never waits on
+    SQLite. Closed logs are compressed and expire by age and total size.
+    Errors of that thread are reported through log.
+    """
+
+    def __init__(self, log_dir, max_log_bytes=MAX_LOG_BYTES, max_age_days=MAX_AGE_DAYS,
+                 max_archive_bytes=MAX_ARCHIVE_BYTES, log=None):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.log_dir / INDEX_FILE
+        self.max_log_bytes = max_log_bytes
+        self.max_age_days = max_age_days
+        self.max_archive_bytes = max_archive_bytes
+        self.log = log
+
+        self._queue = queue.Queue()
+        self._open = set()
+        self._open_lock = threading.Lock()
+        self._reader = None
+        self._next_row = None
+        self._last_error = None
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def open_session(self, path, project=None, job=None):
+        """Register a new log file, returns its session id"""
+        session = Path(path).stem
+        with self._open_lock:
+            self._open.add(session)
+        self._queue.put(("open", session, str(path), project, job, time.time()))
+        return session
+
+    def index(self, session, text, project=None, job=None):
+        """Queue written log text for indexing (safe from any thread)"""
+        self._queue.put(("lines", session, text, project, job))
+
+    def close_session(self, session):
+        """Mark a log as finished; the next maintain() compresses it"""
+        with self._open_lock:
+            self._open.discard(session)
+        self._queue.put(("close", session))
+
+    def maintain(self):
+        """Index stray logs, compress closed ones and expire old ones, in the background"""
+        self._queue.put(("maintain",))
+
+    def close(self, timeout=5):
+        """Finish pending writes and stop the writer thread"""
+        self._queue.put(("stop",))
+        self._writer.join(timeout)
+
+    def search(self, text, limit=500):
+        """Lines matching every word of text, oldest first, as dicts"""
+        query = match_query(text)
+        if not query:
+            return []
+        if self._reader is None:
+            self._reader = _connect(self.db_path)
+        rows = self._reader.execute(
+            "SELECT l.session, l.project, l.job, l.line, l.text, s.started, s.path "
+            "FROM lines l JOIN sessions s ON s.id = l.session "
+            "WHERE lines MATCH ? ORDER BY l.rowid LIMIT ?",
+            (query, limit)
+        )
+        columns = ("session", "project", "job", "line", "text", "started", "path")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _report(self, error):
+        """Log a writer error once, not again for every batch it repeats on"""
+        message = str(error)
+        if message != self._last_error and self.log:
+            self.log(f"[WARNING] Log archive error: {message}\n")
+        self._last_error = message
+
+    def _write_loop(self):
+        conn = None
+        counts = {}
+        while True:
+            items = [self._queue.get()]
+            try:
+                while len(items) < WRITE_BATCH:
+                    items.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            stop = False
+            maintain = False
+            try:
+                if conn is None:
+                    conn = _connect(self.db_path)
+                with conn:
+                    for item in items:
+                        if item[0] == "stop":
+                            stop = True
+                        elif item[0] == "maintain":
+                            maintain = True
+                        else:
+                            self._apply(conn, counts, item)
+                if maintain:
+                    self._maintain(conn, counts)
+            except (sqlite3.Error, OSError) as e:
+                # The batch's transaction was rolled back, so its rowids are free again
+                self._next_row = None
+                self._report(e)
+            if stop:
+                if conn is not None:
+                    conn.close()
+                return
+
+    def _line_count(self, conn, counts, session):
+        if session not in counts:
+            row = conn.execute("SELECT line_count FROM sessions WHERE id = ?", (session,)).fetchone()
+            counts[session] = row[0] if row and row[0] else 0
+        return counts[session]
+
+    def _apply(self, conn, counts, item):
+        kind, session = item[0], item[1]
+        if kind == "open":
+            _, _, path, project, job, started = item
+            conn.execute(
+                "INSERT OR IGNORE INTO sessions (id, path, project, job, started) VALUES (?, ?, ?, ?, ?)",
+                (session, path, project, job, started)
+            )
+        elif kind == "lines":
+            _, _, text, project, job = item
+            self._insert_lines(conn, counts, session, text, project, job)
+        elif kind == "close":
+            conn.execute("UPDATE sessions SET closed = ? WHERE id = ?", (time.time(), session))
+
+    def _insert_lines(self, conn, counts, session, text, project, job):
+        first = self._line_count(conn, counts, session)
+        lines = text.splitlines()
+        rows = [(line, session, project, job, first + offset + 1)
+                for offset, line in enumerate(lines) if line.strip()]
+        if rows:
+            # This thread is the only writer, so it hands out the rowids itself
+            if self._next_row is None:
+                last = conn.execute("SELECT rowid FROM lines ORDER BY rowid DESC LIMIT 1").fetchone()
+                self._next_row = last[0] + 1 if last else 1
+            start = self._next_row
+            conn.executemany(
+                "INSERT INTO lines (rowid, text, session, project, job, line) VALUES (?, ?, ?, ?, ?, ?)",
+                ((start + offset,) + row for offset, row in enumerate(rows))
+            )
+            self._next_row = start + len(rows)
+            conn.execute("INSERT INTO line_ranges VALUES (?, ?, ?)", (session, start, self._next_row - 1))
+        counts[session] = first + len(lines)
+        conn.execute("UPDATE sessions SET line_count = ? WHERE id = ?", (counts[session], session))
+
+    def _delete_session(self, conn, session):
+        ranges = conn.execute("SELECT first, last FROM line_ranges WHERE session = ?", (session,)).fetchall()
+        if any(first is None for first, _ in ranges):
+            conn.execute("DELETE FROM lines WHERE session = ?", (session,))
+        else:
+            conn.executemany("DELETE FROM lines WHERE rowid BETWEEN ? AND ?", ranges)
+        conn.execute("DELETE FROM line_ranges WHERE session = ?", (session,))
+        conn.execute("DELETE FROM sessions WHERE id = ?", (session,))
+
+    def _log_files(self):
+        for folder in (self.log_dir, self.log_dir / "jobs"):
+            if folder.is_dir():
+                yield from folder.glob("*.txt")
+
+    def _maintain(self, conn, counts):
+        with self._open_lock:
+            live = set(self._open)
+        known = {row[0]: row[1] for row in conn.execute("SELECT id, path FROM sessions")}
+
+        # Logs written before the archive existed (or by a crashed session) get indexed once
+        for path in self._log_files():
+            session = path.stem
+            if session in live or session in known:
+                continue
+            job = session.split("_")[1] if session.startswith("job_") else None
+            with conn:
+                conn.execute(
+                    "INSERT INTO sessions (id, path, job, started, closed) VALUES (?, ?, ?, ?, ?)",
+                    (session, str(path), job, path.stat().st_mtime, time.time())
+                )
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    self._insert_lines(conn, counts, session, f.read(), None, job)
+            known[session] = str(path)
+
+        # Compress every closed, still plain log
+        for session, path in list(known.items()):
+            if session in live or not path.endswith(".txt") or not os.path.exists(path):
+                continue
+            compressed = compress_log(path)
+            with conn:
+                conn.execute("UPDATE sessions SET path = ?, closed = COALESCE(closed, ?) WHERE id = ?",
+                             (str(compressed), time.time(), session))
+
+        # Expire by age, then by total size, oldest first
+        cutoff = time.time() - self.max_age_days * 86400
+        closed = conn.execute(
+            "SELECT id, path, started FROM sessions WHERE closed IS NOT NULL ORDER BY started"
+        ).fetchall()
+        sizes = {}
+        for session, path, _ in closed:
+            try:
+                sizes[session] = os.path.getsize(path)
+            except OSError:
+                sizes[session] = 0
+        total = sum(sizes.values())
+
+        for session, path, started in closed:
+            if session in live or (started >= cutoff and total <= self.max_archive_bytes):
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total -= sizes[session]
+            counts.pop(session, None)
+            with conn:
+                self._delete_session(conn, session)
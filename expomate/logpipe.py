@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+
+class LogPipeline:
+    """Bounded, batched log pipeline with a persistent buffered log file
+
+    Producers (any thread) call put(); the consumer calls drain() on a timer,
+    which coalesces everything queued into a single sink call and a single
+    file write (and a single on_batch call, e.g. for the log index).
+    """
+
+    def __init__(self, log_file, sink=None, max_queue=20000, max_batch=5000,
+                 flush_bytes=64 * 1024, flush_interval=1.0, on_batch=None):
+        self.log_file = log_file
+        self.sink = sink
+        self.on_batch = on_batch
+        self.max_batch = max_batch
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._consumer = threading.current_thread()
+        self._file = None
+        self._file_lock = threading.Lock()
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        self.lines_written = 0
+        self.bytes_written = 0
+        self._stamp_cache = (None, "")
+
+    def put(self, message):
+        """Queue a message, timestamped now, for the next drain"""
+        item = f"[{self._timestamp()}] {message}"
+
+        if threading.current_thread() is self._consumer:
+            # The consumer must never block on its own queue
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.drain()
+                self._queue.put_nowait(item)
+        else:
+            # Producers get back-pressure instead of unbounded memory growth
+            self._queue.put(item)
+
+    def _timestamp(self):
+        """Format the current time, reusing the string within the same second"""
+        now = time.time()
+        second, stamp = self._stamp_cache
+        if int(now) != second:
+            stamp = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+            # Swap as one tuple so other producer threads never see a torn pair
+            self._stamp_cache = (int(now), stamp)
+        return stamp
+
+    def drain(self):
+        """Write everything queued as one batch, returns the number of messages"""
+        items = []
+        try:
+            while len(items) < self.max_batch:
+                items.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if items:
+            text = "".join(items)
+            if self.sink:
+                self.sink(text)
+            self._write(text)
+            if self.on_batch:
+                self.on_batch(text)
+            self.lines_written += len(items)
+            self.bytes_written += len(text)
+
+        if self._pending_bytes and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+        return len(items)
+
+    def _write(self, text):
+        """Append text to the log file, flushing on the size threshold"""
+        if not self.log_file:
+            return
+
+        with self._file_lock:
+            try:
+                if self._file is None:
+                    self._file = open(self.log_file, 'a', encoding='utf-8', buffering=self.flush_bytes)
+                self._file.write(text)
+                self._pending_bytes += len(text)
+            except Exception as e:
+                print(f"Failed to write to log file: {e}")
+                return
+
+        if self._pending_bytes >= self.flush_bytes:
+            self.flush()
+
+    def flush(self):
+        """Flush buffered log lines to disk"""
+        with self._file_lock:
+            if self._file:
+                try:
+                    self._file.flush()
+                except Exception as e:
+                    print(f"Failed to flush log file: {e}")
+            self._pending_bytes = 0
+            self._last_flush = time.monotonic()
+
+    def _close_file(self):
+        """Close the log file; the caller holds _file_lock"""
+        if self._file:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+    def close(self):
+        """Drain what is left and close the log file"""
+        while self.drain():
+            pass
+        with self._file_lock:
+            self._close_file()
+        self._pending_bytes = 0
+
+    def reopen(self, log_file):
+        """Finish the current log file and continue in log_file
+
+        Everything queued so far goes to the current file first; messages
+        producers put while this runs stay queued and land in the new one,
+        so nothing is lost across a rotation. Consumer thread only.
+        """
+        while self.drain():
+            pass
+        with self._file_lock:
+            self._close_file()
+            self.log_file = log_file
+        self._pending_bytes = 0
+        self.lines_written = 0
+        self.bytes_written = 0
@@ -0,0 +1,229 @@
+import tkinter as tk
+from collections import deque
+
+
+class LogFileIndex:
+    """Sparse line-offset index over an append-only log file
+
+    Only the byte offset of every `stride`-th line is kept, so the index stays
+    tiny however long the file grows; it is extended incrementally on refresh.
+    """
+
+    def __init__(self, path, stride=256):
+        self.path = path
+        self.stride = stride
+        self.offsets = [0]  # offsets[i] is where line i * stride starts
+        self.line_count = 0
+        self._scanned = 0
+
+    def refresh(self):
+        """Scan bytes appended since the last refresh"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._scanned)
+                while True:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    pos = chunk.find(b"\n")
+                    while pos != -1:
+                        self.line_count += 1
+                        if self.line_count % self.stride == 0:
+                            self.offsets.append(self._scanned + pos + 1)
+                        pos = chunk.find(b"\n", pos + 1)
+                    self._scanned += len(chunk)
+        except OSError:
+            pass
+
+    def read_lines(self, start, end):
+        """Return complete lines [start, end) of the file"""
+        end = min(end, self.line_count)
+        if start >= end:
+            return []
+
+        lines = []
+        block = start // self.stride
+        skip = start - block * self.stride
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[block])
+            for _ in range(skip):
+                f.readline()
+            for _ in range(end - start):
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line.decode('utf-8', errors='replace').replace("\r\n", "\n"))
+        return lines
+
+
+class LogView:
+    """Bounded log view over a ScrolledText widget
+
+    The widget only ever holds a window of about `max_lines` lines. The most
+    recent lines are kept in a ring buffer; scrolling to the top pages older
+    lines back in from the on-disk log file, and scrolling back to the bottom
+    pages forward again until the view is following the live log.
+    """
+
+    def __init__(self, text_widget, max_lines=5000, page_size=500):
+        self.text = text_widget
+        self.max_lines = max_lines
+        self.page_size = page_size
+
+        self.index = None
+        self.before_read = None
+        self._base = 0       # absolute line number of the backing file's first line
+
+        self._recent = deque(maxlen=max_lines)  # ring buffer of complete lines
+        self._partial = ""   # text after the last newline
+        self._total = 0      # complete lines received so far
+        self._first = 0      # absolute line number of widget line 1
+        self._last = 0       # absolute line number after the widget window when detached
+        self._floor = 0      # nothing before this line is shown again (Clear)
+        self._detached = False
+        self._page_pending = False
+
+        self.text.configure(yscrollcommand=self._on_yscroll)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<KeyRelease>"):
+            self.text.bind(sequence, self._schedule_page, add="+")
+        self.text.vbar.bind("<ButtonRelease-1>", self._schedule_page, add="+")
+
+    def set_log_file(self, path, before_read=None):
+        """Use path as the backing store for lines trimmed from the widget
+
+        On a rotation the new file starts at the current line count; lines of
+        the previous file can still be shown from the ring buffer, older ones
+        are no longer paged in.
+        """
+        self.index = LogFileIndex(path)
+        self.before_read = before_read
+        self._base = self._total
+
+    def append(self, text):
+        """Add a batch of log text"""
+        if not text:
+            return
+
+        self._record(text)
+
+        if self._detached:
+            # The user is reading history; the new lines wait in the ring buffer
+            return
+
+        follow = self.text.yview()[1] >= 0.999
+        self.text.config(state=tk.NORMAL)
+        self.text.insert(tk.END, text)
+        self._trim_top()
+        self.text.config(state=tk.DISABLED)
+        if follow:
+            self.text.see(tk.END)
+
+    def clear(self):
+        """Empty the view; cleared lines are not paged back in"""
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.config(state=tk.DISABLED)
+        self._floor = self._first = self._last = self._total
+        self._partial = ""
+        self._detached = False
+
+    def _record(self, text):
+        """Update the ring buffer and line counters with new text"""
+        pieces = (self._partial + text).split("\n")
+        self._partial = pieces.pop()
+        for piece in pieces:
+            self._recent.append(piece + "\n")
+        self._total += len(pieces)
+
+    def _trim_top(self):
+        """Drop lines above the window so the widget stays bounded"""
+        excess = self._total - self._first - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._first += excess
+
+    def _oldest(self):
+        """First absolute line that can still be paged in"""
+        ring_start = self._total - len(self._recent)
+        oldest = ring_start if self.index is None else min(ring_start, self._base)
+        return max(oldest, self._floor)
+
+    def _lines(self, start, end):
+        """Lines [start, end) from the ring buffer, falling back to the log file"""
+        ring_start = self._total - len(self._recent)
+        if start >= ring_start:
+            return [self._recent[i - ring_start] for i in range(start, min(end, self._total))]
+
+        if self.index is None or start < self._base:
+            return []
+        if self.before_read:
+            self.before_read()
+        self.index.refresh()
+        return self.index.read_lines(start - self._base, end - self._base)
+
+    def _on_yscroll(self, first, last):
+        """Forward to the scrollbar and check whether a page is needed"""
+        self.text.vbar.set(first, last)
+        self._schedule_page()
+
+    def _schedule_page(self, event=None):
+        """Coalesce paging checks into one idle callback"""
+        if not self._page_pending:
+            self._page_pending = True
+            self.text.after_idle(self._check_page)
+
+    def _check_page(self):
+        """Page older or newer lines in when the view hits an edge"""
+        self._page_pending = False
+        top, bottom = self.text.yview()
+        if top <= 0.0 and self._first > self._oldest():
+            self._page_older()
+        elif bottom >= 1.0 and self._detached:
+            self._page_newer()
+
+    def _page_older(self):
+        """Insert the previous page at the top, trimming the bottom if needed"""
+        start = max(self._oldest(), self._first - self.page_size)
+        lines = self._lines(start, self._first)
+        if not lines:
+            return
+
+        self.text.config(state=tk.NORMAL)
+        self.text.insert("1.0", "".join(lines))
+        self._first -= len(lines)
+
+        shown = (self._last if self._detached else self._total) - self._first
+        if shown > self.max_lines:
+            # Cut the window at max_lines; everything after it is reached by paging forward
+            self.text.delete(f"{self.max_lines + 1}.0", tk.END)
+            self._last = self._first + self.max_lines
+            self._detached = True
+        self.text.config(state=tk.DISABLED)
+
+        # Keep the line the user was looking at in place
+        self.text.yview(f"{len(lines) + 1}.0")
+
+    def _page_newer(self):
+        """Append the next page at the bottom, re-attaching when it reaches the live log"""
+        previous_last = self._last
+        end = min(self._total, self._last + self.page_size)
+        lines = self._lines(self._last, end)
+        self._last += len(lines)
+
+        self.text.config(state=tk.NORMAL)
+        self.text.insert(tk.END, "".join(lines))
+        if self._last >= self._total:
+            self.text.insert(tk.END, self._partial)
+            self._detached = False
+
+        excess = self._last - self._first - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._first += excess
+        self.text.config(state=tk.DISABLED)
+
+        if self._detached:
+            # Keep the line the user was looking at in place
+            self.text.see(f"{previous_last - self._first}.0")
+        else:
+            self.text.see(tk.END)
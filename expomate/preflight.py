@@ -0,0 +1,240 @@
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from expomate.androidsdk import cmake_requirement, ndk_requirement, resolve_android_sdk
+from expomate.cache import cache_path, load_json, save_json
+from expomate.gradle import gradle_user_home
+from expomate.system import available_memory
+
+
+CACHE_FILE = "preflight.json"
+
+# The Android Gradle Plugin 8 needs JDK 17; React Native recommends 17 to 21
+MIN_JAVA_VERSION = 17
+
+# A release build writes a few GB to android/ and the Gradle caches
+MIN_FREE_DISK_BYTES = 4 * 1024 ** 3
+# Prebuild only generates android/ (tens of MB), so it fails on far less
+MIN_PREBUILD_DISK_BYTES = 512 * 1024 ** 2
+MIN_FREE_MEMORY_BYTES = 2 * 1024 ** 3
+
+# Check results
+PASS = "PASS"
+WARN = "WARN"
+FAIL = "FAIL"
+
+
+class Check:
+    """Result of one pre-flight check"""
+
+    def __init__(self, name, status, detail):
+        self.name = name
+        self.status = status
+        self.detail = detail
+
+
+def _gib(size):
+    return f"{size / 1024 ** 3:.1f} GB"
+
+
+def java_command():
+    """(java executable, where it was found) from JAVA_HOME or PATH"""
+    java_home = os.environ.get("JAVA_HOME")
+    if java_home:
+        name = "java.exe" if os.name == 'nt' else "java"
+        return str(Path(java_home) / "bin" / name), "JAVA_HOME"
+    return shutil.which("java"), "PATH"
+
+
+def parse_java_version(output):
+    """(major version, version string) from `java -version` output, or (None, None)"""
+    match = re.search(r'version "([^"]+)"', output)
+    if not match:
+        return None, None
+    version = match.group(1)
+    parts = re.findall(r"\d+", version)
+    if not parts:
+        return None, version
+    # Java 8 and older report "1.8.0_381"
+    major = int(parts[1]) if parts[0] == "1" and len(parts) > 1 else int(parts[0])
+    return major, version
+
+
+def java_version():
+    """(major, version string, source) of the JDK Gradle will use, cached by binary path and mtime"""
+    java, source = java_command()
+    try:
+        mtime = os.stat(java).st_mtime_ns if java else None
+    except OSError:
+        mtime = None
+    if mtime is None:
+        return None, None, source
+
+    key = f"{java}@{mtime}"
+    path = cache_path(CACHE_FILE)
+    cached = load_json(path, {})
+    if cached.get("java_key") == key:
+        return cached["java_major"], cached["java_version"], source
+
+    try:
+        result = subprocess.run([java, "-version"], capture_output=True, text=True, timeout=15)
+    except (OSError, subprocess.SubprocessError):
+        return None, None, source
+    # java -version prints to stderr
+    major, version = parse_java_version(result.stderr + result.stdout)
+    if major is not None:
+        save_json(path, dict(cached, java_key=key, java_major=major, java_version=version))
+    return major, version, source
+
+
+def check_jdk(project_dir, sdk):
+    major, version, source = java_version()
+    if major is None:
+        return Check("JDK", FAIL, f"no working java found ({source}); install JDK {MIN_JAVA_VERSION}+ "
+                                  f"and set JAVA_HOME")
+    if major < MIN_JAVA_VERSION:
+        return Check("JDK", FAIL, f"{version} from {source}, Gradle needs JDK {MIN_JAVA_VERSION}+")
+    return Check("JDK", PASS, f"{version} from {source}")
+
+
+def check_sdk(project_dir, sdk):
+    if sdk["sdk_dir"] is None:
+        return Check("Android SDK", FAIL, "not found; install it with Android Studio or set ANDROID_HOME")
+    if sdk["missing"]:
+        return Check("Android SDK", FAIL, f"{sdk['sdk_dir']} is missing {', '.join(sdk['missing'])}")
+    return Check("Android SDK", PASS, f"{sdk['sdk_dir']} (from {sdk['source']})")
+
+
+def _installed_versions(folder):
+    try:
+        return sorted(entry.name for entry in Path(folder).iterdir() if entry.is_dir())
+    except OSError:
+        return []
+
+
+def check_ndk(project_dir, sdk):
+    android_folder = project_dir / "android"
+    required = ndk_requirement(android_folder)
+    if sdk["sdk_dir"] is None:
+        return Check("NDK", WARN, f"{required or 'any'} needed, no SDK to look in")
+    installed = _installed_versions(Path(sdk["sdk_dir"]) / "ndk")
+    if required and required not in installed:
+        # Gradle installs a pinned NDK itself when the SDK licenses are accepted, slowly
+        return Check("NDK", WARN, f"{required} not installed, Gradle will try to download it "
+                                  f"(sdkmanager \"ndk;{required}\")")
+    if not required and not installed:
+        return Check("NDK", WARN, "none installed, Gradle will try to download the default one")
+    return Check("NDK", PASS, required or installed[-1])
+
+
+def check_cmake(project_dir, sdk):
+    android_folder = project_dir / "android"
+    required = cmake_requirement(android_folder)
+    if sdk["sdk_dir"] is None:
+        return Check("CMake", WARN, f"{required or 'any'} needed, no SDK to look in")
+    installed = _installed_versions(Path(sdk["sdk_dir"]) / "cmake")
+    if required and required not in installed:
+        return Check("CMake", WARN, f"{required} not installed, Gradle will try to download it "
+                                    f"(sdkmanager \"cmake;{required}\")")
+    if not required and not installed:
+        return Check("CMake", WARN, "none installed, Gradle will try to download the default one")
+    return Check("CMake", PASS, required or installed[-1])
+
+
+def gradle_distribution(android_folder):
+    """Distribution archive name from gradle-wrapper.properties (e.g. gradle-8.10.2-all), or None"""
+    try:
+        text = (Path(android_folder) / "gradle" / "wrapper" / "gradle-wrapper.properties").read_text(
+            encoding='utf-8', errors='replace'
+        )
+    except OSError:
+        return None
+    match = re.search(r"^\s*distributionUrl\s*=\s*(\S+)", text, re.MULTILINE)
+    if not match:
+        return None
+    name = match.group(1).replace("\\", "").rsplit("/", 1)[-1]
+    return name[:-4] if name.endswith(".zip") else name
+
+
+def check_gradle(project_dir, sdk):
+    distribution = gradle_distribution(project_dir / "android")
+    if distribution is None:
+        return Check("Gradle wrapper", FAIL, "gradle/wrapper/gradle-wrapper.properties not found, run prebuild")
+    gradle_home = gradle_user_home()
+    # The wrapper unpacks to dists/<name>/<hash>/ and drops <name>.zip.ok when done
+    dists = gradle_home / "wrapper" / "dists" / distribution
+    if any(dists.glob(f"*/{distribution}.zip.ok")):
+        return Check("Gradle wrapper", PASS, f"{distribution}, downloaded")
+    return Check("Gradle wrapper", WARN, f"{distribution} not downloaded yet, the first build fetches it")
+
+
+def _free_disk(project_dir):
+    """(free bytes, None) for the project's disk, or (None, the error)"""
+    try:
+        return shutil.disk_usage(project_dir).free, None
+    except OSError as e:
+        return None, e
+
+
+def check_disk(project_dir, sdk):
+    free, error = _free_disk(project_dir)
+    if free is None:
+        return Check("Disk", WARN, f"free space unknown ({error})")
+    if free < MIN_FREE_DISK_BYTES:
+        return Check("Disk", FAIL, f"{_gib(free)} free, a build needs about {_gib(MIN_FREE_DISK_BYTES)}")
+    return Check("Disk", PASS, f"{_gib(free)} free")
+
+
+def check_prebuild_disk(project_dir, sdk):
+    free, error = _free_disk(project_dir)
+    if free is None:
+        return Check("Disk", WARN, f"free space unknown ({error})")
+    if free < MIN_PREBUILD_DISK_BYTES:
+        return Check("Disk", FAIL, f"{_gib(free)} free, prebuild needs about {_gib(MIN_PREBUILD_DISK_BYTES)}")
+    if free < MIN_FREE_DISK_BYTES:
+        return Check("Disk", WARN, f"{_gib(free)} free, enough to prebuild but a build needs about "
+                                   f"{_gib(MIN_FREE_DISK_BYTES)}")
+    return Check("Disk", PASS, f"{_gib(free)} free")
+
+
+def check_memory(project_dir, sdk):
+    free = available_memory()
+    if free is None:
+        return Check("Memory", WARN, "available memory unknown")
+    if free < MIN_FREE_MEMORY_BYTES:
+        return Check("Memory", WARN, f"{_gib(free)} available, Gradle may swap or run out of memory")
+    return Check("Memory", PASS, f"{_gib(free)} available")
+
+
+# Checks per step; the android/ ones need a prebuilt project. Prebuild only
+# generates the native projects and runs no Java, so it does not need a JDK
+# (prebuilding here and compiling on another machine is fine)
+STAGE_CHECKS = {
+    "prebuild": (check_prebuild_disk, check_memory),
+    "compile": (check_disk, check_memory, check_jdk, check_sdk, check_ndk, check_cmake, check_gradle),
+}
+
+
+def run_preflight(project_dir, stage="compile"):
+    """Run the checks for stage at the same time, returns a list of Check in a stable order"""
+    project_dir = Path(project_dir)
+    checks = STAGE_CHECKS[stage]
+    # Resolved once up front (it is cached) and shared by the SDK, NDK and CMake checks
+    sdk = resolve_android_sdk(project_dir / "android") if check_sdk in checks else None
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        futures = [pool.submit(check, project_dir, sdk) for check in checks]
+        return [future.result() for future in futures]
+
+
+def format_report(checks):
+    """Pre-flight report, one line per check"""
+    return "".join(f"[{check.status}] {check.name}: {check.detail}\n" for check in checks)
+
+
+def passed(checks):
+    """True unless a check failed (warnings do not stop a build)"""
+    return all(check.status != FAIL for check in checks)
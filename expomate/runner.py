@@ -0,0 +1,217 @@
+import os
+import platform
+import queue
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from expomate.telemetry import ResourceSampler
+
+
+# Exit code reported for a cancelled run, as a shell reports Ctrl+C
+CANCELLED = 130
+
+# Seconds to keep reading once the process has exited, for output still on its
+# way; pipes held open past that by something it left running are abandoned
+EXIT_GRACE = 2
+
+# Queued by the waiter thread when the process exits
+_EXITED = object()
+
+
+def kill_tree(process):
+    """Kill a process started by ProcessRunner together with everything it spawned"""
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == 'nt':
+            # gradlew.bat runs java as a child of cmd; /T takes the whole tree down
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        else:
+            # The process leads its own session, so its group is exactly its tree
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        process.kill()
+
+
+def process_alive(pid):
+    """True while the process tree ProcessRunner started as pid has anything left running"""
+    if os.name == 'nt':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)    # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259    # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        # The group outlives its leader while a grandchild (a Gradle worker) still runs
+        os.killpg(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class TerminalMirror:
+    """Optional terminal window following a copy of a run's output
+
+    The window only tails a file ExpoMate writes, so closing it never affects
+    the build and the build never waits for it.
+    """
+
+    def __init__(self, path, title):
+        self.path = Path(path)
+        self.title = title
+        self._file = open(self.path, 'w', encoding='utf-8', buffering=1)
+        self.window = self._open_window()
+
+    def _open_window(self):
+        path = str(self.path)
+        try:
+            if os.name == 'nt':
+                return subprocess.Popen(
+                    f'start "ExpoMate - {self.title}" powershell -NoExit -Command '
+                    f'"Get-Content -Wait -Path \'{path}\'"',
+                    shell=True
+                )
+            tail = f'printf "\\033]0;ExpoMate - {self.title}\\007"; tail -n +1 -f "{path}"'
+            if platform.system() == 'Darwin':
+                applescript = f'tell application "Terminal" to do script "tail -n +1 -f \\"{path}\\""'
+                return subprocess.Popen(['osascript', '-e', applescript])
+            for cmd in (['gnome-terminal', '--', 'bash', '-c', tail],
+                        ['xterm', '-e', 'bash', '-c', tail],
+                        ['konsole', '-e', 'bash', '-c', tail]):
+                try:
+                    return subprocess.Popen(cmd)
+                except FileNotFoundError:
+                    continue
+        except OSError:
+            pass
+        return None
+
+    def write(self, line):
+        self._file.write(line)
+
+    def close(self, returncode):
+        self._file.write(f"\n=== ExpoMate: {self.title} finished (exit code {returncode}) ===\n")
+        self._file.close()
+
+
+class ProcessRunner:
+    """Run commands with stdout and stderr piped back into ExpoMate
+
+    Both pipes are drained by reader threads, so a chatty stderr can never
+    stall the child, and lines reach on_line in the calling thread in the
+    order they arrived. The run ends when the process exits, not when its
+    pipes close (a background child may hold them for good), and returns
+    its real exit code. cancel() from any thread kills the whole process tree.
+    The tree's peak memory and CPU time are kept in last_usage, and on_start,
+    if set, is called with the pid of every process started.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = None
+        self.cancelled = False
+        self.last_usage = (None, None)   # (peak rss bytes, cpu seconds) of the last run
+        self.on_start = None
+
+    def _reader(self, stream, lines):
+        try:
+            for line in stream:
+                lines.put(line)
+        finally:
+            stream.close()
+            lines.put(None)
+
+    def _waiter(self, process, lines):
+        process.wait()
+        lines.put(_EXITED)
+
+    def run(self, command, cwd, on_line, shell=False, mirror=None, gradle_home=None):
+        """Run command to completion, returns its exit code (CANCELLED if cancelled)
+
+        For a gradlew command, gradle_home makes the usage include the Gradle
+        daemons of that Gradle user home (see ResourceSampler).
+        """
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+
+        with self._lock:
+            if self.cancelled:
+                return CANCELLED
+            self._process = subprocess.Popen(
+                command,
+                cwd=str(cwd),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1,
+                shell=shell,
+                **kwargs
+            )
+            process = self._process
+        if self.on_start:
+            self.on_start(process.pid)
+        sampler = ResourceSampler(process.pid, gradle_home=gradle_home)
+
+        lines = queue.Queue()
+        readers = [
+            threading.Thread(target=self._reader, args=(stream, lines), daemon=True)
+            for stream in (process.stdout, process.stderr)
+        ]
+        for reader in readers:
+            reader.start()
+        threading.Thread(target=self._waiter, args=(process, lines), daemon=True).start()
+
+        open_streams = len(readers)
+        deadline = None
+        while open_streams:
+            try:
+                line = lines.get(timeout=None if deadline is None else max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if line is _EXITED:
+                deadline = time.monotonic() + EXIT_GRACE
+                continue
+            if line is None:
+                open_streams -= 1
+                continue
+            on_line(line)
+            if mirror:
+                mirror.write(line)
+
+        returncode = process.wait()
+        self.last_usage = sampler.stop()
+        with self._lock:
+            self._process = None
+            if self.cancelled:
+                returncode = CANCELLED
+        if mirror:
+            mirror.close(returncode)
+        return returncode
+
+    def cancel(self):
+        """Stop the running command (and any later ones) as soon as possible"""
+        with self._lock:
+            self.cancelled = True
+            process = self._process
+        if process is not None:
+            kill_tree(process)
@@ -0,0 +1,212 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+# Priorities, lower runs first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Seconds between looks at jobs waiting for a project another runner holds
+LOCK_RETRY = 1
+
+_project_locks = {}
+_project_locks_guard = threading.Lock()
+
+
+def project_lock(key):
+    """Lock held while something builds in a project folder (key)
+
+    Every JobScheduler and the BuildQueue take it, so a queued build and a
+    build from the main window never run Gradle in the same android folder.
+    """
+    with _project_locks_guard:
+        return _project_locks.setdefault(key, threading.Lock())
+
+
+class Job:
+    """One unit of work for the JobScheduler
+
+    func is a blocking callable returning an exit code; cancel, if given,
+    stops it from another thread (BuildEngine.cancel kills the process tree).
+    """
+
+    def __init__(self, name, func, priority=PRIORITY_NORMAL, key=None, cancel=None, on_done=None):
+        self.name = name
+        self.func = func
+        self.priority = priority
+        self.key = key
+        self.cancel_hook = cancel
+        self.on_done = on_done
+
+        self.state = QUEUED
+        self.returncode = None
+        self.error = None
+        self.cancel_requested = False
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.state in FINISHED
+
+
+class JobScheduler:
+    """Prioritized, cancellable job runner on its own asyncio event loop
+
+    All bookkeeping happens on the loop thread, blocking job functions run in
+    the loop's executor, and every state change is queued for the UI, which
+    picks them up with poll() from a single timer. Each change carries a
+    snapshot of the running and queued jobs, so the UI never has to wait
+    for the loop thread. Jobs sharing a key (the
+    project folder) never overlap, with each other or with anything else
+    holding its project_lock, and at most max_concurrent jobs run at once.
+    """
+
+    def __init__(self, max_concurrent=1):
+        # asyncio is imported here, not at the top, so the job state
+        # constants stay cheap to import for the UI
+        import asyncio
+        self.max_concurrent = max_concurrent
+        self.loop = asyncio.new_event_loop()
+        self._pending = []            # heap of (priority, sequence, job)
+        self._sequence = itertools.count()
+        self._running = set()
+        self._events = queue.Queue()
+        self._retry = None            # timer handle while a job waits for a lock held elsewhere
+        self.snapshot = []            # (name, state) of running then queued jobs, as of the last poll()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        import asyncio
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, name, func, priority=PRIORITY_NORMAL, key=None, cancel=None, on_done=None):
+        """Queue a job (safe from any thread), returns it"""
+        job = Job(name, func, priority, key, cancel, on_done)
+        self.loop.call_soon_threadsafe(self._enqueue, job)
+        return job
+
+    def cancel(self, job):
+        """Cancel a queued or running job (safe from any thread)"""
+        self.loop.call_soon_threadsafe(self._cancel, job)
+
+    def cancel_all(self):
+        """Cancel every queued and running job"""
+        self.loop.call_soon_threadsafe(self._cancel_all)
+
+    def poll(self):
+        """(job, state) for every state change since the last poll, in order (call from the UI thread)
+
+        Also updates snapshot to the jobs as they were after the last change.
+        """
+        changed = []
+        while True:
+            try:
+                job, state, snapshot = self._events.get_nowait()
+            except queue.Empty:
+                return changed
+            changed.append((job, state))
+            self.snapshot = snapshot
+
+    def shutdown(self):
+        """Cancel everything and stop the loop"""
+        self.cancel_all()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _jobs(self):
+        """(name, state) of running jobs followed by queued ones in the order they will start"""
+        queued = [entry[2] for entry in sorted(self._pending)]
+        return [(job.name, job.state) for job in sorted(self._running, key=lambda job: job.started) + queued]
+
+    def _emit(self, job):
+        self._events.put((job, job.state, self._jobs()))
+
+    def _enqueue(self, job):
+        heapq.heappush(self._pending, (job.priority, next(self._sequence), job))
+        self._emit(job)
+        self._schedule()
+
+    def _schedule(self):
+        """Start the best queued jobs that fit the concurrency limit"""
+        busy = {job.key for job in self._running if job.key is not None}
+        skipped = []
+        started = []
+        locked_elsewhere = False
+        while self._pending and len(self._running) < self.max_concurrent:
+            entry = heapq.heappop(self._pending)
+            job = entry[2]
+            if job.key is not None and (job.key in busy or not project_lock(job.key).acquire(blocking=False)):
+                # Waits for the job on the same project, without blocking others
+                locked_elsewhere = locked_elsewhere or job.key not in busy
+                skipped.append(entry)
+                continue
+            busy.add(job.key)
+            self._running.add(job)
+            job.state = RUNNING
+            job.started = time.time()
+            started.append(job)
+            self.loop.create_task(self._run(job))
+        for entry in skipped:
+            heapq.heappush(self._pending, entry)
+        if locked_elsewhere and self._retry is None:
+            # Nothing tells us when the queue lets go of a project, so look again shortly
+            self._retry = self.loop.call_later(LOCK_RETRY, self._retry_schedule)
+        # Emitted once the queue is whole again, so the snapshots include the skipped jobs
+        for job in started:
+            self._emit(job)
+
+    async def _run(self, job):
+        try:
+            job.returncode = await self.loop.run_in_executor(None, job.func)
+        except Exception as e:
+            job.error = e
+            job.returncode = 1
+
+        if job.cancel_requested:
+            job.state = CANCELLED
+        else:
+            job.state = SUCCEEDED if job.returncode == 0 else FAILED
+        job.finished = time.time()
+        self._running.discard(job)
+        if job.key is not None:
+            project_lock(job.key).release()
+        self._emit(job)
+        self._schedule()
+
+    def _retry_schedule(self):
+        self._retry = None
+        self._schedule()
+
+    def _cancel(self, job):
+        if job.done or job.cancel_requested:
+            return
+        job.cancel_requested = True
+        if job.state == QUEUED:
+            self._pending = [entry for entry in self._pending if entry[2] is not job]
+            heapq.heapify(self._pending)
+            job.state = CANCELLED
+            job.finished = time.time()
+            self._emit(job)
+        elif job.cancel_hook:
+            # Killing a process tree may block (taskkill), keep it off the loop
+            self.loop.run_in_executor(None, job.cancel_hook)
+
+    def _cancel_all(self):
+        for job in [entry[2] for entry in self._pending] + list(self._running):
+            self._cancel(job)
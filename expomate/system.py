@@ -0,0 +1,74 @@
+import ctypes
+import os
+import platform
+import subprocess
+
+
+def _meminfo():
+    """Fields of /proc/meminfo in bytes (Linux)"""
+    values = {}
+    with open("/proc/meminfo", 'r') as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            parts = rest.split()
+            if parts:
+                values[name] = int(parts[0]) * 1024
+    return values
+
+
+class _MemoryStatus(ctypes.Structure):
+    _fields_ = [
+        ("dwLength", ctypes.c_ulong),
+        ("dwMemoryLoad", ctypes.c_ulong),
+        ("ullTotalPhys", ctypes.c_ulonglong),
+        ("ullAvailPhys", ctypes.c_ulonglong),
+        ("ullTotalPageFile", ctypes.c_ulonglong),
+        ("ullAvailPageFile", ctypes.c_ulonglong),
+        ("ullTotalVirtual", ctypes.c_ulonglong),
+        ("ullAvailVirtual", ctypes.c_ulonglong),
+        ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+    ]
+
+
+def _windows_memory():
+    status = _MemoryStatus()
+    status.dwLength = ctypes.sizeof(_MemoryStatus)
+    ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+    return status.ullTotalPhys, status.ullAvailPhys
+
+
+def _sysctl(name):
+    result = subprocess.run(["sysctl", "-n", name], capture_output=True, text=True, timeout=5)
+    return int(result.stdout.strip())
+
+
+def total_memory():
+    """Physical memory in bytes, or None if it cannot be determined"""
+    try:
+        if os.name == 'nt':
+            return _windows_memory()[0]
+        if platform.system() == 'Darwin':
+            return _sysctl("hw.memsize")
+        return _meminfo()["MemTotal"]
+    except Exception:
+        return None
+
+
+def available_memory():
+    """Memory in bytes that new processes can use without swapping, or None"""
+    try:
+        if os.name == 'nt':
+            return _windows_memory()[1]
+        if platform.system() == 'Darwin':
+            # Free plus inactive pages is what macOS will hand out without swapping
+            result = subprocess.run(["vm_stat"], capture_output=True, text=True, timeout=5)
+            page_size = _sysctl("hw.pagesize")
+            pages = 0
+            for line in result.stdout.splitlines():
+                if line.startswith(("Pages free", "Pages inactive", "Pages speculative")):
+                    pages += int(line.split(":")[1].strip().rstrip("."))
+            return pages * page_size
+        info = _meminfo()
+        return info.get("MemAvailable", info.get("MemFree"))
+    except Exception:
+        return None
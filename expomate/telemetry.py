@@ -0,0 +1,255 @@
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from pathlib import Path
+
+from expomate.cache import cache_path
+
+
+METRICS_FILE = "metrics.db"
+
+# How often the process tree is sampled for memory and CPU
+SAMPLE_INTERVAL = 0.5
+
+# Long-lived JVMs that run a Gradle build's work outside gradlew's process tree
+DAEMON_MAIN_CLASSES = (b"org.gradle.launcher.daemon.bootstrap.GradleDaemon", b"KotlinCompileDaemon")
+
+# Recent runs compared against the runs before them to flag a regression
+RECENT_RUNS = 5
+BASELINE_RUNS = 20
+REGRESSION_RATIO = 1.2
+
+
+def _proc_stat(pid):
+    """(parent pid, cpu seconds including reaped children, rss bytes) of a Linux process, or None"""
+    try:
+        with open(f"/proc/{pid}/stat", 'rb') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses, the fields start after the last ')'
+    fields = stat[stat.rfind(b")") + 2:].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = sum(int(value) for value in fields[11:15]) / ticks  # utime, stime, cutime, cstime
+    rss = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    return int(fields[1]), cpu, rss
+
+
+def _is_daemon(pid, gradle_home):
+    """True if pid is a Gradle or Kotlin daemon running from gradle_home"""
+    try:
+        with open(f"/proc/{pid}/cmdline", 'rb') as f:
+            cmdline = f.read()
+    except OSError:
+        return False
+    return any(name in cmdline for name in DAEMON_MAIN_CLASSES) and os.fsencode(gradle_home) in cmdline
+
+
+class ResourceSampler:
+    """Peak RSS and CPU time of a process and everything it spawns
+
+    On Linux a background thread walks /proc every SAMPLE_INTERVAL and sums
+    the tree. CPU time includes reaped children, so processes that live
+    shorter than a sample (compilers under ninja) still count through their
+    parent, and a process its tracked parent reaped is not counted twice.
+    Elsewhere on POSIX the rusage of reaped children is used, which also
+    counts other builds finishing at the same time. On Windows nothing is
+    measured.
+
+    gradlew only starts a client; the build runs in the Gradle (and Kotlin)
+    daemons. With gradle_home, the daemons of that Gradle user home and
+    their children are sampled too (Linux only): their whole RSS counts
+    toward the peak and their CPU time from the first sample on. Daemons
+    are shared, so a build of another project at the same time is included.
+    """
+
+    def __init__(self, pid, gradle_home=None):
+        self.pid = pid
+        self.gradle_home = gradle_home
+        self.peak_rss = None
+        self.cpu_seconds = None
+        self._live = {}        # pid -> (parent pid, cpu seconds) at the last sample
+        self._finished = 0.0   # cpu seconds of tree processes nobody in the tree reaped
+        self._baseline = {}    # pid -> cpu seconds a daemon had used before this build
+        self._daemons = {}     # pid -> whether it is a daemon (command lines never change)
+        self._sampled = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._rusage = None
+        if os.path.isdir("/proc/self"):
+            self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+            self._thread.start()
+        elif os.name != 'nt':
+            import resource
+            self._rusage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    def _sample(self):
+        stats = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                stat = _proc_stat(entry)
+                if stat:
+                    stats[int(entry)] = stat
+        tree = {self.pid}
+        if self.gradle_home:
+            for pid in stats:
+                if pid not in self._daemons:
+                    self._daemons[pid] = _is_daemon(pid, self.gradle_home)
+                if self._daemons[pid]:
+                    tree.add(pid)
+        # Parents are listed before children almost always; repeat until the tree stops growing
+        grew = True
+        while grew:
+            grew = False
+            for pid, (ppid, _, _) in stats.items():
+                if ppid in tree and pid not in tree:
+                    tree.add(pid)
+                    grew = True
+        tree &= stats.keys()
+        if not self._sampled:
+            # Daemons already running did earlier builds' work; only count what they do from now on
+            self._baseline = {pid: stats[pid][1] for pid in tree if pid != self.pid}
+            self._sampled = True
+
+        for pid, (ppid, cpu) in self._live.items():
+            if pid not in stats and not (ppid in self._live and ppid in stats):
+                # Gone without a tracked parent to reap it: the root, or an orphan
+                self._finished += cpu
+        self._live = {pid: (stats[pid][0], stats[pid][1] - self._baseline.get(pid, 0)) for pid in tree}
+
+        if tree:
+            rss = sum(stats[pid][2] for pid in tree)
+            self.peak_rss = max(rss, self.peak_rss or 0)
+
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(SAMPLE_INTERVAL)
+
+    def stop(self):
+        """Finish measuring (after the process exited), returns (peak rss bytes, cpu seconds)"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+            self.cpu_seconds = self._finished + sum(cpu for _, cpu in self._live.values())
+        elif self._rusage is not None:
+            import resource
+            usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            self.cpu_seconds = (usage.ru_utime + usage.ru_stime
+                                - self._rusage.ru_utime - self._rusage.ru_stime)
+            # ru_maxrss is the largest single child, in bytes on macOS and kilobytes elsewhere
+            scale = 1 if os.uname().sysname == "Darwin" else 1024
+            self.peak_rss = usage.ru_maxrss * scale
+        return self.peak_rss, self.cpu_seconds
+
+
+def format_size(size):
+    return f"{size / 1024 ** 3:.1f} GB" if size >= 1024 ** 3 else f"{size / 1024 ** 2:.0f} MB"
+
+
+def format_duration(seconds):
+    seconds = round(seconds)
+    return f"{seconds // 60}m {seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
+
+
+def format_usage(stage, seconds, peak_rss, cpu_seconds):
+    """One log line with a step's wall time, peak memory and CPU time"""
+    parts = [f"{seconds:.1f}s"]
+    if peak_rss:
+        parts.append(f"peak memory {format_size(peak_rss)}")
+    if cpu_seconds is not None:
+        parts.append(f"CPU {cpu_seconds:.1f}s")
+    return f"[INFO] {stage.capitalize()} took {', '.join(parts)}.\n"
+
+
+def percentile(values, fraction):
+    """Linear-interpolated percentile of a non-empty list (fraction 0..1)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class MetricsStore:
+    """SQLite history of every build stage: duration, peak memory and CPU time"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else cache_path(METRICS_FILE)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS stages ("
+                "id INTEGER PRIMARY KEY, project TEXT, variant TEXT, stage TEXT, profile TEXT, "
+                "started REAL, duration REAL, returncode INTEGER, skipped INTEGER, "
+                "peak_rss INTEGER, cpu_seconds REAL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS stages_history ON stages (project, variant, stage, started)"
+            )
+
+    def record(self, project, stage, duration, returncode, variant="", profile="", skipped=False,
+               peak_rss=None, cpu_seconds=None, started=None):
+        """Store one step run (skipped: nothing was spawned, e.g. an up-to-date prebuild)"""
+        if started is None:
+            started = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO stages (project, variant, stage, profile, started, duration, returncode, "
+                "skipped, peak_rss, cpu_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(project), variant, stage, profile, started, duration, returncode,
+                 int(skipped), peak_rss, cpu_seconds)
+            )
+
+    def summary(self, project=None):
+        """Percentiles and trend of successful, not skipped runs per project, variant, stage and profile
+
+        Runs of different build profiles (fast, baseline) are kept apart, so
+        switching profiles does not show up as a trend. Returns dicts ordered
+        by project, variant, stage and profile. "change" is the
+        median of the last RECENT_RUNS against the median of up to
+        BASELINE_RUNS before them, "regression" flags a change past
+        REGRESSION_RATIO.
+        """
+        query = ("SELECT project, variant, stage, profile, duration, peak_rss, cpu_seconds FROM stages "
+                 "WHERE returncode = 0 AND skipped = 0")
+        args = ()
+        if project is not None:
+            query += " AND project = ?"
+            args = (str(project),)
+        groups = {}
+        for project_dir, variant, stage, profile, duration, peak_rss, cpu in self.conn.execute(
+                query + " ORDER BY started", args):
+            groups.setdefault((project_dir, variant, stage, profile or ""), []).append((duration, peak_rss, cpu))
+
+        rows = []
+        for (project_dir, variant, stage, profile), runs in sorted(groups.items()):
+            durations = [run[0] for run in runs]
+            recent = durations[-RECENT_RUNS:]
+            before = durations[-RECENT_RUNS - BASELINE_RUNS:-RECENT_RUNS]
+            change = statistics.median(recent) / statistics.median(before) - 1 if before else None
+            peaks = [run[1] for run in runs[-RECENT_RUNS:] if run[1]]
+            cpus = [run[2] for run in runs[-RECENT_RUNS:] if run[2] is not None]
+            rows.append({
+                "project": project_dir,
+                "variant": variant,
+                "stage": stage,
+                "profile": profile,
+                "runs": len(durations),
+                "p50": percentile(durations, 0.5),
+                "p90": percentile(durations, 0.9),
+                "last": durations[-1],
+                "peak_rss": max(peaks) if peaks else None,
+                "cpu_seconds": statistics.median(cpus) if cpus else None,
+                "change": change,
+                "regression": change is not None and change >= REGRESSION_RATIO - 1,
+            })
+        return rows
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from expomate.cache import cache_path, load_json, save_json
+
+
+# Tool name -> commands to try, in order
+TOOLS = {
+    "node": ["node", "nodejs"],
+    "npm": ["npm"],
+    "npx": ["npx"],
+}
+
+CACHE_FILE = "toolchain.json"
+
+
+def _resolve(commands):
+    """First command found on PATH, as (command, resolved path)"""
+    for command in commands:
+        path = shutil.which(command)
+        if path:
+            return command, path
+    return commands[0], None
+
+
+def _probe_key(resolved):
+    """Cache key: PATH plus each binary's resolved path and mtime"""
+    parts = [os.environ.get("PATH", "")]
+    for tool in sorted(resolved):
+        _, path = resolved[tool]
+        try:
+            mtime = os.stat(path).st_mtime_ns if path else 0
+        except OSError:
+            mtime = 0
+        parts.append(f"{tool}={path}@{mtime}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _version(path):
+    """Run `<path> --version`, returns the version string or None"""
+    if not path:
+        return None
+    try:
+        result = subprocess.run(
+            [path, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=15,
+            # On Windows, use shell=True so .cmd shims (npm, npx) run
+            shell=(os.name == 'nt')
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def probe_toolchain(force=False):
+    """Detect Node.js, npm and npx versions, reusing the on-disk cache when valid
+
+    Returns a dict with a version string (or None) per tool and a "cached" flag.
+    """
+    resolved = {tool: _resolve(commands) for tool, commands in TOOLS.items()}
+    key = _probe_key(resolved)
+    path = cache_path(CACHE_FILE)
+
+    if not force:
+        cached = load_json(path, {})
+        if cached.get("key") == key:
+            return dict(cached["versions"], cached=True)
+
+    # The three --version calls are independent, run them at the same time
+    with ThreadPoolExecutor(max_workers=len(resolved)) as pool:
+        futures = {tool: pool.submit(_version, resolved[tool][1]) for tool in resolved}
+        versions = {tool: future.result() for tool, future in futures.items()}
+
+    # A binary that is on PATH but did not answer (e.g. timed out) is not worth caching
+    if all(versions[tool] or not resolved[tool][1] for tool in resolved):
+        save_json(path, {"key": key, "versions": versions})
+    return dict(versions, cached=False)
+
+
+def invalidate_toolchain_cache():
+    """Forget the cached probe so the next one runs the tools again"""
+    try:
+        cache_path(CACHE_FILE).unlink()
+    except OSError:
+        pass
@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# ExpoMate runs from a checkout rather than an installed package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Run each test in its own folder, so cache/ (a relative path) is private to it"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "cache"
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+from expomate.buildqueue import QUEUE_FILE, BuildQueue
+from expomate.cache import cache_path, save_json
+
+
+def _leave_running_job(pid):
+    save_json(cache_path(QUEUE_FILE), {"jobs": [{
+        "id": "orphan", "project": "app", "build_type": "release", "fast": False, "state": "running",
+        "stage": "compile", "returncode": None, "log_file": None, "pid": pid, "started": 1, "finished": None,
+    }]})
+
+
+def test_orphan_requeued_only_once_its_process_is_gone(tmp_path):
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"], start_new_session=True)
+    try:
+        _leave_running_job(process.pid)
+        queue = BuildQueue(tmp_path / "jobs")
+        assert queue.snapshot()[0]["state"] == "running"
+    finally:
+        process.kill()
+        process.wait()
+
+    queue = BuildQueue(tmp_path / "jobs")
+    assert queue.snapshot()[0]["state"] == "queued"
+
+
+def test_cancel_and_retry_queued_job(tmp_path):
+    queue = BuildQueue(tmp_path / "jobs")
+    job = queue.add(tmp_path, "debug")
+    queue.cancel(job["id"])
+    assert queue.snapshot()[0]["state"] == "cancelled"
+    queue.retry(job["id"])
+    assert queue.snapshot()[0]["state"] == "queued"
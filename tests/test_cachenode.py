@@ -0,0 +1,157 @@
+import base64
+import io
+import os
+import socket
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from expomate import cachenode
+from expomate.cachenode import CacheNode, CacheStore
+
+KEY_A = "a" * 32
+KEY_B = "b" * 32
+KEY_C = "c" * 32
+
+
+def _put(store, key, size):
+    store.put(key, io.BytesIO(b"x" * size), size)
+
+
+def _set_used(store, key, when):
+    os.utime(store.root / key[:2] / key, (when, when))
+
+
+def test_put_and_open(tmp_path):
+    store = CacheStore(tmp_path / "store")
+    assert store.open(KEY_A) is None
+    _put(store, KEY_A, 10)
+    with store.open(KEY_A) as f:
+        assert f.read() == b"x" * 10
+    assert store.stats() == (1, 1, 1, 10)
+
+
+def test_overwrite_keeps_size_accurate(tmp_path):
+    store = CacheStore(tmp_path / "store")
+    _put(store, KEY_A, 10)
+    _put(store, KEY_A, 30)
+    assert store.stats()[3] == 30
+
+
+def test_short_body_is_not_stored(tmp_path):
+    store = CacheStore(tmp_path / "store")
+    with pytest.raises(OSError):
+        store.put(KEY_A, io.BytesIO(b"x" * 5), 10)
+    assert store.open(KEY_A) is None
+    assert list((tmp_path / "store").rglob("*.tmp-*")) == []
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    store = CacheStore(tmp_path / "store", max_bytes=250)
+    _put(store, KEY_A, 100)
+    _put(store, KEY_B, 100)
+    now = time.time()
+    _set_used(store, KEY_A, now - 10)
+    _set_used(store, KEY_B, now - 20)   # B is the least recently used
+
+    _put(store, KEY_C, 100)             # 300 > 250: evict down to 225
+
+    assert store.open(KEY_B) is None
+    assert store.open(KEY_A) is not None
+    assert store.open(KEY_C) is not None
+    assert store.stats()[3] == 200
+
+
+def test_hit_refreshes_lru_order(tmp_path):
+    store = CacheStore(tmp_path / "store", max_bytes=250)
+    _put(store, KEY_A, 100)
+    _put(store, KEY_B, 100)
+    now = time.time()
+    _set_used(store, KEY_A, now - 20)
+    _set_used(store, KEY_B, now - 10)
+    store.open(KEY_A).close()           # A becomes the most recently used
+
+    _put(store, KEY_C, 100)
+
+    assert store.open(KEY_B) is None
+    assert store.open(KEY_A) is not None
+
+
+@pytest.fixture
+def node(tmp_path):
+    node = CacheNode(CacheStore(tmp_path / "store"), port=0)
+    yield node
+    node.stop()
+
+
+def _request(method, url, data=None):
+    request = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+
+def test_http_protocol(node):
+    assert _request("GET", node.url + KEY_A) == (404, None)
+    assert _request("PUT", node.url + KEY_A, b"entry")[0] == 201
+    assert _request("GET", node.url + KEY_A) == (200, b"entry")
+    assert node.store.stats()[:3] == (1, 1, 1)
+
+
+def test_http_rejects_bad_keys_and_large_entries(node, monkeypatch):
+    monkeypatch.setattr(cachenode, "MAX_ENTRY_BYTES", 4)
+    assert _request("GET", node.url + "..%2F..%2Fetc%2Fpasswd")[0] == 404
+    assert _request("GET", node.url.replace("/cache/", "/other/") + KEY_A)[0] == 404
+    assert _request("PUT", node.url + KEY_A, b"too large")[0] == 413
+    assert node.store.open(KEY_A) is None
+
+
+def test_rejected_put_body_is_not_read_as_a_request(node):
+    host, port = node.server.server_address[:2]
+    with socket.create_connection((host, port)) as conn:
+        body = b"GET /cache/" + KEY_A.encode() + b" HTTP/1.1\r\nHost: x\r\n\r\n"
+        conn.sendall(b"PUT /other/" + KEY_A.encode() + b" HTTP/1.1\r\nHost: x\r\n"
+                     b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+        conn.settimeout(5)
+        response = b""
+        while chunk := conn.recv(4096):
+            response += chunk
+    assert response.count(b"HTTP/1.1") == 1
+    assert node.store.stats()[:2] == (0, 0)
+
+
+def _as_remote(monkeypatch):
+    monkeypatch.setattr(cachenode._CacheHandler, "_is_local", lambda self: False)
+
+
+def _auth(password):
+    return "Basic " + base64.b64encode(f"expomate:{password}".encode()).decode()
+
+
+def test_remote_clients_only_read_without_a_token(node, monkeypatch):
+    _put(node.store, KEY_A, 3)
+    _as_remote(monkeypatch)
+    assert _request("GET", node.url + KEY_A) == (200, b"xxx")
+    assert _request("PUT", node.url + KEY_B, b"entry")[0] == 403
+    assert node.store.open(KEY_B) is None
+
+
+def test_remote_clients_store_with_the_token(tmp_path, monkeypatch):
+    node = CacheNode(CacheStore(tmp_path / "store"), port=0, token="secret")
+    try:
+        _as_remote(monkeypatch)
+        request = urllib.request.Request(node.url + KEY_A, data=b"entry", method="PUT")
+        request.add_header("Authorization", _auth("wrong"))
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 401
+
+        request.add_header("Authorization", _auth("secret"))
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 201
+    finally:
+        node.stop()
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from expomate.fingerprint import compute_fingerprint, is_prebuild_current, prebuild_inputs, record_prebuild
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "app"
+    (root / "assets").mkdir(parents=True)
+    (root / "plugins").mkdir()
+    (root / "src").mkdir()
+    (root / "android").mkdir()
+    (root / "assets" / "icon.png").write_bytes(b"png")
+    (root / "plugins" / "withThing.js").write_text("module.exports = c => c")
+    (root / "src" / "App.js").write_text("app")
+    (root / "package.json").write_text('{"name": "app"}')
+    (root / "yarn.lock").write_text("lock")
+    (root / "app.json").write_text(json.dumps({
+        "expo": {"icon": "./assets/icon.png", "plugins": ["./plugins/withThing"]}
+    }))
+    return root
+
+
+def test_prebuild_inputs(project):
+    names = {path.relative_to(project.resolve()).as_posix() for path in prebuild_inputs(project)}
+    assert names == {"app.json", "package.json", "yarn.lock", "assets/icon.png", "plugins/withThing.js"}
+
+
+def test_fingerprint_follows_inputs_only(project):
+    before = compute_fingerprint(project)
+    (project / "src" / "App.js").write_text("changed")
+    assert compute_fingerprint(project) == before
+    (project / "assets" / "icon.png").write_bytes(b"new icon")
+    assert compute_fingerprint(project) != before
+
+
+def test_record_and_check(project):
+    assert not is_prebuild_current(project)
+    record_prebuild(project, compute_fingerprint(project))
+    assert is_prebuild_current(project)
+    (project / "app.json").write_text('{"expo": {}}')
+    assert not is_prebuild_current(project)
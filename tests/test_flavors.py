@@ -0,0 +1,54 @@
+import pytest
+
+from expomate.engine import flavor_variants, parse_product_flavors
+
+GROOVY = """
+android {
+    flavorDimensions "tier", "env"
+    productFlavors {
+        free {
+            dimension "tier"
+            applicationIdSuffix ".free"
+        }
+        paid { dimension "tier" }
+        // staging { dimension "env" }
+        dev {
+            dimension "env"
+            buildConfigField "String", "API", "\\"dev\\""
+        }
+        prod { dimension "env" }
+    }
+}
+"""
+
+KOTLIN = """
+android {
+    flavorDimensions += listOf("tier")
+    productFlavors {
+        create("free") { dimension = "tier" }
+        create("paid") {
+            dimension = "tier"
+            versionNameSuffix = "-paid"
+        }
+    }
+}
+"""
+
+
+def test_parse_product_flavors():
+    assert parse_product_flavors(GROOVY) == [("free", "tier"), ("paid", "tier"), ("dev", "env"), ("prod", "env")]
+    assert parse_product_flavors("android { }") == []
+
+
+def test_one_dimension():
+    assert flavor_variants(KOTLIN) == ["free", "paid"]
+    assert flavor_variants("android { productFlavors { a { } b { } } }") == ["a", "b"]
+
+
+def test_dimensions_are_combined_in_declaration_order():
+    assert flavor_variants(GROOVY) == ["freeDev", "freeProd", "paidDev", "paidProd"]
+
+
+def test_flavor_without_dimension_is_rejected():
+    with pytest.raises(ValueError, match="prod"):
+        flavor_variants(GROOVY.replace('prod { dimension "env" }', "prod { }"))
@@ -0,0 +1,101 @@
+from expomate.gradlelog import GradleOutputParser, format_profile, profile_path_for, task_category
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _feed(parser, clock, lines):
+    for line, seconds in lines:
+        clock.now += seconds
+        parser.feed(line)
+
+
+def test_task_category():
+    assert task_category(":app:createBundleReleaseJsAndAssets") == "JS bundling"
+    assert task_category(":app:minifyReleaseWithR8") == "R8 / minify"
+    assert task_category(":app:compileReleaseKotlin") == "Kotlin / Java"
+    assert task_category(":app:assembleRelease") == "Packaging"
+    assert task_category(":app:preBuild") == "Other"
+
+
+def test_profile_phases_tasks_and_messages():
+    clock = FakeClock()
+    parser = GradleOutputParser(clock=clock)
+    _feed(parser, clock, [
+        ("> Configure project :app", 2),
+        ("> Task :app:preBuild UP-TO-DATE", 3),
+        ("> Task :app:compileReleaseKotlin", 1),
+        ("w: Deprecated API", 4),
+        ("> Task :app:minifyReleaseWithR8 FROM-CACHE", 6),
+        ("e: something broke", 10),
+        ("BUILD FAILED in 26s", 0),
+        ("3 actionable tasks: 1 executed, 1 from cache, 1 up-to-date", 0),
+    ])
+    profile = parser.finish(returncode=1)
+
+    assert profile["result"] == "FAILED"
+    assert profile["gradle_reported_time"] == "26s"
+    assert profile["actionable_tasks"].startswith("3 actionable tasks")
+    assert profile["phases"] == {"initialization": 2.0, "configuration": 3.0, "execution": 21.0}
+    assert [(t["path"], t["outcome"], t["seconds"]) for t in profile["tasks"]] == [
+        (":app:preBuild", "UP-TO-DATE", 1.0),
+        (":app:compileReleaseKotlin", "EXECUTED", 10.0),
+        (":app:minifyReleaseWithR8", "FROM-CACHE", 10.0),
+    ]
+    assert profile["categories"]["Kotlin / Java"] == 10.0
+    assert (profile["warning_count"], profile["error_count"]) == (1, 1)
+    assert profile["configured_projects"] == 1
+
+
+def test_slowest_tasks_cover_the_share():
+    clock = FakeClock()
+    parser = GradleOutputParser(clock=clock)
+    _feed(parser, clock, [
+        ("> Task :a:one", 0),
+        ("> Task :a:two", 70),
+        ("> Task :a:three", 20),
+        ("BUILD SUCCESSFUL in 100s", 10),
+    ])
+    slowest = parser.finish(returncode=0)["slowest_tasks"]
+
+    assert [step["path"] for step in slowest] == [":a:one", ":a:two"]
+    assert slowest[0]["share"] == 0.7
+
+
+def test_profile_path_is_per_build(tmp_path):
+    log_file = tmp_path / "log_data_1.txt"
+    assert profile_path_for(log_file, "a") != profile_path_for(log_file, "b")
+
+
+def test_critical_path_follows_the_dependency_that_finished_last():
+    clock = FakeClock()
+    parser = GradleOutputParser(clock=clock)
+    # a and b run in parallel; c waits for both, d for c; e is off the path
+    for line in [
+        "##expomate-task :app:a 1000 3000 -",
+        "##expomate-task :app:b 1000 9000 -",
+        "##expomate-task :app:e 1000 2000 -",
+        "##expomate-task :app:c 9000 10000 :app:a,:app:b",
+        "##expomate-task :app:d 10000 12500 :app:c",
+        "BUILD SUCCESSFUL in 12s",
+    ]:
+        parser.feed(line)
+    profile = parser.finish(returncode=0)
+
+    assert [step["path"] for step in profile["critical_path"]] == [":app:b", ":app:c", ":app:d"]
+    assert [step["seconds"] for step in profile["critical_path"]] == [8.0, 1.0, 2.5]
+    assert profile["critical_path_seconds"] == 11.5
+    assert "Critical path: 11.5s over 3 tasks" in format_profile(profile)
+
+
+def test_no_task_times_means_no_critical_path():
+    parser = GradleOutputParser(clock=FakeClock())
+    parser.feed("> Task :app:a")
+    profile = parser.finish(returncode=0)
+    assert profile["critical_path"] == []
+    assert "Critical path" not in format_profile(profile)
@@ -0,0 +1,90 @@
+import os
+import time
+
+from expomate.hashing import TreeHasher
+
+
+def _age(path, seconds=60):
+    """Move a file's mtime into the past, out of the racy window"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path):
+    root = tmp_path / "tree"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("a")
+    (root / "sub" / "b.txt").write_text("b")
+    _age(root / "a.txt")
+    _age(root / "sub" / "b.txt")
+
+    hasher = TreeHasher(tmp_path / "index.db")
+    first = hasher.hash_tree(root)
+    second = hasher.hash_tree(root)
+    hasher.close()
+
+    assert sorted(first.changed) == ["a.txt", "sub/b.txt"]
+    assert second.changed == []
+    assert second.digest == first.digest
+
+
+def test_content_change_changes_digest(tmp_path):
+    root = tmp_path / "tree"
+    root.mkdir()
+    (root / "a.txt").write_text("one")
+    hasher = TreeHasher(tmp_path / "index.db")
+    before = hasher.hash_tree(root).digest
+    (root / "a.txt").write_text("two")
+    after = hasher.hash_tree(root)
+    hasher.close()
+
+    assert after.digest != before
+    assert after.changed == ["a.txt"]
+
+
+def test_excluded_dirs_and_removed_files(tmp_path):
+    root = tmp_path / "tree"
+    (root / "node_modules").mkdir(parents=True)
+    (root / "node_modules" / "dep.js").write_text("x")
+    (root / "keep.js").write_text("k")
+    (root / "gone.js").write_text("g")
+    hasher = TreeHasher(tmp_path / "index.db")
+    first = hasher.hash_tree(root, exclude_dirs={"node_modules"})
+    (root / "gone.js").unlink()
+    second = hasher.hash_tree(root, exclude_dirs={"node_modules"})
+    hasher.close()
+
+    assert sorted(first.files) == ["gone.js", "keep.js"]
+    assert second.removed == ["gone.js"]
+
+
+def test_recently_written_file_is_rehashed_even_with_same_stat(tmp_path):
+    # A file written within the racy window can change again without its
+    # size or mtime moving; it must be hashed again next time
+    root = tmp_path / "tree"
+    root.mkdir()
+    path = root / "a.txt"
+    path.write_text("aaaa")
+    stat = os.stat(path)
+
+    hasher = TreeHasher(tmp_path / "index.db")
+    before = hasher.hash_tree(root).digest
+    path.write_text("bbbb")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    after = hasher.hash_tree(root)
+    hasher.close()
+
+    assert after.changed == ["a.txt"]
+    assert after.digest != before
+
+
+def test_hash_files_matches_tree_digests(tmp_path):
+    root = tmp_path / "tree"
+    root.mkdir()
+    (root / "a.txt").write_text("a")
+    hasher = TreeHasher(tmp_path / "index.db")
+    tree = hasher.hash_tree(root)
+    files = hasher.hash_files([root / "a.txt", root / "missing.txt"])
+    hasher.close()
+
+    assert files == {str(root / "a.txt"): tree.files["a.txt"]}
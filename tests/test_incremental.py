@@ -0,0 +1,92 @@
+import pytest
+
+from expomate.incremental import evict, module_seconds, modules_path, native_modules, plan_clean, record_modules
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "app"
+    (root / "android" / "app" / "src").mkdir(parents=True)
+    (root / "android" / "app" / "build.gradle").write_text("app")
+    (root / "android" / "build.gradle").write_text("root")
+    (root / "package-lock.json").write_text("lock 1")
+    for package in ("react-native-screens", "@scope/lib"):
+        android = root / "node_modules" / package / "android"
+        (android / "src").mkdir(parents=True)
+        (android / "build.gradle").write_text(package)
+        (android / "src" / "Lib.java").write_text("v1")
+    (root / "node_modules" / "js-only").mkdir()
+    return root
+
+
+def _build_outputs(project):
+    for folder in (project / "android" / "app", project / "node_modules" / "@scope" / "lib" / "android",
+                   project / "node_modules" / "react-native-screens" / "android"):
+        (folder / "build").mkdir(exist_ok=True)
+        (folder / "build" / "out.bin").write_bytes(b"o" * 100)
+        (folder / ".cxx").mkdir(exist_ok=True)
+
+
+TASKS = [
+    [":app:compileReleaseKotlin", "EXECUTED", 0, 40.0],
+    [":react-native-screens:compileReleaseKotlin", "EXECUTED", 0, 25.0],
+    [":scope_lib:buildCMakeRelease", "EXECUTED", 0, 90.0],
+    [":clean", "EXECUTED", 0, 1.0],
+]
+
+
+def test_native_modules(project):
+    modules = native_modules(project)
+    assert set(modules) == {":app", ":react-native-screens", ":scope_lib"}
+    assert modules[":scope_lib"] == (project / "node_modules" / "@scope" / "lib" / "android").resolve()
+
+
+def test_module_seconds():
+    assert module_seconds(TASKS) == {":app": 40.0, ":react-native-screens": 25.0, ":scope_lib": 90.0}
+
+
+def test_no_record_means_full_clean(project):
+    assert plan_clean(project) is None
+
+
+def test_unchanged_inputs_keep_everything(project):
+    record_modules(project, TASKS)
+    plan = plan_clean(project)
+    assert plan["stale"] == []
+    assert plan["saved_seconds"] == 155.0
+
+
+def test_changed_dependency_evicts_it_only(project):
+    _build_outputs(project)
+    record_modules(project, TASKS)
+    (project / "node_modules" / "@scope" / "lib" / "android" / "src" / "Lib.java").write_text("v2")
+
+    plan = plan_clean(project)
+    assert plan["stale"] == [":scope_lib"]
+    assert sorted(plan["kept"]) == [":app", ":react-native-screens"]
+    assert plan["saved_seconds"] == 65.0
+    lib = (project / "node_modules" / "@scope" / "lib" / "android").resolve()
+    assert sorted(plan["dirs"]) == sorted([lib / "build", lib / ".cxx"])
+
+    assert evict(plan["dirs"]) == 100
+    assert not (lib / "build").exists()
+    assert (project / "android" / "app" / "build").exists()
+
+
+def test_lockfile_change_makes_app_stale(project):
+    record_modules(project, TASKS)
+    (project / "package-lock.json").write_text("lock 2")
+    assert plan_clean(project)["stale"] == [":app"]
+
+
+def test_shared_build_files_make_everything_stale(project):
+    record_modules(project, TASKS)
+    (project / "android" / "build.gradle").write_text("root changed")
+    assert sorted(plan_clean(project)["stale"]) == [":app", ":react-native-screens", ":scope_lib"]
+
+
+def test_recorded_time_is_the_cold_build(project):
+    record_modules(project, TASKS)
+    record_modules(project, [[":app:compileReleaseKotlin", "UP-TO-DATE", 0, 0.5]])
+    assert plan_clean(project)["saved_seconds"] == 155.0
+    assert modules_path(project).exists()
@@ -0,0 +1,111 @@
+import re
+import threading
+
+from expomate.logpipe import LogPipeline
+
+
+class Sink:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+
+    @property
+    def text(self):
+        return "".join(self.calls)
+
+
+def _messages(text):
+    """Log lines without their timestamps"""
+    return [line.split("] ", 1)[1] for line in text.splitlines()]
+
+
+def test_drain_is_one_batch(tmp_path):
+    sink, batches = Sink(), Sink()
+    pipeline = LogPipeline(tmp_path / "log.txt", sink=sink, on_batch=batches)
+    for i in range(3):
+        pipeline.put(f"line {i}\n")
+
+    assert pipeline.drain() == 3
+    assert len(sink.calls) == 1 and batches.calls == sink.calls
+    assert _messages(sink.text) == ["line 0", "line 1", "line 2"]
+    assert pipeline.drain() == 0
+    assert pipeline.lines_written == 3
+
+
+def test_batches_are_capped(tmp_path):
+    sink = Sink()
+    pipeline = LogPipeline(None, sink=sink, max_batch=2)
+    for i in range(5):
+        pipeline.put(f"{i}\n")
+
+    assert [pipeline.drain() for _ in range(4)] == [2, 2, 1, 0]
+    assert _messages(sink.text) == ["0", "1", "2", "3", "4"]
+
+
+def test_partial_lines_are_kept_as_written(tmp_path):
+    sink = Sink()
+    pipeline = LogPipeline(None, sink=sink)
+    pipeline.put("Downloading... ")
+    pipeline.put("done\n")
+    pipeline.drain()
+
+    assert re.fullmatch(r"\[[^]]+\] Downloading\.\.\. \[[^]]+\] done\n", sink.text)
+
+
+def test_full_queue_drains_on_the_consumer(tmp_path):
+    sink = Sink()
+    pipeline = LogPipeline(None, sink=sink, max_queue=2)
+    for i in range(5):
+        pipeline.put(f"{i}\n")      # never blocks on the consumer thread
+    pipeline.drain()
+
+    assert _messages(sink.text) == ["0", "1", "2", "3", "4"]
+
+
+def test_producers_get_back_pressure(tmp_path):
+    sink = Sink()
+    pipeline = LogPipeline(None, sink=sink, max_queue=2)
+    producer = threading.Thread(target=lambda: [pipeline.put(f"{i}\n") for i in range(6)])
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()      # blocked on the full queue
+
+    while producer.is_alive() or pipeline.drain():
+        pipeline.drain()
+    assert _messages(sink.text) == [str(i) for i in range(6)]
+
+
+def test_file_is_buffered_until_flush(tmp_path):
+    log_file = tmp_path / "log.txt"
+    pipeline = LogPipeline(log_file, flush_interval=3600)
+    pipeline.put("buffered\n")
+    pipeline.drain()
+    assert log_file.read_text() == ""
+
+    pipeline.flush()
+    assert _messages(log_file.read_text()) == ["buffered"]
+    pipeline.close()
+
+
+def test_size_threshold_flushes(tmp_path):
+    log_file = tmp_path / "log.txt"
+    pipeline = LogPipeline(log_file, flush_bytes=64, flush_interval=3600)
+    pipeline.put("x" * 100 + "\n")
+    pipeline.drain()
+    assert "x" * 100 in log_file.read_text()
+    pipeline.close()
+
+
+def test_reopen_switches_files_without_losing_lines(tmp_path):
+    first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+    pipeline = LogPipeline(first)
+    pipeline.put("old\n")
+    pipeline.reopen(second)
+    pipeline.put("new\n")
+    pipeline.close()
+
+    assert _messages(first.read_text()) == ["old"]
+    assert _messages(second.read_text()) == ["new"]
+    assert pipeline.lines_written == 1
@@ -0,0 +1,44 @@
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+from expomate import runner
+from expomate.runner import CANCELLED, ProcessRunner
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_exit_code_and_output():
+    lines = []
+    returncode = ProcessRunner().run(_python("print('out'); import sys; print('err', file=sys.stderr); sys.exit(3)"),
+                                     ".", lines.append)
+    assert returncode == 3
+    assert sorted(lines) == ["err\n", "out\n"]
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="POSIX process groups")
+def test_completes_on_exit_while_a_background_child_holds_the_pipes(monkeypatch):
+    monkeypatch.setattr(runner, "EXIT_GRACE", 0.2)
+    process_runner = ProcessRunner()
+    pids = []
+    process_runner.on_start = pids.append
+    lines = []
+    started = time.monotonic()
+    try:
+        returncode = process_runner.run(["sh", "-c", "sleep 30 & echo done; exit 4"], ".", lines.append)
+    finally:
+        os.killpg(pids[0], signal.SIGKILL)
+    assert returncode == 4
+    assert lines == ["done\n"]
+    assert time.monotonic() - started < 10
+
+
+def test_cancelled_before_start():
+    process_runner = ProcessRunner()
+    process_runner.cancel()
+    assert process_runner.run(_python("pass"), ".", print) == CANCELLED
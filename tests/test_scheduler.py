@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from expomate.scheduler import (
+    CANCELLED, PRIORITY_HIGH, PRIORITY_LOW, RUNNING, SUCCEEDED, JobScheduler, project_lock
+)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(max_concurrent=1)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def _wait(scheduler, jobs, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not all(job.done for job in jobs):
+        assert time.monotonic() < deadline, "jobs did not finish"
+        scheduler.poll()
+        time.sleep(0.01)
+    scheduler.poll()
+
+
+def _blocker(scheduler, key=None):
+    release = threading.Event()
+    job = scheduler.submit("blocker", lambda: 0 if release.wait(5) else 1, key=key)
+    return job, release
+
+
+def test_priority_order(scheduler):
+    order = []
+    blocker, release = _blocker(scheduler)
+    time.sleep(0.05)
+    jobs = [
+        scheduler.submit("low", lambda: order.append("low") or 0, priority=PRIORITY_LOW),
+        scheduler.submit("high", lambda: order.append("high") or 0, priority=PRIORITY_HIGH),
+        scheduler.submit("normal", lambda: order.append("normal") or 0),
+    ]
+    release.set()
+    _wait(scheduler, [blocker] + jobs)
+    assert order == ["high", "normal", "low"]
+    assert all(job.state == SUCCEEDED for job in jobs)
+
+
+def test_same_key_never_overlaps():
+    scheduler = JobScheduler(max_concurrent=2)
+    try:
+        first, release = _blocker(scheduler, key="project")
+        same = scheduler.submit("same project", lambda: 0, key="project")
+        other = scheduler.submit("other project", lambda: 0, key="other")
+        _wait(scheduler, [other])
+        assert same.state != RUNNING and not same.done
+        release.set()
+        _wait(scheduler, [first, same])
+        assert same.started >= first.finished
+    finally:
+        scheduler.shutdown()
+
+
+def test_waits_for_project_lock_held_elsewhere(scheduler):
+    lock = project_lock("held elsewhere")
+    lock.acquire()
+    try:
+        waiting = scheduler.submit("waiting", lambda: 0, key="held elsewhere")
+        other = scheduler.submit("other", lambda: 0, key="free")
+        _wait(scheduler, [other])
+        assert not waiting.done
+    finally:
+        lock.release()
+    _wait(scheduler, [waiting])
+    assert waiting.state == SUCCEEDED
+    assert not lock.locked()
+
+
+def test_cancel_queued_job(scheduler):
+    blocker, release = _blocker(scheduler)
+    queued = scheduler.submit("queued", lambda: 0)
+    scheduler.cancel(queued)
+    release.set()
+    _wait(scheduler, [blocker, queued])
+    assert queued.state == CANCELLED
+    assert queued.started is None
+
+
+def test_failures_and_exceptions(scheduler):
+    def boom():
+        raise RuntimeError("boom")
+
+    failed = scheduler.submit("fails", lambda: 3)
+    raised = scheduler.submit("raises", boom)
+    _wait(scheduler, [failed, raised])
+    assert (failed.state, failed.returncode) == ("failed", 3)
+    assert isinstance(raised.error, RuntimeError)
+
+
+def test_snapshot_follows_polled_events(scheduler):
+    blocker, release = _blocker(scheduler)
+    scheduler.submit("next", lambda: 0)
+    time.sleep(0.1)
+    scheduler.poll()
+    assert scheduler.snapshot == [("blocker", RUNNING), ("next", "queued")]
+    release.set()
+    time.sleep(0.2)
+    scheduler.poll()
+    assert scheduler.snapshot == []